@@ -0,0 +1,337 @@
+"""
+Equilibrium binding networks compiled from a spec (sigma sequestration).
+
+This module:
+- Compiles a spec of components (conserved species with totals) and
+  complexes (stoichiometry over components or other complexes, plus a
+  dissociation constant) into a stoichiometry matrix and log-constants.
+  Nested complexes such as Eσ70·6S are expanded to components, with their
+  overall constant the product of the stepwise ones.
+- Solves mass conservation in log space, x = log(free components): the
+  residual is log(free + bound) - log(total) per component, and its
+  Jacobian diag(1/S) H has H = diag(c) + Aᵀ diag(C) A symmetric positive
+  definite, so each Newton step is one small Cholesky solve. A cheap
+  log-space relaxation first brings every total within a factor ~2, then
+  a damped Newton method (step cap plus backtracking on the residual norm)
+  finishes. Conditions (rows of totals / constants) are solved together as
+  one batch; solve_one() is the lean single-condition path.
+- Builds the sigma-factor network used by SigmaCompetition's 'network'
+  backend: RNAP core, σ70, σS, σE and the sequestering Rsd (anti-σ70),
+  RseA (anti-σE) and 6S RNA (traps Eσ70).
+
+Spec format (JSON / YAML or a dict):
+
+    components: [E, sigma70, Rsd]
+    complexes:
+      E_sigma70:   {E: 1, sigma70: 1, Kd: 1.0}
+      Rsd_sigma70: {Rsd: 1, sigma70: 1, Kd: 0.1}
+"""
+
+from __future__ import annotations
+import json
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy.linalg.lapack import dposv
+
+_EXP_MAX = 700.0
+
+
+class Equilibrium:
+    """
+    Solution for m conditions: free (m, n_components) and complexes
+    (m, n_complexes) concentrations, log-free x, per-condition convergence
+    and the number of Newton iterations taken.
+    """
+
+    def __init__(self, network: 'BindingNetwork', x: np.ndarray, converged: np.ndarray, iterations: int) -> None:
+        self.network = network
+        self.x = x
+        self.free = np.exp(x)
+        self.complexes = np.exp(np.minimum(x @ network.A.T - network.log_K, _EXP_MAX))
+        self.converged = converged
+        self.iterations = iterations
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        """Concentration (m,) of a component (free) or complex by name."""
+        net = self.network
+        if name in net.components:
+            return self.free[:, net.components.index(name)]
+        return self.complexes[:, net.complex_names.index(name)]
+
+    def containing(self, *components: str) -> np.ndarray:
+        """Summed concentration (m,) of complexes that contain all the given components."""
+        net = self.network
+        cols = [net.components.index(c) for c in components]
+        mask = np.all(net.A[:, cols] > 0, axis=1)
+        return self.complexes[:, mask].sum(axis=1)
+
+    def as_dict(self, row: int = 0) -> Dict[str, float]:
+        out = {c: float(self.free[row, j]) for j, c in enumerate(self.network.components)}
+        out.update({c: float(self.complexes[row, k]) for k, c in enumerate(self.network.complex_names)})
+        return out
+
+
+class BindingNetwork:
+    """
+    Components with conserved totals and complexes formed from them:
+    [C_k] = Π_j [X_j]^A_kj / K_k with K_k the overall dissociation constant.
+    """
+
+    def __init__(self, components: Sequence[str], complexes: Mapping[str, Tuple[Mapping[str, float], float]]) -> None:
+        self.components = list(components)
+        self.complex_names: List[str] = []
+        rows, log_K = [], []
+        expanded: Dict[str, Tuple[np.ndarray, float]] = {}
+        for name, (stoich, K) in complexes.items():
+            if name in self.components:
+                raise ValueError(f"complex {name!r} shadows a component")
+            row = np.zeros(len(self.components))
+            logk = float(np.log(K))
+            for part, n in stoich.items():
+                if part in self.components:
+                    row[self.components.index(part)] += n
+                elif part in expanded:  # built from an earlier complex: multiply in its constant
+                    row += n * expanded[part][0]
+                    logk += n * expanded[part][1]
+                else:
+                    raise ValueError(f"complex {name!r}: unknown part {part!r} (define it first)")
+            expanded[name] = (row, logk)
+            self.complex_names.append(name)
+            rows.append(row)
+            log_K.append(logk)
+        self.A = np.array(rows, dtype=float).reshape(len(rows), len(self.components))
+        self.log_K = np.array(log_K, dtype=float)
+
+    @classmethod
+    def from_spec(cls, spec: Mapping) -> 'BindingNetwork':
+        complexes = {}
+        for name, entry in dict(spec['complexes']).items():
+            entry = dict(entry)
+            K = float(entry.pop('Kd'))
+            complexes[name] = ({k: float(v) for k, v in entry.items()}, K)
+        return cls(spec['components'], complexes)
+
+    @classmethod
+    def load(cls, path: str) -> 'BindingNetwork':
+        with open(path) as fh:
+            if path.endswith(('.yaml', '.yml')):
+                import yaml
+                return cls.from_spec(yaml.safe_load(fh))
+            return cls.from_spec(json.load(fh))
+
+    def restrict(self, components: Sequence[str]) -> 'BindingNetwork':
+        """Sub-network on some components, keeping the complexes made only of them."""
+        keep = [self.components.index(c) for c in components]
+        drop = np.setdiff1d(np.arange(self.n_components), keep)
+        rows = np.flatnonzero(~np.any(self.A[:, drop] > 0, axis=1)) if drop.size else np.arange(self.A.shape[0])
+        sub = object.__new__(BindingNetwork)
+        sub.components = [self.components[j] for j in keep]
+        sub.complex_names = [self.complex_names[k] for k in rows]
+        sub.A = self.A[np.ix_(rows, keep)]
+        sub.log_K = self.log_K[rows]
+        return sub
+
+    @property
+    def n_components(self) -> int:
+        return len(self.components)
+
+    def totals_array(self, totals: Mapping[str, object]) -> np.ndarray:
+        """(m, n_components) totals from {component: value or (m,) values}; missing = 0."""
+        cols = [np.atleast_1d(np.asarray(totals.get(c, 0.0), dtype=float)) for c in self.components]
+        m = max(c.size for c in cols)
+        return np.column_stack([np.broadcast_to(c, (m,)) for c in cols])
+
+    def log_K_array(self, K: Optional[Mapping[str, object]], m: int) -> np.ndarray:
+        """(m, n_complexes) log K with overrides {complex: value or (m,) values} of overall constants."""
+        log_K = np.broadcast_to(self.log_K, (m, self.log_K.size)).copy()
+        for name, v in (K or {}).items():
+            log_K[:, self.complex_names.index(name)] = np.log(np.asarray(v, dtype=float))
+        return log_K
+
+    # ------------------------ Residual and Jacobian ------------------------
+    def _parts(self, x: np.ndarray, log_K: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        c = np.exp(np.minimum(x, _EXP_MAX))
+        C = np.exp(np.minimum(x @ self.A.T - log_K, _EXP_MAX))
+        return c, C
+
+    def residual(self, x: np.ndarray, totals: np.ndarray, log_K: np.ndarray) -> np.ndarray:
+        """(free + bound) / total - 1 per component, (m, n)."""
+        c, C = self._parts(x, log_K)
+        return (c + C @ self.A) / totals - 1.0
+
+    def jacobian(self, x: np.ndarray, log_K: np.ndarray) -> np.ndarray:
+        """d(free + bound)/dx, (m, n, n): diag(c) + Aᵀ diag(C) A (the Hessian of G)."""
+        c, C = self._parts(x, log_K)
+        H = np.einsum('ki,mk,kj->mij', self.A, C, self.A)
+        idx = np.arange(self.n_components)
+        H[:, idx, idx] += c
+        return H
+
+    def _log_residual(self, x: np.ndarray, log_T: np.ndarray, log_K: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        c, C = self._parts(x, log_K)
+        S = c + C @ self.A
+        return np.log(S) - log_T, S
+
+    # ------------------------ Solver ------------------------
+    def solve(
+        self,
+        totals,
+        K: Optional[Mapping[str, object]] = None,
+        x0: Optional[np.ndarray] = None,
+        tol: float = 1e-10,
+        max_iter: int = 100,
+        max_step: float = 5.0,
+        floor: float = 1e-12,
+    ) -> Equilibrium:
+        """
+        Equilibrium for totals ({component: value(s)} or an (m, n) array),
+        with optional overall-constant overrides K. x0 warm-starts (log free
+        concentrations, e.g. a previous Equilibrium.x). Converged when every
+        component's free + bound matches its total within tol (relative).
+        Totals of zero are floored at floor times the condition's largest
+        total so the logarithm stays finite.
+        """
+        T = self.totals_array(totals) if isinstance(totals, Mapping) else np.atleast_2d(np.asarray(totals, float))
+        m = T.shape[0]
+        T = np.maximum(T, floor * np.maximum(T.max(axis=1, keepdims=True), 1e-300))
+        log_K = self.log_K_array(K, m)
+        x = np.log(T) if x0 is None else np.array(np.broadcast_to(x0, T.shape), dtype=float)
+        logT = np.log(T)
+        if m == 1:
+            x1, ok, it = self._solve_single(x[0], logT[0], log_K[0], tol, max_iter, max_step)
+            return Equilibrium(self, x1[None, :], np.array([ok]), it)
+        idx = np.arange(self.n_components)
+        At = self.A.T
+
+        # Relaxation in log space until every total is matched within a
+        # factor ~2: x -= w·(log S - log T), w = 1 / (largest complex order),
+        # so a complex never drops by more than its excess. It is cheap (no
+        # linear solves) and moves the start out of the regime where
+        # complexes dominate every total and the Jacobian is near-singular.
+        w = 1.0 / max(float(self.A.sum(axis=1).max()) if self.A.size else 1.0, 1.0)
+        f = self._log_residual(x, logT, log_K)[0]
+        for _ in range(100):
+            far = np.max(np.abs(f), axis=1) > 0.7
+            if not far.any():
+                break
+            x[far] -= w * f[far]
+            f[far] = self._log_residual(x[far], logT[far], log_K[far])[0]
+
+        active = np.flatnonzero(np.max(np.abs(f), axis=1) > tol)
+        it = 0
+        for it in range(1, max_iter + 1):
+            if active.size == 0:
+                break
+            xa, La, Ka, fa = x[active], logT[active], log_K[active], f[active]
+            c, C = self._parts(xa, Ka)
+            S = c + C @ self.A
+            H = (At[None, :, :] * C[:, None, :]) @ self.A
+            H[:, idx, idx] += c
+            step = -np.linalg.solve(H, (S * fa)[..., None])[..., 0]
+            big = np.max(np.abs(step), axis=1, keepdims=True)
+            step *= np.minimum(1.0, max_step / np.maximum(big, 1e-300))
+            # damped: halve the step until the log-residual norm decreases
+            norm0 = np.einsum('mj,mj->m', fa, fa)
+            alpha = np.ones(xa.shape[0])
+            trial = xa + step
+            f_new = self._log_residual(trial, La, Ka)[0]
+            for _ in range(30):
+                bad = np.einsum('mj,mj->m', f_new, f_new) > (1.0 - 1e-4 * alpha) * norm0
+                if not bad.any():
+                    break
+                alpha[bad] *= 0.5
+                trial[bad] = xa[bad] + alpha[bad, None] * step[bad]
+                f_new[bad] = self._log_residual(trial[bad], La[bad], Ka[bad])[0]
+            x[active] = trial
+            f[active] = f_new
+            active = active[np.max(np.abs(f_new), axis=1) > tol]
+        f = self._log_residual(x, logT, log_K)[0]
+        converged = np.max(np.abs(f), axis=1) <= max(tol, 1e-8)
+        return Equilibrium(self, x, converged, it)
+
+    def solve_one(self, totals: np.ndarray, x0: Optional[np.ndarray] = None, log_K: Optional[np.ndarray] = None,
+                  tol: float = 1e-10, max_iter: int = 100, max_step: float = 5.0) -> Tuple[np.ndarray, bool]:
+        """
+        One condition with totals as an array in component order (all > 0);
+        returns (x, converged). The lean path for per-step allocation solves.
+        """
+        log_T = np.log(np.asarray(totals, dtype=float))
+        x = log_T.copy() if x0 is None else np.array(x0, dtype=float)
+        x, ok, _ = self._solve_single(x, log_T, self.log_K if log_K is None else log_K, tol, max_iter, max_step)
+        return x, ok
+
+    def _solve_single(self, x: np.ndarray, log_T: np.ndarray, log_K: np.ndarray, tol: float,
+                      max_iter: int, max_step: float) -> Tuple[np.ndarray, bool, int]:
+        """solve() for one condition on 1-D arrays: same steps, no batching overhead."""
+        A, At = self.A, self.A.T
+        idx = np.arange(self.n_components)
+        w = 1.0 / max(float(A.sum(axis=1).max()) if A.size else 1.0, 1.0)
+
+        def parts(x):
+            c = np.exp(np.minimum(x, _EXP_MAX))
+            C = np.exp(np.minimum(A @ x - log_K, _EXP_MAX))
+            S = c + At @ C
+            return c, C, np.log(S) - log_T, S
+
+        c, C, f, S = parts(x)
+        for _ in range(100):
+            if np.abs(f).max() <= 0.7:
+                break
+            x = x - w * f
+            c, C, f, S = parts(x)
+        it = 0
+        for it in range(1, max_iter + 1):
+            if np.abs(f).max() <= tol:
+                return x, True, it - 1
+            H = (At * C) @ A
+            H[idx, idx] += c
+            # J = diag(1/S) H with H symmetric positive definite: J^-1 f = H^-1 (S f)
+            step = -dposv(H, S * f)[1]
+            big = np.abs(step).max()
+            if big > max_step:
+                step *= max_step / big
+            norm0 = f @ f
+            alpha = 1.0
+            for _ in range(30):
+                trial = x + alpha * step
+                c, C, f_new, S = parts(trial)
+                if f_new @ f_new <= (1.0 - 1e-4 * alpha) * norm0:
+                    break
+                alpha *= 0.5
+            x, f = trial, f_new
+        return x, bool(np.abs(f).max() <= max(tol, 1e-8)), it
+
+
+# =============================================================================
+# Sigma-factor network
+# =============================================================================
+SIGMA_TOTALS = {
+    'E': 'RNAP_total', 'sigma70': 'sigma70_total', 'sigmaS': 'sigmaS_total', 'sigmaE': 'sigmaE_total',
+    'Rsd': 'Rsd_total', 'RseA': 'RseA_total', 'SsrS': 'SsrS_total',
+}
+
+
+def sigma_network(
+    Kd_sigma70: float = 1.0,
+    Kd_sigmaS: float = 20.0,
+    Kd_sigmaE: float = 5.0,
+    Kd_Rsd: float = 0.1,
+    Kd_RseA: float = 0.01,
+    Kd_6S: float = 0.5,
+) -> BindingNetwork:
+    """
+    RNAP core E with σ70, σS and σE holoenzymes; Rsd sequesters free σ70,
+    RseA free σE, and 6S RNA (SsrS) traps the Eσ70 holoenzyme.
+    """
+    return BindingNetwork(
+        ['E', 'sigma70', 'sigmaS', 'sigmaE', 'Rsd', 'RseA', 'SsrS'],
+        {
+            'E_sigma70': ({'E': 1, 'sigma70': 1}, Kd_sigma70),
+            'E_sigmaS': ({'E': 1, 'sigmaS': 1}, Kd_sigmaS),
+            'E_sigmaE': ({'E': 1, 'sigmaE': 1}, Kd_sigmaE),
+            'Rsd_sigma70': ({'Rsd': 1, 'sigma70': 1}, Kd_Rsd),
+            'RseA_sigmaE': ({'RseA': 1, 'sigmaE': 1}, Kd_RseA),
+            'E_sigma70_6S': ({'E_sigma70': 1, 'SsrS': 1}, Kd_6S),
+        },
+    )
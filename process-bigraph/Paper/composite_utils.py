@@ -2,6 +2,9 @@
 """
 CLI and figures for sigma-factor competition using process_bigraph Composite.
 
+process_bigraph (via sigma_competition_process) and matplotlib are imported
+inside the functions that use them, so importing this module and --help
+stay cheap.
 """
 
 from __future__ import annotations
@@ -9,13 +12,6 @@ import argparse
 from typing import Iterable, Tuple
 
 import numpy as np
-import matplotlib.pyplot as plt
-
-from sigma_competition_process import (
-    SigmaCompetition,
-    build_core,
-    step_alloc_once,
-)
 
 
 # ---------------------------- Plot helpers ----------------------------
@@ -33,6 +29,7 @@ def _padded_ylim(values: Iterable[float]) -> Tuple[float, float] | None:
 
 def set_style(style: str | None) -> None:
     if style:
+        import matplotlib.pyplot as plt
         try:
             plt.style.use(style)
         except OSError:
@@ -42,6 +39,9 @@ def set_style(style: str | None) -> None:
 # ---------------------------- Single run ----------------------------
 def run_single(core=None, seed: int | None = None) -> None:
     """Time-course with a transient increase in alternative sigma (σAlt)."""
+    import matplotlib.pyplot as plt
+    from sigma_competition_process import SigmaCompetition, build_core, build_driven_composite
+
     if seed is not None:
         np.random.seed(seed)
 
@@ -54,11 +54,14 @@ def run_single(core=None, seed: int | None = None) -> None:
     sigma_alt_baseline = float(defaults['sigmaS_total'])
     sigma_alt_pulse = sigma_alt_baseline * 2.0
 
+    # one input-driven composite; the allocation is only re-solved when the
+    # sigmaS_total store actually changes (at the pulse edges)
+    comp = build_driven_composite(core, defaults, interval=dt)
     E_free, E70, EAlt, J70, JAlt = [], [], [], [], []
     for t in times:
-        cfg = dict(defaults)
-        cfg['sigmaS_total'] = sigma_alt_pulse if (20.0 < t < 40.0) else sigma_alt_baseline
-        out = step_alloc_once(core, cfg)
+        comp.state['sigmaS_total'] = sigma_alt_pulse if (20.0 < t < 40.0) else sigma_alt_baseline
+        comp.run(dt)
+        out = comp.state
         E_free.append(out['E_free'])
         E70.append(out['E_sigma70'])
         EAlt.append(out['E_sigmaS'])
@@ -104,6 +107,9 @@ def regenerate_figure(core=None, seed: int | None = None) -> None:
       C) Fraction E·σ70 / (E·σ70 + E·σAlt) vs total σ at equimolar σ70 = σAlt,
          using Kd_alt < Kd70 to match the observed trend.
     """
+    import matplotlib.pyplot as plt
+    from sigma_competition_process import SigmaCompetition, build_core, step_alloc_once
+
     if seed is not None:
         np.random.seed(seed)
 
@@ -218,6 +224,8 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
 
 def main(argv: list[str] | None = None) -> None:
     args = parse_args(argv)
+    from sigma_competition_process import build_core
+
     set_style(args.style)
     core = build_core()
 
@@ -0,0 +1,155 @@
+"""
+Multi-rate composite: sigma allocation <-> sRNA-regulated rpoS expression.
+
+This module:
+- Defines SigmaAllocationCoupling, a SigmaCompetition that reads RpoS
+  protein P from the shared 'cell' store, sets sigmaS_total = sigmaS_basal +
+  sigmaS_per_P * P, and writes 'tx_scale' = J_sigmaS / J_sigmaS(basal), which
+  SRNARegulator multiplies into its rpoS transcription rate k_tx_m.
+- Re-solves the allocation only when sigmaS_total has drifted by more than
+  drift_rtol since the last solve; otherwise the update is empty.
+- Builds a Composite in which SRNARegulator (fast Euler, dt=0.05) and the
+  allocation (slow, dt_alloc) each declare their own 'interval', so the
+  scheduler advances them at different rates.
+"""
+
+from __future__ import annotations
+import os
+import sys
+import time
+from typing import Dict, Mapping, Optional
+
+from process_bigraph import register_types, ProcessTypes
+from process_bigraph.composite import Composite
+
+from sigma_competition_process import SigmaCompetition
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'model'))
+from sRNA_module import SRNARegulator  # noqa: E402
+
+
+# =============================================================================
+# Process: SigmaAllocationCoupling
+# =============================================================================
+class SigmaAllocationCoupling(SigmaCompetition):
+    """
+    SigmaCompetition driven by RpoS protein; emits the relative Eσ^S promoter
+    flux as 'tx_scale' in the cell store (1.0 at sigmaS_basal).
+    """
+
+    config_schema = {
+        **SigmaCompetition.config_schema,
+        'sigmaS_basal': {'_type': 'float', '_default': 2000.0},
+        'sigmaS_per_P': {'_type': 'float', '_default': 10.0},
+        'drift_rtol': {'_type': 'float', '_default': 0.01},
+    }
+
+    def initialize(self, config):
+        super().initialize(config)
+        self._J_ref = self._flux(float(config['sigmaS_basal']))
+        self._last_sigmaS: Optional[float] = None
+        self._scale = 1.0
+        self.n_solves = 0
+        self.n_skipped = 0
+
+    def inputs(self) -> Mapping[str, str]:
+        return {'cell': 'map[float]'}
+
+    def outputs(self) -> Mapping[str, str]:
+        return {'cell': 'map[float]'}
+
+    def _flux(self, sigmaS_total: float) -> float:
+        cfg = self.config
+        return self._allocate(
+            RNAP_total=float(cfg['RNAP_total']),
+            sigma70_total=float(cfg['sigma70_total']),
+            sigmaS_total=sigmaS_total,
+        )['J_sigmaS']
+
+    def update(self, state: Mapping, interval: float) -> Dict[str, Dict[str, float]]:
+        cfg = self.config
+        P = float(state['cell'].get('P', 0.0))
+        sigmaS = float(cfg['sigmaS_basal']) + float(cfg['sigmaS_per_P']) * max(P, 0.0)
+        last = self._last_sigmaS
+        if last is not None and abs(sigmaS - last) <= float(cfg['drift_rtol']) * max(abs(last), 1e-12):
+            self.n_skipped += 1
+            return {}
+        self.n_solves += 1
+        self._last_sigmaS = sigmaS
+        scale = self._flux(sigmaS) / (self._J_ref + 1e-12)
+        delta, self._scale = scale - self._scale, scale
+        return {'cell': {'tx_scale': delta}}
+
+
+# =============================================================================
+# Composite helpers
+# =============================================================================
+def build_core():
+    """Return a fresh core with SRNARegulator and SigmaAllocationCoupling registered."""
+    core = register_types(ProcessTypes())
+    core.register_process("SRNARegulator", SRNARegulator)
+    core.register_process("SigmaAllocationCoupling", SigmaAllocationCoupling)
+    return core
+
+
+def build_feedback_composite(
+    core,
+    srna_config: Optional[Mapping] = None,
+    alloc_config: Optional[Mapping] = None,
+    dt_srna: float = 0.05,
+    dt_alloc: float = 1.0,
+    S: float = 1.0,
+    coupled: bool = True,
+) -> Composite:
+    """
+    Composite with SRNARegulator every dt_srna and, if coupled, the
+    allocation every dt_alloc, both wired to the 'cell' store.
+    """
+    cell = {'s': 0.0, 'm': 5.0, 'c': 0.0, 'P': 0.0, 'S': float(S), 'tx_scale': 1.0}
+    spec = {
+        'cell': dict(cell),
+        'srna': {
+            '_type': 'process',
+            'address': 'local:SRNARegulator',
+            'config': dict(srna_config or {'mode': 'activator'}),
+            'interval': float(dt_srna),
+            'inputs': {'cell': ['cell']},
+            'outputs': {'cell': ['cell']},
+        },
+    }
+    if coupled:
+        spec['alloc'] = {
+            '_type': 'process',
+            'address': 'local:SigmaAllocationCoupling',
+            'config': dict(alloc_config or {}),
+            'interval': float(dt_alloc),
+            'inputs': {'cell': ['cell']},
+            'outputs': {'cell': ['cell']},
+        }
+    comp = Composite({'state': spec}, core=core)
+    # process initial_state() defaults (S=0) win during construction
+    comp.state['cell'].update(cell)
+    return comp
+
+
+def run_feedback(T_end: float = 100.0, coupled: bool = True, **kwargs) -> Dict[str, float]:
+    """Run the composite to T_end; returns the final cell state plus timing and solve counts."""
+    core = build_core()
+    comp = build_feedback_composite(core, coupled=coupled, **kwargs)
+    t0 = time.perf_counter()
+    comp.run(T_end)
+    out = dict(comp.state['cell'])
+    out['wall_time'] = time.perf_counter() - t0
+    if coupled:
+        alloc = comp.state['alloc']['instance']
+        out['n_solves'] = alloc.n_solves
+        out['n_skipped'] = alloc.n_skipped
+    return out
+
+
+if __name__ == '__main__':
+    base = run_feedback(coupled=False)
+    loop = run_feedback(coupled=True)
+    print(f"SRNARegulator alone: P={base['P']:.2f}  {base['wall_time']:.3f}s")
+    print(f"with sigma feedback: P={loop['P']:.2f}  tx_scale={loop['tx_scale']:.3f}  "
+          f"{loop['wall_time']:.3f}s  ({loop['n_solves']} solves, {loop['n_skipped']} skipped)")
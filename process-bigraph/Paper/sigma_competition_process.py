@@ -4,12 +4,28 @@ SigmaCompetition Process and Composite utilities (Mauri & Klumpp, 2014 style).
 
 This module:
 - Defines a process-bigraph Process: SigmaCompetition.
-- Provides build_core, build_alloc_composite, and step_alloc_once helpers.
+- Defines SigmaCompetitionInputs, which reads the RNAP/sigma totals from
+  wired stores and skips the solve when they have not changed.
+- Defines PromoterLibrary: per-promoter holoenzyme affinities for σ70 and
+  σS, initiation rates and copy numbers. With a library the allocation
+  includes the holoenzyme held on promoters, reported separately as
+  E_sigma70_bound / E_sigmaS_bound; the unknowns stay the three free pools
+  (E_free, Eσ70, EσS) whatever the library size, and every residual
+  evaluation sums over the library as one vectorized pass.
+- Offers allocation_backend='network': the allocation is solved by a
+  compiled BindingNetwork (binding_network.py), by default the sigma
+  network with Rsd, RseA, σE and 6S RNA sequestration.
+- With 'result_cache' set, step_alloc_once() (the panel-scan helper) looks
+  its allocation up in the package's result cache
+  (stress_responses_simulation.result_cache); Process.update never does.
+- Provides build_core, build_alloc_composite, build_driven_composite, and
+  step_alloc_once helpers.
 - Robustly normalizes Composite.update results (dict or list-of-dicts).
 """
 
 from __future__ import annotations
-from typing import Dict, Iterable, Mapping, MutableMapping, Tuple
+import warnings
+from typing import Dict, Iterable, Mapping, MutableMapping, Optional, Sequence, Tuple
 
 import numpy as np
 from scipy.optimize import fsolve
@@ -17,6 +33,115 @@ from scipy.optimize import fsolve
 from process_bigraph import register_types, ProcessTypes
 from process_bigraph.composite import Process, Composite
 
+from binding_network import SIGMA_TOTALS, BindingNetwork, sigma_network
+from stress_responses_simulation.result_cache import code_digest, resolve
+
+
+# =============================================================================
+# Promoter library
+# =============================================================================
+class PromoterLibrary:
+    """
+    Promoters with their own holoenzyme dissociation constants for σ70 and
+    σS (inf or NaN: not recognized by that sigma), initiation rate per
+    bound holoenzyme a and copy number.
+
+    A promoter binds at most one holoenzyme; Eσ70 and EσS compete for it:
+    occupancy_70 = (Eσ70/K70) / (1 + Eσ70/K70 + EσS/KS), likewise for σS.
+    """
+
+    def __init__(self, K_sigma70, K_sigmaS, a=1.0, copies=1.0, names: Optional[Sequence[str]] = None) -> None:
+        K70 = np.asarray(K_sigma70, dtype=float)
+        KS = np.asarray(K_sigmaS, dtype=float)
+        n = K70.size
+        # affinities 1/K; 0 where the sigma does not recognize the promoter
+        self.b70 = np.where(np.isfinite(K70) & (K70 > 0), 1.0 / np.where(K70 > 0, K70, 1.0), 0.0)
+        self.bS = np.where(np.isfinite(KS) & (KS > 0), 1.0 / np.where(KS > 0, KS, 1.0), 0.0)
+        self.a = np.broadcast_to(np.asarray(a, dtype=float), (n,)).copy()
+        self.copies = np.broadcast_to(np.asarray(copies, dtype=float), (n,)).copy()
+        self.names = list(names) if names is not None else [f'p{i}' for i in range(n)]
+        self._ca = self.copies * self.a
+
+    @property
+    def n(self) -> int:
+        return self.b70.size
+
+    @classmethod
+    def from_csv(cls, path: str) -> 'PromoterLibrary':
+        """CSV with a header: name, K_sigma70, K_sigmaS[, a][, copies]; empty K = not recognized."""
+        import csv
+
+        def num(v, default):
+            v = (v or '').strip()
+            return float(v) if v else default
+
+        with open(path, newline='') as fh:
+            rows = list(csv.DictReader(fh))
+        return cls([num(r.get('K_sigma70'), np.inf) for r in rows],
+                   [num(r.get('K_sigmaS'), np.inf) for r in rows],
+                   a=[num(r.get('a'), 1.0) for r in rows],
+                   copies=[num(r.get('copies'), 1.0) for r in rows],
+                   names=[r.get('name') or f'p{i}' for i, r in enumerate(rows)])
+
+    @classmethod
+    def load(cls, path: str) -> 'PromoterLibrary':
+        """A library from .csv (see from_csv) or .npz (arrays K_sigma70, K_sigmaS, a, copies, names)."""
+        if path.endswith('.npz'):
+            with np.load(path) as f:
+                return cls(f['K_sigma70'], f['K_sigmaS'], f['a'], f['copies'],
+                           [str(x) for x in f['names']] if 'names' in f else None)
+        return cls.from_csv(path)
+
+    def save(self, path: str) -> None:
+        with np.errstate(divide='ignore'):
+            K70, KS = 1.0 / self.b70, 1.0 / self.bS
+        np.savez_compressed(path, K_sigma70=K70, K_sigmaS=KS, a=self.a, copies=self.copies,
+                            names=np.array(self.names))
+
+    @classmethod
+    def synthetic(
+        cls,
+        n: int = 4000,
+        frac_sigmaS: float = 0.1,
+        frac_dual: float = 0.05,
+        K_median: float = 100.0,
+        K_spread: float = 1.0,
+        a_median: float = 1.0,
+        a_spread: float = 0.5,
+        seed: int = 0,
+    ) -> 'PromoterLibrary':
+        """
+        Genome-like library: mostly σ70 promoters, a σS-only fraction and a
+        fraction recognized by both, with log-normal K (spread in natural-log
+        units) and initiation rates.
+        """
+        rng = np.random.default_rng(seed)
+        kind = rng.choice(3, size=n, p=[1.0 - frac_sigmaS - frac_dual, frac_sigmaS, frac_dual])
+        K70 = K_median * np.exp(K_spread * rng.standard_normal(n))
+        KS = K_median * np.exp(K_spread * rng.standard_normal(n))
+        K70[kind == 1] = np.inf
+        KS[kind == 0] = np.inf
+        a = a_median * np.exp(a_spread * rng.standard_normal(n))
+        return cls(K70, KS, a=a)
+
+    # ------------------------ Vectorized evaluation ------------------------
+    def occupancy(self, E70: float, ES: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Per-promoter fractions bound by Eσ70 and EσS at free holoenzyme levels E70, ES."""
+        x70 = self.b70 * E70
+        xS = self.bS * ES
+        denom = 1.0 + x70 + xS
+        return x70 / denom, xS / denom
+
+    def bound(self, E70: float, ES: float) -> Tuple[float, float]:
+        """Holoenzyme held on promoters: (Σ copies·occ70, Σ copies·occS)."""
+        o70, oS = self.occupancy(E70, ES)
+        return float(self.copies @ o70), float(self.copies @ oS)
+
+    def rates(self, E70: float, ES: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Per-promoter transcription rates from σ70 and σS holoenzyme (a·copies·occupancy)."""
+        o70, oS = self.occupancy(E70, ES)
+        return self._ca * o70, self._ca * oS
+
 
 # =============================================================================
 # Process: SigmaCompetition
@@ -25,6 +150,19 @@ class SigmaCompetition(Process):
     """
     Steady-state RNAP allocation among sigma factors (E_free, E·σ70, E·σAlt),
     plus simple promoter-like outputs (J_σ70, J_σAlt).
+
+    With promoter_library set (a .csv / .npz path, or set_library()), the
+    identical-promoter outputs are replaced by the library: holoenzyme bound
+    to promoters is part of the allocation, E_sigma70 / E_sigmaS stay the
+    holoenzyme off the promoters (as without a library) and the promoter-bound
+    part is E_sigma70_bound / E_sigmaS_bound (0 without a library), J_* sum
+    the per-promoter rates, and the per-promoter rates of the last solve are
+    kept in promoter_rates.
+
+    With allocation_backend='network' the allocation comes from a compiled
+    binding network instead (see binding_network.py): E_sigma70 / E_sigmaS
+    are the free, transcribing holoenzymes (6S-trapped Eσ70 excluded) and
+    every species of the last solve is kept in equilibrium.
     """
 
     config_schema = {
@@ -42,11 +180,90 @@ class SigmaCompetition(Process):
         'a_prom': {'_type': 'float', '_default': 1.0},
         'n_promoters_sigma70': {'_type': 'integer', '_default': 200},
         'n_promoters_sigmaS':  {'_type': 'integer', '_default': 200},
+
+        # fsolve step tolerance of the identical-promoter allocation
+        'xtol': {'_type': 'float', '_default': 1e-10},
+        # step_alloc_once looks its result up in the result cache (opt-in)
+        'result_cache': {'_type': 'boolean', '_default': False},
+
+        # Promoter library (.csv / .npz); '' keeps the identical-promoter model
+        'promoter_library': {'_type': 'string', '_default': ''},
+
+        # 'fsolve' (E_free, E·σ70, E·σS only) or 'network' (compiled binding network)
+        'allocation_backend': {'_type': 'string', '_default': 'fsolve'},
+        # Network spec (.json / .yaml); '' = binding_network.sigma_network with the values below
+        'binding_network': {'_type': 'string', '_default': ''},
+        'sigmaE_total': {'_type': 'float', '_default': 0.0},
+        'Rsd_total': {'_type': 'float', '_default': 0.0},      # anti-σ70
+        'RseA_total': {'_type': 'float', '_default': 0.0},     # anti-σE
+        'SsrS_total': {'_type': 'float', '_default': 0.0},     # 6S RNA, traps E·σ70
+        'Kd_sigmaE': {'_type': 'float', '_default': 5.0},
+        'Kd_Rsd': {'_type': 'float', '_default': 0.1},
+        'Kd_RseA': {'_type': 'float', '_default': 0.01},
+        'Kd_6S': {'_type': 'float', '_default': 0.5},
     }
 
+    def initialize(self, config):
+        if config.get('promoter_library') and config.get('allocation_backend', 'fsolve') == 'network':
+            raise ValueError("promoter_library and allocation_backend='network' cannot be combined; "
+                             "the library allocation has its own solver")
+
     def inputs(self) -> Mapping[str, str]:
         return {}
 
+    @property
+    def library(self) -> Optional[PromoterLibrary]:
+        if not hasattr(self, '_library'):
+            path = self.config.get('promoter_library') or ''
+            self._library = PromoterLibrary.load(path) if path else None
+        return self._library
+
+    def set_library(self, library: Optional[PromoterLibrary]) -> None:
+        if library is not None and self.config.get('allocation_backend', 'fsolve') == 'network':
+            raise ValueError("a promoter library cannot be used with allocation_backend='network'")
+        self._library = library
+        self._library_free = None
+
+    @property
+    def network(self) -> BindingNetwork:
+        if getattr(self, '_network', None) is None:
+            cfg = self.config
+            path = cfg.get('binding_network') or ''
+            self._network = BindingNetwork.load(path) if path else sigma_network(
+                Kd_sigma70=float(cfg['Kd_sigma70']), Kd_sigmaS=float(cfg['Kd_sigmaS']),
+                Kd_sigmaE=float(cfg['Kd_sigmaE']), Kd_Rsd=float(cfg['Kd_Rsd']),
+                Kd_RseA=float(cfg['Kd_RseA']), Kd_6S=float(cfg['Kd_6S']))
+            self._network_present = None
+        return self._network
+
+    def _solve_network(self, RNAP_total: float, sigma70_total: float, sigmaS_total: float) -> Dict[str, float]:
+        """
+        Equilibrium of the binding network, warm-started from the last solve.
+        Component totals come from the arguments (E, sigma70, sigmaS) and
+        otherwise from config '<component>_total' (0 if absent). Components
+        with a zero total are left out, with the complexes that need them.
+        """
+        net = self.network
+        given = {'E': RNAP_total, 'sigma70': sigma70_total, 'sigmaS': sigmaS_total}
+        totals = {c: given.get(c, float(self.config.get(SIGMA_TOTALS.get(c, f'{c}_total'), 0.0)))
+                  for c in net.components}
+        present = tuple(c for c in net.components if totals[c] > 0.0)
+        if present != getattr(self, '_network_present', None):
+            self._network_present = present
+            self._network_sub = net.restrict(present)
+            self._network_x = None
+        sub = self._network_sub
+        T = np.array([totals[c] for c in present])
+        x, ok = sub.solve_one(T, self._network_x)
+        if not ok and self._network_x is not None:
+            x, ok = sub.solve_one(T)
+        self._network_x = x if ok else None
+        eq = dict.fromkeys(net.components + net.complex_names, 0.0)
+        eq.update(zip(sub.components, np.exp(x).tolist()))
+        eq.update(zip(sub.complex_names, np.exp(sub.A @ x - sub.log_K).tolist()))
+        self.equilibrium = eq
+        return eq
+
     def outputs(self) -> Mapping[str, str]:
         return {
             'E_free': 'float',
@@ -54,6 +271,8 @@ class SigmaCompetition(Process):
             'E_sigmaS': 'float',
             'J_sigma70': 'float',
             'J_sigmaS': 'float',
+            'E_sigma70_bound': 'float',
+            'E_sigmaS_bound': 'float',
         }
 
     # ------------------------ Core equations ------------------------
@@ -81,18 +300,29 @@ class SigmaCompetition(Process):
         sigmaS_total: float,
         Kd_sigma70: float,
         Kd_sigmaS: float,
+        guess: Optional[Sequence[float]] = None,
     ) -> Tuple[float, float, float]:
-        # Reasonable initial guess
-        guess = [max(RNAP_total * 0.5, 1.0), RNAP_total * 0.25, RNAP_total * 0.25]
+        # Reasonable initial guess (or a warm start from a previous solution)
+        warm = guess is not None
+        if not warm:
+            guess = [max(RNAP_total * 0.5, 1.0), RNAP_total * 0.25, RNAP_total * 0.25]
         sol = fsolve(
             self._equations,
             guess,
             args=(RNAP_total, sigma70_total, sigmaS_total, Kd_sigma70, Kd_sigmaS),
-            xtol=1e-10,
+            xtol=float(self.config.get('xtol', 1e-10)),
             maxfev=2000,
         )
         E_free, E70, ES = [max(float(x), 0.0) for x in sol]
 
+        # A warm start far from the new totals can stall or land on an
+        # unphysical root; retry from the default guess.
+        if warm:
+            resid = self._equations((E_free, E70, ES), RNAP_total, sigma70_total, sigmaS_total,
+                                    Kd_sigma70, Kd_sigmaS)
+            if max(abs(r) for r in resid) > 1e-6 * max(RNAP_total, 1.0):
+                return self._solve_allocation(RNAP_total, sigma70_total, sigmaS_total, Kd_sigma70, Kd_sigmaS)
+
         # Clamp to conservation
         total = E_free + E70 + ES
         if total > 0:
@@ -107,33 +337,175 @@ class SigmaCompetition(Process):
         eps = 1e-12
         return float(n_promoters) * float(a_prom) * (E_sigma / (K_prom + E_sigma + eps))
 
-    def update(self, state: Mapping, interval: float) -> Dict[str, float]:
-        cfg = self.config
-        E_free, E70, ES = self._solve_allocation(
-            RNAP_total=float(cfg['RNAP_total']),
-            sigma70_total=float(cfg['sigma70_total']),
-            sigmaS_total=float(cfg['sigmaS_total']),
-            Kd_sigma70=float(cfg['Kd_sigma70']),
-            Kd_sigmaS=float(cfg['Kd_sigmaS']),
+    # ------------------------ Promoter-library allocation ------------------------
+    @staticmethod
+    def _library_equations(
+        log_vars: Iterable[float],
+        library: PromoterLibrary,
+        RNAP_total: float,
+        s70: float,
+        sS: float,
+        Kd70: float,
+        KdS: float,
+    ) -> Tuple[float, float, float]:
+        # unknowns are log(E_free), log(Eσ70 free), log(EσS free): positive by construction
+        E_free, H70, HS = np.exp(np.clip(np.asarray(log_vars, dtype=float), -700.0, 700.0))
+        B70, BS = library.bound(H70, HS)
+        eps = 1e-12
+        return (
+            (E_free + H70 + HS + B70 + BS) / RNAP_total - 1.0,              # RNAP conservation
+            (H70 * Kd70 / E_free + H70 + B70) / (s70 + eps) - 1.0,          # σ70: free + holo + bound
+            (HS * KdS / E_free + HS + BS) / (sS + eps) - 1.0,               # σS: free + holo + bound
         )
-        J70 = self._promoter_rate(E70, cfg['K_prom'], cfg['a_prom'], cfg['n_promoters_sigma70'])
-        JS  = self._promoter_rate(ES,  cfg['K_prom'], cfg['a_prom'], cfg['n_promoters_sigmaS'])
+
+    def _solve_library(
+        self,
+        RNAP_total: float,
+        sigma70_total: float,
+        sigmaS_total: float,
+        Kd_sigma70: float,
+        Kd_sigmaS: float,
+    ) -> Tuple[float, float, float]:
+        """
+        Free (E_free, Eσ70, EσS) with promoter binding; warm-started from the
+        last solve, and from the allocation without promoters when that fails
+        (or on the first call). Warns (RuntimeWarning) if neither converges.
+        """
+        lib = self.library
+        args = (lib, RNAP_total, sigma70_total, sigmaS_total, Kd_sigma70, Kd_sigmaS)
+        tiny = 1e-9 * max(RNAP_total, 1.0)
+
+        def solve(guess):
+            sol = fsolve(self._library_equations, np.log(np.maximum(guess, tiny)), args=args,
+                         xtol=1e-12, maxfev=2000)
+            return sol, max(abs(r) for r in self._library_equations(sol, *args))
+
+        resid = np.inf
+        if getattr(self, '_library_free', None) is not None:
+            sol, resid = solve(self._library_free)
+        if resid > 1e-9:
+            # cold start: the allocation without promoters
+            sol, resid = solve(self._solve_allocation(RNAP_total, sigma70_total, sigmaS_total,
+                                                      Kd_sigma70, Kd_sigmaS))
+        if resid > 1e-9:
+            warnings.warn(f"promoter-library allocation did not converge (relative residual {resid:.3g}) "
+                          f"at RNAP_total={RNAP_total:g}, sigma70_total={sigma70_total:g}, "
+                          f"sigmaS_total={sigmaS_total:g}", RuntimeWarning, stacklevel=3)
+        free = tuple(float(x) for x in np.exp(sol))
+        self._library_free = free if resid <= 1e-9 else None
+        return free
+
+    def _allocate(
+        self,
+        RNAP_total: float,
+        sigma70_total: float,
+        sigmaS_total: float,
+        guess: Optional[Sequence[float]] = None,
+    ) -> Dict[str, float]:
+        """Allocation and promoter outputs for the given totals (library or identical promoters)."""
+        cfg = self.config
+        Kd70, KdS = float(cfg['Kd_sigma70']), float(cfg['Kd_sigmaS'])
+        if self.library is None and cfg.get('allocation_backend', 'fsolve') == 'network':
+            eq = self._solve_network(RNAP_total, sigma70_total, sigmaS_total)
+            E70, ES = eq['E_sigma70'], eq['E_sigmaS']
+            return {
+                'E_free': eq['E'], 'E_sigma70': E70, 'E_sigmaS': ES,
+                'J_sigma70': self._promoter_rate(E70, cfg['K_prom'], cfg['a_prom'], cfg['n_promoters_sigma70']),
+                'J_sigmaS': self._promoter_rate(ES, cfg['K_prom'], cfg['a_prom'], cfg['n_promoters_sigmaS']),
+                'E_sigma70_bound': 0.0, 'E_sigmaS_bound': 0.0,
+            }
+        if self.library is None:
+            E_free, E70, ES = self._solve_allocation(RNAP_total, sigma70_total, sigmaS_total, Kd70, KdS, guess)
+            return {
+                'E_free': E_free, 'E_sigma70': E70, 'E_sigmaS': ES,
+                'J_sigma70': self._promoter_rate(E70, cfg['K_prom'], cfg['a_prom'], cfg['n_promoters_sigma70']),
+                'J_sigmaS': self._promoter_rate(ES, cfg['K_prom'], cfg['a_prom'], cfg['n_promoters_sigmaS']),
+                'E_sigma70_bound': 0.0, 'E_sigmaS_bound': 0.0,
+            }
+        E_free, H70, HS = self._solve_library(RNAP_total, sigma70_total, sigmaS_total, Kd70, KdS)
+        J70, JS = self.library.rates(H70, HS)
+        B70, BS = self.library.bound(H70, HS)
+        self.promoter_rates = J70 + JS
         return {
-            'E_free': E_free, 'E_sigma70': E70, 'E_sigmaS': ES,
-            'J_sigma70': J70, 'J_sigmaS': JS
+            'E_free': E_free, 'E_sigma70': H70, 'E_sigmaS': HS,
+            'J_sigma70': float(J70.sum()), 'J_sigmaS': float(JS.sum()),
+            'E_sigma70_bound': B70, 'E_sigmaS_bound': BS,
         }
 
+    def update(self, state: Mapping, interval: float) -> Dict[str, float]:
+        cfg = self.config
+        totals = {k: float(cfg[k]) for k in ('RNAP_total', 'sigma70_total', 'sigmaS_total')}
+        return self._allocate(**totals)
+
 
 # =============================================================================
-# Composite helpers
+# Process: SigmaCompetitionInputs
 # =============================================================================
-_EXPECTED_KEYS = ('E_free', 'E_sigma70', 'E_sigmaS', 'J_sigma70', 'J_sigmaS')
+_TOTALS = ('RNAP_total', 'sigma70_total', 'sigmaS_total')
+_EXPECTED_KEYS = ('E_free', 'E_sigma70', 'E_sigmaS', 'J_sigma70', 'J_sigmaS', 'E_sigma70_bound', 'E_sigmaS_bound')
 
 
+class SigmaCompetitionInputs(SigmaCompetition):
+    """
+    SigmaCompetition with RNAP_total, sigma70_total and sigmaS_total read from
+    input ports (config values are only the initial store values).
+
+    The last inputs and outputs are cached: when no total moved by more than
+    input_rtol the update is empty and nothing is solved; otherwise the
+    system is re-solved (warm-started from the cached allocation) and the
+    outputs are emitted as deltas from the previous values.
+    """
+
+    config_schema = {
+        **SigmaCompetition.config_schema,
+        'input_rtol': {'_type': 'float', '_default': 1e-9},
+    }
+
+    def initialize(self, config):
+        super().initialize(config)
+        self._last_inputs: Optional[Tuple[float, float, float]] = None
+        self._last_alloc: Optional[Tuple[float, float, float]] = None
+        self._last_outputs = {k: 0.0 for k in _EXPECTED_KEYS}
+        self.n_solves = 0
+        self.n_skipped = 0
+
+    def inputs(self) -> Mapping[str, str]:
+        return {k: 'float' for k in _TOTALS}
+
+    def initial_state(self) -> Dict[str, float]:
+        return {k: float(self.config[k]) for k in _TOTALS}
+
+    def _unchanged(self, totals: Tuple[float, float, float]) -> bool:
+        if self._last_inputs is None:
+            return False
+        rtol = float(self.config['input_rtol'])
+        return all(abs(a - b) <= rtol * max(abs(b), 1e-12) for a, b in zip(totals, self._last_inputs))
+
+    def update(self, state: Mapping, interval: float) -> Dict[str, float]:
+        cfg = self.config
+        totals = tuple(float(state.get(k, cfg[k])) for k in _TOTALS)
+        if self._unchanged(totals):
+            self.n_skipped += 1
+            return {}
+        self.n_solves += 1
+        new = self._allocate(RNAP_total=totals[0], sigma70_total=totals[1], sigmaS_total=totals[2],
+                             guess=self._last_alloc)
+        deltas = {k: new[k] - self._last_outputs[k] for k in _EXPECTED_KEYS}
+        self._last_inputs = totals
+        self._last_alloc = (new['E_free'], new['E_sigma70'], new['E_sigmaS'])
+        self._last_outputs = new
+        return deltas
+
+
+# =============================================================================
+# Composite helpers
+# =============================================================================
+
 def build_core():
     """Return a fresh core with SigmaCompetition registered."""
     core = register_types(ProcessTypes())
     core.register_process("SigmaCompetition", SigmaCompetition)
+    core.register_process("SigmaCompetitionInputs", SigmaCompetitionInputs)
     return core
 
 
@@ -141,35 +513,40 @@ def build_alloc_composite(core, config: Mapping[str, float]) -> Composite:
     """
     Build a Composite with one SigmaCompetition node, wired to top-level stores.
     """
-    spec = {
-        'E_free':    {'_type': 'float', '_value': 0.0},
-        'E_sigma70': {'_type': 'float', '_value': 0.0},
-        'E_sigmaS':  {'_type': 'float', '_value': 0.0},
-        'J_sigma70': {'_type': 'float', '_value': 0.0},
-        'J_sigmaS':  {'_type': 'float', '_value': 0.0},
-        'alloc': {
-            '_type': 'process',
-            'address': 'local:SigmaCompetition',
-            'config': dict(config),
-            '_outputs': {
-                'E_free': 'float',
-                'E_sigma70': 'float',
-                'E_sigmaS': 'float',
-                'J_sigma70': 'float',
-                'J_sigmaS': 'float',
-            },
-            'outputs': {
-                'E_free':    ['E_free'],
-                'E_sigma70': ['E_sigma70'],
-                'E_sigmaS':  ['E_sigmaS'],
-                'J_sigma70': ['J_sigma70'],
-                'J_sigmaS':  ['J_sigmaS'],
-            },
-        },
+    spec = {k: {'_type': 'float', '_value': 0.0} for k in _EXPECTED_KEYS}
+    spec['alloc'] = {
+        '_type': 'process',
+        'address': 'local:SigmaCompetition',
+        'config': dict(config),
+        '_outputs': {k: 'float' for k in _EXPECTED_KEYS},
+        'outputs': {k: [k] for k in _EXPECTED_KEYS},
     }
     return Composite(spec, core=core)
 
 
+def build_driven_composite(core, config: Mapping[str, float], interval: float = 1.0) -> Composite:
+    """
+    Composite with one SigmaCompetitionInputs node whose totals are read from
+    top-level stores; change comp.state['sigmaS_total'] etc. between runs.
+    """
+    spec = {k: {'_type': 'float', '_value': 0.0} for k in _EXPECTED_KEYS}
+    spec.update({k: {'_type': 'float', '_value': float(config.get(k, SigmaCompetition.config_schema[k]['_default']))}
+                 for k in _TOTALS})
+    spec['alloc'] = {
+        '_type': 'process',
+        'address': 'local:SigmaCompetitionInputs',
+        'config': dict(config),
+        'interval': float(interval),
+        'inputs': {k: [k] for k in _TOTALS},
+        'outputs': {k: [k] for k in _EXPECTED_KEYS},
+    }
+    comp = Composite({'state': spec}, core=core)
+    for k in _TOTALS:
+        if k in config:
+            comp.state[k] = float(config[k])
+    return comp
+
+
 def _collect_numbers(obj, out: MutableMapping[str, float]) -> None:
     """Recursively collect numeric leaves matching expected keys."""
     if isinstance(obj, dict):
@@ -194,8 +571,17 @@ def step_alloc_once(core, config: Mapping[str, float]) -> Dict[str, float]:
     """
     Build Composite, call update once, and return the resulting values, applied
     as deltas to zero-initialized stores. Falls back to direct process.update
-    if Composite emits nothing.
+    if Composite emits nothing. With config 'result_cache' true (and the
+    identical-promoter fsolve allocation) the result is looked up in the
+    default result cache, keyed on this module's code and the config.
     """
+    if (config.get('result_cache') and not config.get('promoter_library')
+            and config.get('allocation_backend', 'fsolve') == 'fsolve'):
+        results = resolve(True)
+        if results is not None:
+            parts = {'code': code_digest(SigmaCompetition), 'config': dict(config)}
+            return results.cached('sigma_competition.step_alloc_once', parts,
+                                  lambda: step_alloc_once(core, dict(config, result_cache=False)))
     comp = build_alloc_composite(core, config)
     state: Dict[str, float] = {k: 0.0 for k in _EXPECTED_KEYS}
 
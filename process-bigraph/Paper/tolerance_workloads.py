@@ -0,0 +1,139 @@
+"""
+Tolerance / step-size workloads for the process-bigraph engines.
+
+This module:
+- Builds stress_responses_simulation.tolerance_report Workloads for the two
+  hand-written numerical kernels here, so they land in the same
+  accuracy-versus-cost table as the RoadRunner / basico runs:
+  - sigma_allocation_workload: SigmaCompetition's identical-promoter
+    allocation (fsolve, xtol=1e-10 by default) over a sweep of sigmaS_total,
+    each point solved cold as in the panel scans, on an xtol ladder plus
+    the compiled 'network' backend; gold is xtol=1e-13.
+  - srna_workload: SRNARegulator in a Composite (forward Euler with the
+    process interval as step) sampled every time unit, on a ladder of
+    power-of-two dts plus scipy LSODA at a few rtols on the same
+    right-hand side; gold is LSODA at rtol=1e-11.
+- Prints both reports (and the practice4 RoadRunner ladder) when run as
+  a script.
+"""
+
+from __future__ import annotations
+import warnings
+from typing import Mapping, Optional, Sequence
+
+import numpy as np
+from scipy.integrate import solve_ivp
+
+from process_bigraph import register_types, ProcessTypes
+
+from sigma_competition_process import SigmaCompetition
+from rpos_feedback_composite import build_core, build_feedback_composite
+from stress_responses_simulation.tolerance_report import Workload, assess
+
+ALLOC_OUTPUTS = ('E_free', 'E_sigma70', 'E_sigmaS', 'J_sigma70', 'J_sigmaS')
+SRNA_STATE = ('s', 'm', 'c', 'P')
+
+
+# =============================================================================
+# SigmaCompetition allocation
+# =============================================================================
+def sigma_allocation_workload(
+    sigmaS_totals: Sequence[float] = tuple(np.geomspace(100.0, 20000.0, 40)),
+    xtols: Sequence[float] = (1e-4, 1e-6, 1e-8, 1e-10, 1e-12),
+    network: bool = True,
+    config: Optional[Mapping[str, float]] = None,
+) -> Workload:
+    """Rows = sigmaS_total values, columns = ALLOC_OUTPUTS; setting = (backend, xtol)."""
+    core = register_types(ProcessTypes())
+    procs = {}
+
+    def process(backend: str, xtol: float) -> SigmaCompetition:
+        if (backend, xtol) not in procs:
+            cfg = dict(config or {}, allocation_backend=backend, xtol=float(xtol))
+            procs[backend, xtol] = SigmaCompetition(core=core, config=cfg)
+        return procs[backend, xtol]
+
+    def run(setting):
+        proc = process(*setting)
+        cfg = proc.config
+        out = np.empty((len(sigmaS_totals), len(ALLOC_OUTPUTS)))
+        with warnings.catch_warnings():
+            # fsolve reports 'xtol too small' near machine precision (the gold setting)
+            warnings.simplefilter('ignore', RuntimeWarning)
+            for i, sS in enumerate(sigmaS_totals):
+                alloc = proc._allocate(float(cfg['RNAP_total']), float(cfg['sigma70_total']), float(sS))
+                out[i] = [alloc[k] for k in ALLOC_OUTPUTS]
+        return out
+
+    ladder = [(f'fsolve xtol={x:g}', ('fsolve', x)) for x in xtols]
+    if network:
+        ladder.append(('network (warm)', ('network', 1e-10)))
+    return Workload('SigmaCompetition allocation', run, ladder, ('fsolve', 1e-13), atol=1e-6)
+
+
+# =============================================================================
+# SRNARegulator
+# =============================================================================
+def srna_workload(
+    T_end: float = 100.0,
+    S: float = 1.0,
+    dts: Sequence[float] = tuple(2.0 ** -k for k in range(1, 7)),
+    rtols: Sequence[float] = (1e-3, 1e-5, 1e-7),
+    config: Optional[Mapping] = None,
+) -> Workload:
+    """
+    Rows = t = 1..T_end, columns = SRNA_STATE. Settings ('euler', dt) run
+    the Composite with the regulator's interval = dt; ('lsoda', rtol)
+    integrates update(state, 1.0), the right-hand side, with scipy. The
+    default dts (1/2 ... 1/64) are binary-exact: a run(1.0) whose steps do
+    not add up to 1.0 exactly in floating point (0.1, 0.05, ...) stops one
+    step short, and that sampling lag, not the Euler error, would dominate
+    the row.
+    """
+    core = build_core()
+    n = int(round(T_end))
+
+    def euler(dt: float) -> np.ndarray:
+        comp = build_feedback_composite(core, srna_config=config, dt_srna=dt, S=S, coupled=False)
+        out = np.empty((n, len(SRNA_STATE)))
+        for i in range(n):
+            comp.run(1.0)
+            out[i] = [comp.state['cell'][k] for k in SRNA_STATE]
+        return out
+
+    proc = build_feedback_composite(core, srna_config=config, S=S, coupled=False).state['srna']['instance']
+
+    def rhs(_t, y):
+        cell = dict(zip(SRNA_STATE, y), S=S, tx_scale=1.0)
+        d = proc.update({'cell': cell}, 1.0)['cell']
+        return [d[k] for k in SRNA_STATE]
+
+    def lsoda(rtol: float) -> np.ndarray:
+        y0 = [0.0, 5.0, 0.0, 0.0]
+        sol = solve_ivp(rhs, (0.0, float(n)), y0, method='LSODA', t_eval=np.arange(1.0, n + 1),
+                        rtol=rtol, atol=rtol * 1e-3)
+        if not sol.success:
+            raise RuntimeError(sol.message)
+        return sol.y.T
+
+    def run(setting):
+        method, value = setting
+        return euler(value) if method == 'euler' else lsoda(value)
+
+    ladder = [(f'euler dt={dt:g}', ('euler', dt)) for dt in dts]
+    ladder += [(f'lsoda rtol={r:g}', ('lsoda', r)) for r in rtols]
+    return Workload('SRNARegulator', run, ladder, ('lsoda', 1e-11), atol=1e-6)
+
+
+if __name__ == '__main__':
+    from stress_responses_simulation.cli import _model_text
+    from stress_responses_simulation.tolerance_report import roadrunner_workload
+
+    workloads = [
+        sigma_allocation_workload(),
+        srna_workload(),
+        roadrunner_workload(_model_text('practice4'), duration=600.0, points=121, name='practice4'),
+    ]
+    report = assess(workloads, required=1e-3)
+    print(report.table())
+    print("* Pareto front of wall time vs error   > cheapest setting within 1e-3 (max_rel)")
@@ -0,0 +1,262 @@
+"""
+Growing and dividing cell population on top of SRNARegulator.
+
+This module:
+- Keeps every cell as a row of flat numpy arrays (molecule amounts s, m, c, P,
+  volume, birth volume, cell id) and advances all cells at once by calling
+  SRNARegulator.update with array-valued concentrations.
+- Grows volume exponentially, so growth dilutes concentrations, and divides
+  cells with an adder rule; daughters split the volume (with optional
+  asymmetry) and molecules are partitioned binomially.
+- Records lineage in LineageRecord: parent id, birth time and division time
+  per cell id in growable arrays. Rows of cells that have divided or been
+  removed are spilled to .npz chunks on disk (a temporary directory unless
+  spill_dir is given), so memory stays bounded at about spill_rows plus the
+  live cells' rows over 10^6 divisions.
+- Controls population size by uniform subsampling above max_cells; the
+  population weight tracks how many real cells each simulated cell stands for.
+"""
+
+from __future__ import annotations
+import os
+import tempfile
+from typing import Dict, List, Mapping, Optional
+
+import numpy as np
+
+from process_bigraph import register_types, ProcessTypes
+
+from sRNA_module import SRNARegulator
+
+SPECIES = ('s', 'm', 'c', 'P')
+
+
+# ---------------------------- Lineage ----------------------------
+class LineageRecord:
+    """
+    Array-backed lineage: row i holds cell id first_id + i. Capacity doubles
+    as needed; rows of cells that have divided or been removed are written
+    out in chunks of spill_rows, to spill_dir or, when it is None, to a
+    temporary directory created on the first spill and deleted with the
+    record. to_arrays() reads every chunk back, so call it only when the
+    whole lineage fits in memory.
+    """
+
+    def __init__(self, capacity: int = 1024, spill_dir: Optional[str] = None,
+                 spill_rows: int = 1_000_000) -> None:
+        self.parent = np.full(capacity, -1, dtype=np.int64)
+        self.birth = np.full(capacity, np.nan)
+        self.division = np.full(capacity, np.nan)
+        self.first_id = 0
+        self.n = 0  # ids issued so far
+        self.spill_dir = spill_dir
+        self.spill_rows = int(spill_rows)
+        self._n_spilled_files = 0
+        self._tmp: Optional[tempfile.TemporaryDirectory] = None
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+
+    def _grow(self, need: int) -> None:
+        size = self.parent.size
+        used = self.n - self.first_id
+        if used + need <= size:
+            return
+        new = max(2 * size, used + need)
+        for name, fill in (('parent', -1), ('birth', np.nan), ('division', np.nan)):
+            old = getattr(self, name)
+            arr = np.full(new, fill, dtype=old.dtype)
+            arr[:used] = old[:used]
+            setattr(self, name, arr)
+
+    def new_cells(self, parents: np.ndarray, t: float) -> np.ndarray:
+        """Issue ids for cells born at time t from the given parent ids."""
+        k = int(parents.size)
+        self._grow(k)
+        lo = self.n - self.first_id
+        self.parent[lo:lo + k] = parents
+        self.birth[lo:lo + k] = t
+        ids = np.arange(self.n, self.n + k, dtype=np.int64)
+        self.n += k
+        return ids
+
+    def mark_division(self, ids: np.ndarray, t: float) -> None:
+        self.division[ids - self.first_id] = t
+
+    def spill(self, oldest_live_id: int) -> None:
+        """Write rows older than every live cell to disk once enough accumulate."""
+        k = int(oldest_live_id - self.first_id)
+        if k < self.spill_rows:
+            return
+        if not self.spill_dir:
+            self._tmp = tempfile.TemporaryDirectory(prefix='lineage-')
+            self.spill_dir = self._tmp.name
+        path = os.path.join(self.spill_dir, f'lineage-{self._n_spilled_files:05d}.npz')
+        np.savez(path, id=np.arange(self.first_id, self.first_id + k), parent=self.parent[:k],
+                 birth=self.birth[:k], division=self.division[:k])
+        self._n_spilled_files += 1
+        used = self.n - self.first_id
+        for name in ('parent', 'birth', 'division'):
+            arr = getattr(self, name)
+            arr[:used - k] = arr[k:used]
+        self.parent[used - k:used] = -1
+        self.birth[used - k:used] = np.nan
+        self.division[used - k:used] = np.nan
+        self.first_id += k
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """In-memory rows (plus any spilled chunks) as id/parent/birth/division arrays."""
+        parts: List[Dict[str, np.ndarray]] = []
+        if self.spill_dir:
+            for i in range(self._n_spilled_files):
+                with np.load(os.path.join(self.spill_dir, f'lineage-{i:05d}.npz')) as z:
+                    parts.append({k: z[k] for k in z.files})
+        used = self.n - self.first_id
+        parts.append({'id': np.arange(self.first_id, self.n), 'parent': self.parent[:used].copy(),
+                      'birth': self.birth[:used].copy(), 'division': self.division[:used].copy()})
+        return {k: np.concatenate([p[k] for p in parts]) for k in parts[0]}
+
+
+# ---------------------------- Population ----------------------------
+class Population:
+    """
+    Agent-based population driven by one SRNARegulator (shared config).
+
+    growth_rate: volume doubling rate mu (V' = mu V), optionally reduced by
+    stress as mu * (1 - stress_growth_penalty * S). Cells divide after adding
+    added_volume (CV added_cv) since birth; division_cv sets the spread of the
+    volume split around 1/2.
+    """
+
+    def __init__(
+        self,
+        regulator_config: Optional[Mapping] = None,
+        n_cells: int = 100,
+        growth_rate: float = np.log(2) / 30.0,
+        stress_growth_penalty: float = 0.5,
+        added_volume: float = 1.0,
+        added_cv: float = 0.1,
+        division_cv: float = 0.05,
+        max_cells: int = 10_000,
+        seed: Optional[int] = 0,
+        lineage: Optional[LineageRecord] = None,
+        core=None,
+    ) -> None:
+        core = core or register_types(ProcessTypes())
+        self.regulator = SRNARegulator(dict(regulator_config or {'mode': 'activator'}), core=core)
+        self.rng = np.random.default_rng(seed)
+        self.growth_rate = float(growth_rate)
+        self.stress_growth_penalty = float(stress_growth_penalty)
+        self.added_volume = float(added_volume)
+        self.added_cv = float(added_cv)
+        self.division_cv = float(division_cv)
+        self.max_cells = int(max_cells)
+        self.lineage = lineage or LineageRecord(capacity=4 * max(n_cells, 1))
+
+        init = self.regulator.initial_state()['cell']
+        n = int(n_cells)
+        self.volume = self.rng.uniform(1.0, 2.0, n) * self.added_volume
+        self.birth_volume = self.volume.copy()
+        self.amounts = np.tile([init[k] for k in SPECIES], (n, 1)) * self.volume[:, None]
+        self.ids = self.lineage.new_cells(np.full(n, -1, dtype=np.int64), 0.0)
+        self.target = self._draw_added(n)
+        self.time = 0.0
+        self.weight = 1.0  # real cells per simulated cell after subsampling
+        self.n_divisions = 0
+
+    @property
+    def n_cells(self) -> int:
+        return self.volume.size
+
+    def concentrations(self) -> np.ndarray:
+        return self.amounts / self.volume[:, None]
+
+    def _draw_added(self, k: int) -> np.ndarray:
+        return self.added_volume * np.maximum(1.0 + self.added_cv * self.rng.standard_normal(k), 0.2)
+
+    # ------------------------ Dynamics ------------------------
+    def step(self, dt: float, S: float = 0.0) -> None:
+        conc = self.concentrations()
+        cell = {k: conc[:, i] for i, k in enumerate(SPECIES)}
+        cell['S'] = float(S)
+        delta = self.regulator.update({'cell': cell}, dt)['cell']
+        for i, k in enumerate(SPECIES):
+            self.amounts[:, i] += delta[k] * self.volume
+        np.maximum(self.amounts, 0.0, out=self.amounts)
+
+        mu = self.growth_rate * max(1.0 - self.stress_growth_penalty * float(S), 0.0)
+        self.volume *= np.exp(mu * dt)
+        self.time += dt
+
+        dividing = np.flatnonzero(self.volume - self.birth_volume >= self.target)
+        if dividing.size:
+            self._divide(dividing)
+        if self.n_cells > self.max_cells:
+            self._subsample()
+        self.lineage.spill(int(self.ids.min()))
+
+    def _divide(self, idx: np.ndarray) -> None:
+        k = idx.size
+        frac = np.clip(0.5 + self.division_cv * self.rng.standard_normal(k), 0.05, 0.95)
+        # integer molecule counts, rounded without bias, then split binomially
+        a = self.amounts[idx]
+        whole = np.floor(a)
+        counts = (whole + (self.rng.random(a.shape) < (a - whole))).astype(np.int64)
+        first = self.rng.binomial(counts, frac[:, None])
+        second = counts - first
+
+        parents = self.ids[idx]
+        self.lineage.mark_division(parents, self.time)
+        v = self.volume[idx]
+        new_ids = self.lineage.new_cells(np.concatenate([parents, parents]), self.time)
+
+        # first daughter reuses the mother's row; second is appended
+        self.amounts[idx] = first
+        self.volume[idx] = v * frac
+        self.birth_volume[idx] = v * frac
+        self.ids[idx] = new_ids[:k]
+        self.target[idx] = self._draw_added(k)
+
+        self.amounts = np.concatenate([self.amounts, second.astype(float)])
+        self.volume = np.concatenate([self.volume, v * (1.0 - frac)])
+        self.birth_volume = np.concatenate([self.birth_volume, v * (1.0 - frac)])
+        self.ids = np.concatenate([self.ids, new_ids[k:]])
+        self.target = np.concatenate([self.target, self._draw_added(k)])
+        self.n_divisions += k
+
+    def _subsample(self) -> None:
+        keep = np.sort(self.rng.choice(self.n_cells, size=self.max_cells, replace=False))
+        self.weight *= self.n_cells / self.max_cells
+        self.amounts = self.amounts[keep]
+        self.volume = self.volume[keep]
+        self.birth_volume = self.birth_volume[keep]
+        self.ids = self.ids[keep]
+        self.target = self.target[keep]
+
+    def run(self, duration: float, dt: float = 0.05, S: float = 0.0,
+            record_every: int = 20) -> Dict[str, np.ndarray]:
+        """
+        Advance by duration; S is a constant or a callable S(t). Every
+        record_every steps stores the population means of each concentration,
+        the mean volume, the number of cells and the cumulative divisions.
+        """
+        n_steps = int(round(duration / dt))
+        rows = []
+
+        def record(s):
+            conc = self.concentrations()
+            rows.append([self.time, s, self.n_cells, self.n_divisions, self.volume.mean(),
+                         *conc.mean(axis=0)])
+
+        stress = S if callable(S) else (lambda t: S)
+        record(stress(self.time))
+        for i in range(1, n_steps + 1):
+            s = float(stress(self.time))
+            self.step(dt, s)
+            if i % record_every == 0 or i == n_steps:
+                record(s)
+        arr = np.array(rows)
+        out = {'times': arr[:, 0], 'S': arr[:, 1], 'n_cells': arr[:, 2],
+               'n_divisions': arr[:, 3], 'volume': arr[:, 4]}
+        for i, k in enumerate(SPECIES):
+            out[k] = arr[:, 5 + i]
+        return out
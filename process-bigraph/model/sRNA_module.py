@@ -1,7 +1,6 @@
 from process_bigraph.composite import Process
 from process_bigraph import register_types, ProcessTypes
 import numpy as np
-import matplotlib.pyplot as plt
 
 # ---------------------------- Process ----------------------------
 class SRNARegulator(Process):
@@ -74,6 +73,9 @@ class SRNARegulator(Process):
         p_rho = cfg['rho_p0'] * (1.0 - rho_relief)
         k_tx_m = k_tx_m_raw * (1.0 - p_rho)
 
+        # optional external scaling of rpoS transcription (e.g. Eσ^S allocation)
+        k_tx_m *= float(x.get('tx_scale', 1.0))
+
         # pairing
         s, m = x.get('s', 0.0), x.get('m', 0.0)
         H = cfg['H']
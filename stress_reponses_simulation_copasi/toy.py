@@ -42,9 +42,16 @@
 #     print ('')
 from matplotlib import pyplot as plt
 from basico import *
-biomod = load_biomodel(10)
-print(biomod)
 
-tc = run_time_course(duration = 100)
-tc.plot()
-plt.show()
\ No newline at end of file
+
+def main() -> None:
+    biomod = load_biomodel(10)
+    print(biomod)
+
+    tc = run_time_course(duration = 100)
+    tc.plot()
+    plt.show()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,171 @@
+"""
+Adaptive ensemble sizing with sequential stopping rules.
+
+This module:
+- Defines precision targets evaluated on a running EnsembleResult:
+  SEMTarget (standard error of the mean at chosen times) and
+  QuantileCITarget (width of a distribution-free confidence interval for a
+  quantile, read from the QuantileSketch).
+- run_adaptive() launches batches of realizations until every target is met
+  or the run budget is spent, and reports how many runs that took.
+- ssa_batches() / basico_batches() adapt the two ensemble engines to the
+  batch interface run_batch(seed, n) -> EnsembleResult, with disjoint seeds
+  per batch.
+"""
+
+from __future__ import annotations
+import math
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .ensemble import EnsembleResult
+
+BatchRunner = Callable[[int, int], EnsembleResult]
+
+
+def _time_indices(times: np.ndarray, at: Optional[Sequence[float]]) -> np.ndarray:
+    if at is None:
+        return np.arange(1, times.size)  # t=0 is deterministic
+    return np.array([int(np.argmin(np.abs(times - t))) for t in at])
+
+
+class SEMTarget:
+    """
+    SE(mean of observable) <= max(abs_tol, rel_tol * |mean|) at the given
+    times (all grid points after t=0 when times is None).
+    """
+
+    def __init__(self, observable: str, times: Optional[Sequence[float]] = None,
+                 abs_tol: float = 0.0, rel_tol: float = 0.01) -> None:
+        self.observable = observable
+        self.times = times
+        self.abs_tol = float(abs_tol)
+        self.rel_tol = float(rel_tol)
+
+    def evaluate(self, result: EnsembleResult) -> Tuple[bool, float]:
+        """(met, worst ratio of achieved to allowed error)."""
+        j = result.index(self.observable)
+        idx = _time_indices(result.times, self.times)
+        sem = result.stats.sem[idx, j]
+        allowed = np.maximum(self.abs_tol, self.rel_tol * np.abs(result.stats.mean[idx, j]))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = np.where(allowed > 0, sem / allowed, np.where(sem > 0, np.inf, 0.0))
+        worst = float(np.max(ratio))
+        return worst <= 1.0, worst
+
+    def __repr__(self) -> str:
+        return f"SEMTarget({self.observable!r}, rel_tol={self.rel_tol}, abs_tol={self.abs_tol})"
+
+
+class QuantileCITarget:
+    """
+    Width of the order-statistic CI (z=1.96: ~95%) for quantile q of observable
+    <= max(abs_tol, rel_tol * |estimate|) at the given times. The CI ranks are
+    n*q ± z*sqrt(n q (1-q)); values come from the ensemble's QuantileSketch,
+    so run the engines with quantiles=True.
+    """
+
+    def __init__(self, observable: str, q: float = 0.95, times: Optional[Sequence[float]] = None,
+                 abs_tol: float = 0.0, rel_tol: float = 0.05, z: float = 1.96) -> None:
+        self.observable = observable
+        self.q = float(q)
+        self.times = times
+        self.abs_tol = float(abs_tol)
+        self.rel_tol = float(rel_tol)
+        self.z = float(z)
+
+    def evaluate(self, result: EnsembleResult) -> Tuple[bool, float]:
+        if result.sketch is None:
+            raise ValueError("QuantileCITarget needs an ensemble run with quantiles=True")
+        n = result.n_runs
+        half = self.z * math.sqrt(n * self.q * (1.0 - self.q))
+        lo_q = max(0.0, (n * self.q - half) / max(n - 1, 1))
+        hi_q = min(1.0, (n * self.q + half) / max(n - 1, 1))
+        j = result.index(self.observable)
+        idx = _time_indices(result.times, self.times)
+        qv = result.sketch.quantiles([lo_q, self.q, hi_q])[:, idx, j]
+        width = qv[2] - qv[0]
+        allowed = np.maximum(self.abs_tol, self.rel_tol * np.abs(qv[1]))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = np.where(allowed > 0, width / allowed, np.where(width > 0, np.inf, 0.0))
+        worst = float(np.max(ratio))
+        return worst <= 1.0, worst
+
+    def __repr__(self) -> str:
+        return f"QuantileCITarget({self.observable!r}, q={self.q}, rel_tol={self.rel_tol})"
+
+
+def run_adaptive(
+    run_batch: BatchRunner,
+    targets: Sequence,
+    batch_size: int = 100,
+    min_runs: int = 50,
+    max_runs: int = 10_000,
+    seed: int = 0,
+    growth: float = 1.0,
+) -> Tuple[EnsembleResult, Dict]:
+    """
+    Launch batches until all targets hold (after at least min_runs) or
+    max_runs is reached. With growth > 1 each batch is that much larger than
+    the previous one. Batch k starts at seed + runs_so_far, so seeds never
+    repeat. Returns (merged result, report) where report has 'n_runs',
+    'converged', 'n_batches' and per-batch 'history' of target ratios.
+    """
+    result: Optional[EnsembleResult] = None
+    history: List[Dict] = []
+    n_done = 0
+    size = float(batch_size)
+    converged = False
+    while n_done < max_runs:
+        n = int(min(max(round(size), 1), max_runs - n_done))
+        if n_done < min_runs:
+            n = max(n, min(min_runs, max_runs) - n_done)
+        batch = run_batch(seed + n_done, n)
+        result = batch if result is None else result.merge(batch)
+        n_done += n
+
+        ratios = {}
+        met_all = True
+        for target in targets:
+            met, worst = target.evaluate(result)
+            ratios[repr(target)] = worst
+            met_all &= met
+        history.append({'n_runs': n_done, 'ratios': ratios})
+        if met_all and n_done >= min_runs:
+            converged = True
+            break
+        size *= growth
+
+    report = {
+        'n_runs': n_done,
+        'converged': converged,
+        'n_batches': len(history),
+        'history': history,
+    }
+    return result, report
+
+
+# =============================================================================
+# Engine adapters
+# =============================================================================
+def ssa_batches(model, duration: float = 100.0, step_number: int = 200,
+                quantiles: bool = False, **kwargs) -> BatchRunner:
+    """Batch runner for ssa.run_ensemble on a MassActionModel."""
+    from .ssa import run_ensemble
+
+    def run(seed: int, n: int) -> EnsembleResult:
+        return run_ensemble(model, n, duration, step_number, seed=seed,
+                            quantiles=quantiles, **kwargs)
+    return run
+
+
+def basico_batches(model_path: str, duration: float = 100.0, step_number: int = 200,
+                   quantiles: bool = False, **kwargs) -> BatchRunner:
+    """Batch runner for ensemble.run_basico_ensemble on a .cps model."""
+    from .ensemble import run_basico_ensemble
+
+    def run(seed: int, n: int) -> EnsembleResult:
+        return run_basico_ensemble(model_path, n, duration, step_number, seed=seed,
+                                   quantiles=quantiles, **kwargs)
+    return run
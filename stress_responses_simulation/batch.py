@@ -0,0 +1,424 @@
+"""
+Declarative run specifications and a resumable batch runner.
+
+This module:
+- Reads a run spec (JSON or YAML) naming the model, engine, parameter grid,
+  seeds, time grid and outputs, and expands it into tasks: one per
+  parameter point x seed, each with a stable id derived from its content.
+- Runs the tasks on a local process pool with three engines: 'tellurium'
+  (RoadRunner on an SBML/Antimony model, cvode or gillespie), 'ssa'
+  (batched Gillespie on a copasi_models definition) and 'basico'
+  (run_time_course on a .cps model or model_registry key); each worker
+  loads a model once and reuses it across tasks.
+- Writes every finished task to a TrajectoryStore under the output
+  directory as a chunk named by the task id (seeds and grid parameters in
+  its sidecar), then appends the id to completed.jsonl. A restarted batch
+  skips completed ids; a task interrupted between the two steps is simply
+  rewritten under the same chunk name.
+
+Spec example (YAML):
+
+    name: sigma70-scan
+    model: practice4            # path, stress_responses module or definition key
+    engine: tellurium
+    parameters:
+      Sig70_tot: {linspace: [200, 1400, 13]}
+      stress_ox: [0, 1]
+    fixed: {stress_cold: 1}
+    time: {duration: 1200, step_number: 1200}
+    outputs: [RpoS, ES]
+"""
+
+from __future__ import annotations
+import hashlib
+import itertools
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .result_cache import canonical
+from .trajectory_store import TrajectoryStore
+
+ENGINES = ('tellurium', 'ssa', 'basico')
+SPEC_FILE = 'spec.json'
+COMPLETED_FILE = 'completed.jsonl'
+FAILED_FILE = 'failed.jsonl'
+
+
+# =============================================================================
+# Specs
+# =============================================================================
+def load_spec(path: str) -> Dict:
+    """Read a .json / .yaml / .yml run spec and normalize it."""
+    with open(path) as fh:
+        if path.endswith(('.yaml', '.yml')):
+            import yaml
+            spec = yaml.safe_load(fh)
+        else:
+            spec = json.load(fh)
+    return normalize_spec(spec)
+
+
+def _values(v) -> List[float]:
+    if isinstance(v, Mapping):
+        (kind, args), = v.items()
+        if kind == 'linspace':
+            return np.linspace(*args).tolist()
+        if kind == 'geomspace':
+            return np.geomspace(*args).tolist()
+        if kind == 'arange':
+            return np.arange(*args).tolist()
+        raise ValueError(f"unknown value generator {kind!r}")
+    if isinstance(v, (list, tuple)):
+        return [float(x) for x in v]
+    return [float(v)]
+
+
+def normalize_spec(spec: Mapping) -> Dict:
+    """
+    Fill defaults and expand value generators: parameters become explicit
+    lists, seeds a list (None for deterministic runs), time
+    {start, duration, step_number}.
+    """
+    spec = dict(spec)
+    for key in ('model', 'engine'):
+        if key not in spec:
+            raise ValueError(f"run spec needs '{key}'")
+    if spec['engine'] not in ENGINES:
+        raise ValueError(f"engine must be one of {ENGINES}, got {spec['engine']!r}")
+    params = {str(k): _values(v) for k, v in dict(spec.get('parameters') or {}).items()}
+
+    seeds = spec.get('seeds')
+    if isinstance(seeds, Mapping):
+        seeds = list(range(int(seeds.get('start', 0)), int(seeds.get('start', 0)) + int(seeds['count'])))
+    elif seeds is not None:
+        seeds = [int(s) for s in (seeds if isinstance(seeds, (list, tuple)) else [seeds])]
+
+    t = dict(spec.get('time') or {})
+    duration = float(t.get('duration', 100.0))
+    if 'step_number' in t:
+        steps = int(t['step_number'])
+    else:
+        steps = int(t.get('points', 101)) - 1
+
+    return {
+        'name': str(spec.get('name', 'batch')),
+        'model': spec['model'],
+        'engine': spec['engine'],
+        'parameters': params,
+        'fixed': {str(k): float(v) for k, v in dict(spec.get('fixed') or {}).items()},
+        'seeds': seeds,
+        'runs': int(spec.get('runs', 1)),
+        'time': {'start': float(t.get('start', 0.0)), 'duration': duration, 'step_number': steps},
+        'outputs': list(spec['outputs']) if spec.get('outputs') else None,
+        'options': dict(spec.get('options') or {}),
+    }
+
+
+def expand(spec: Mapping) -> List[Dict]:
+    """Tasks {'id', 'params', 'seed'} for the grid x seeds, in a stable order."""
+    names = list(spec['parameters'])
+    grid = itertools.product(*(spec['parameters'][n] for n in names)) if names else [()]
+    seeds = spec['seeds'] if spec['seeds'] is not None else [None]
+    tasks = []
+    for point in grid:
+        for seed in seeds:
+            task = {'params': dict(zip(names, point)), 'seed': seed}
+            payload = json.dumps(canonical(task), sort_keys=True, separators=(',', ':'))
+            task['id'] = hashlib.sha256(payload.encode('utf-8')).hexdigest()[:20]
+            tasks.append(task)
+    return tasks
+
+
+def time_points(spec: Mapping) -> np.ndarray:
+    t = spec['time']
+    return np.linspace(t['start'], t['start'] + t['duration'], t['step_number'] + 1)
+
+
+# =============================================================================
+# Engines (run inside worker processes)
+# =============================================================================
+# Loaded models per worker process, keyed by engine and model spec.
+_MODELS: Dict[str, object] = {}
+
+
+def _cached(key: str, load):
+    if key not in _MODELS:
+        _MODELS[key] = load()
+    return _MODELS[key]
+
+
+def _run_tellurium(spec: Mapping, task: Mapping) -> Tuple[np.ndarray, List[str]]:
+    from .integrator_profile import apply_recorded, configure
+
+    opts = spec['options']
+    rr = _cached('tellurium:' + spec['model'], lambda: _load_rr(spec['model']))
+    integrator = opts.get('integrator')
+    if integrator:
+        configure(rr, integrator, opts.get('integrator_settings'))
+    else:
+        apply_recorded(rr)
+    ids = spec['outputs'] or list(rr.model.getFloatingSpeciesIds())
+    t = spec['time']
+    runs = []
+    for r in range(spec['runs']):
+        rr.resetAll()
+        for k, v in {**spec['fixed'], **task['params']}.items():
+            rr[k] = float(v)
+        if rr.getIntegrator().getName() == 'gillespie' and task['seed'] is not None:
+            rr.getIntegrator().setValue('seed', int(task['seed']) + r)
+        rr.timeCourseSelections = ['time'] + ids
+        res = np.asarray(rr.simulate(t['start'], t['start'] + t['duration'], t['step_number'] + 1))
+        runs.append(res[:, 1:])
+    return np.stack(runs), ids
+
+
+def _load_rr(model: str):
+    from .cli import _model_text
+    from .integrator_profile import _load
+    return _load(_model_text(model))
+
+
+def _run_ssa(spec: Mapping, task: Mapping) -> Tuple[np.ndarray, List[str]]:
+    from .ssa import simulate_batch, srna_model
+
+    def load():
+        if spec['model'] == 'srna':
+            return srna_model()
+        from .copasi_models import DEFINITIONS, to_mass_action
+        return to_mass_action(DEFINITIONS[spec['model']])
+    model = _cached('ssa:' + spec['model'], load).with_parameters(**{**spec['fixed'], **task['params']})
+    t = spec['time']
+    seed = task['seed'] if task['seed'] is not None else 0
+    _grid, counts = simulate_batch(model, spec['runs'], t['duration'], t['step_number'],
+                                   seed=seed, **spec['options'])
+    ids = spec['outputs'] or list(model.species)
+    cols = [model.species.index(s) for s in ids]
+    return counts[:, :, cols].astype(float), ids
+
+
+def _basico_model(path: str):
+    """(datamodel, species names) of a .cps model, loaded once per worker."""
+    import basico
+
+    def load():
+        dm = basico.load_model(path)
+        return dm, set(basico.get_species(model=dm).index)
+    return _cached('basico:' + path, load)
+
+
+def _basico_value(dm, species, name: str) -> float:
+    import basico
+
+    if name.startswith('('):
+        table, column = basico.get_reaction_parameters(name, model=dm), 'value'
+    elif name in species:
+        table, column = basico.get_species(name, exact=True, model=dm), 'initial_concentration'
+    else:
+        table, column = basico.get_parameters(name, exact=True, model=dm), 'initial_value'
+    if table is None or name not in table.index:
+        raise KeyError(f"{name!r} is not a species or parameter of the model")
+    return float(table.loc[name, column])
+
+
+def _set_basico_value(dm, species, name: str, value: float) -> None:
+    import basico
+
+    if name.startswith('('):
+        basico.set_reaction_parameters(name, value=float(value), model=dm)
+    elif name in species:
+        basico.set_species(name, initial_concentration=float(value), model=dm)
+    else:
+        basico.set_parameters(name, initial_value=float(value), model=dm)
+
+
+def _run_basico(spec: Mapping, task: Mapping) -> Tuple[np.ndarray, List[str]]:
+    import basico
+    from .integrator_profile import with_basico_options
+
+    path = spec['model']
+    if not os.path.exists(path):
+        from .model_registry import artifact
+        path = artifact(path)
+    # the worker's shared datamodel: every value a task sets is put back afterwards
+    dm, species = _basico_model(path)
+    changes = {**spec['fixed'], **task['params']}
+    original = {k: _basico_value(dm, species, k) for k in changes}
+    try:
+        for k, v in changes.items():
+            _set_basico_value(dm, species, k, v)
+        opts = dict(spec['options'])
+        opts.setdefault('method', 'deterministic' if task['seed'] is None else 'stochastic')
+        opts = with_basico_options(path, opts)  # recorded tolerances of a profiled model
+        t = spec['time']
+        runs, cols = [], None
+        for r in range(spec['runs']):
+            kwargs = dict(opts)
+            if task['seed'] is not None:
+                kwargs.update(seed=int(task['seed']) + r, use_seed=True)
+            df = basico.run_time_course(duration=t['duration'], step_number=t['step_number'],
+                                        start_time=t['start'], model=dm, **kwargs)
+            cols = spec['outputs'] or list(df.columns)
+            runs.append(df[cols].to_numpy(dtype=float))
+        return np.stack(runs), cols
+    finally:
+        for k, v in original.items():
+            _set_basico_value(dm, species, k, v)
+
+
+_RUNNERS = {'tellurium': _run_tellurium, 'ssa': _run_ssa, 'basico': _run_basico}
+
+
+def run_task(spec: Mapping, task: Mapping) -> Tuple[str, np.ndarray, List[str], float]:
+    """(task id, (runs, n_times, n_outputs) values, output names, seconds)."""
+    t0 = time.perf_counter()
+    values, ids = _RUNNERS[spec['engine']](spec, task)
+    return task['id'], values, ids, time.perf_counter() - t0
+
+
+# =============================================================================
+# Batch runner
+# =============================================================================
+def _completed(out_dir: str) -> set:
+    path = os.path.join(out_dir, COMPLETED_FILE)
+    done = set()
+    if os.path.exists(path):
+        with open(path) as fh:
+            for line in fh:
+                try:
+                    done.add(json.loads(line)['id'])
+                except (ValueError, KeyError):
+                    continue  # a line cut short by a crash
+    return done
+
+
+def _log(path: str, record: Mapping) -> None:
+    with open(path, 'a') as fh:
+        fh.write(json.dumps(record) + '\n')
+        fh.flush()
+        os.fsync(fh.fileno())
+
+
+def _check_spec(out_dir: str, spec: Mapping) -> None:
+    path = os.path.join(out_dir, SPEC_FILE)
+    if os.path.exists(path):
+        with open(path) as fh:
+            if json.load(fh) != json.loads(json.dumps(spec)):
+                raise ValueError(f"{out_dir} holds a batch for a different spec; use a new directory")
+        return
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as fh:
+        json.dump(spec, fh, indent=1)
+    os.replace(tmp, path)
+
+
+def task_store(path: str, spec: Mapping, observables: Sequence[str]) -> TrajectoryStore:
+    """Create (or open, if another process got there first) the store for spec's tasks."""
+    return TrajectoryStore.create(path, time_points(spec), observables, param_names=list(spec['parameters']),
+                                  attrs={'name': spec['name'], 'engine': spec['engine']}, exist_ok=True)
+
+
+def store_task(store: TrajectoryStore, spec: Mapping, task: Mapping, values: np.ndarray) -> str:
+    """
+    Write one task's runs as the chunk named by its id. Run seeds are
+    seed + run index (the batched SSA shares one seed per task; -1 marks
+    deterministic runs).
+    """
+    seed = -1 if task['seed'] is None else int(task['seed'])
+    n = values.shape[0]
+    seeds = np.full(n, seed, dtype=np.int64) if spec['engine'] == 'ssa' or seed < 0 else seed + np.arange(n)
+    return store.append(values, seeds, {k: task['params'][k] for k in spec['parameters']}, name=task['id'])
+
+
+def open_store(out_dir: str) -> TrajectoryStore:
+    """The TrajectoryStore of a batch output directory."""
+    return TrajectoryStore(os.path.join(out_dir, 'store'))
+
+
+def run_batch(
+    spec,
+    out_dir: str,
+    n_workers: Optional[int] = None,
+    max_tasks: Optional[int] = None,
+    retry_failed: bool = True,
+    verbose: bool = False,
+) -> Dict:
+    """
+    Run every task of spec (a path or a spec mapping) not yet recorded in
+    out_dir/completed.jsonl. max_tasks stops after that many new tasks
+    (handy for splitting a batch over several sessions). Failed tasks are
+    logged to failed.jsonl and retried on the next call unless
+    retry_failed=False. Returns counts of total / skipped / done / failed
+    tasks and the store path.
+    """
+    spec = load_spec(spec) if isinstance(spec, str) else normalize_spec(spec)
+    out_dir = os.path.abspath(out_dir)
+    os.makedirs(out_dir, exist_ok=True)
+    _check_spec(out_dir, spec)
+
+    tasks = expand(spec)
+    done = _completed(out_dir)
+    if not retry_failed:
+        fpath = os.path.join(out_dir, FAILED_FILE)
+        if os.path.exists(fpath):
+            with open(fpath) as fh:
+                done |= {json.loads(line)['id'] for line in fh if line.strip()}
+    todo = [t for t in tasks if t['id'] not in done]
+    if max_tasks is not None:
+        todo = todo[:int(max_tasks)]
+    by_id = {t['id']: t for t in todo}
+    store: Optional[TrajectoryStore] = None
+    summary = {'tasks': len(tasks), 'skipped': sum(t['id'] in done for t in tasks),
+               'done': 0, 'failed': 0, 'store': os.path.join(out_dir, 'store')}
+
+    def record(task_id, values, ids, seconds):
+        nonlocal store
+        task = by_id[task_id]
+        if store is None:
+            store = task_store(summary['store'], spec, ids)
+        store_task(store, spec, task, values)
+        _log(os.path.join(out_dir, COMPLETED_FILE), {'id': task_id, 'seconds': round(seconds, 4)})
+        summary['done'] += 1
+        if verbose:
+            print(f"[{summary['done']}/{len(todo)}] {task['params']} seed={task['seed']} ({seconds:.2f}s)")
+
+    def failed(task_id, exc):
+        _log(os.path.join(out_dir, FAILED_FILE), {'id': task_id, 'error': repr(exc)})
+        summary['failed'] += 1
+
+    n_workers = n_workers or os.cpu_count() or 1
+    if n_workers <= 1:
+        for task in todo:
+            try:
+                record(*run_task(spec, task))
+            except Exception as exc:  # noqa: BLE001 - logged and retried on resume
+                failed(task['id'], exc)
+        return summary
+
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        pending = {}
+        queue = iter(todo)
+        try:
+            # keep a bounded number of tasks in flight so an interrupt loses little work
+            for task in itertools.islice(queue, 2 * n_workers):
+                pending[pool.submit(run_task, spec, task)] = task['id']
+            while pending:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    task_id = pending.pop(fut)
+                    try:
+                        record(*fut.result())
+                    except Exception as exc:  # noqa: BLE001
+                        failed(task_id, exc)
+                    nxt = next(queue, None)
+                    if nxt is not None:
+                        pending[pool.submit(run_task, spec, nxt)] = nxt['id']
+        except KeyboardInterrupt:
+            for fut in pending:
+                fut.cancel()
+            raise
+    return summary
@@ -0,0 +1,457 @@
+"""
+Command-line entry points for the simulation engines.
+
+This module:
+- Exposes one console command per engine (srs-ssa, srs-hybrid,
+  srs-basico-ensemble, srs-colony, srs-profile, srs-map, srs-steady,
+  srs-scan, srs-batch, srs-queue, srs-tolerance, srs-composite) and an
+  'srs' command that takes the engine as its first argument.
+- srs-composite runs the process-bigraph composites of
+  process-bigraph/Paper, which are scripts rather than package modules:
+  it needs a source checkout.
+- Parses arguments before importing anything heavy; each engine (and
+  tellurium / basico / scipy behind it) is imported only when its command
+  runs, so --help and short batch jobs start quickly.
+- Writes ensemble and colony results as .npz (times, observables, mean,
+  std, optional quantiles) and prints a one-line summary.
+"""
+
+from __future__ import annotations
+import argparse
+import os
+import sys
+from typing import Callable, Dict, List, Optional
+
+MODEL_MODULES = ('model', 'practice', 'practice3', 'practice4')
+
+
+def _model_text(spec: str) -> str:
+    """A model file path as given, or the Antimony text of a stress_responses module."""
+    if os.path.exists(spec):
+        return spec
+    if spec in MODEL_MODULES:
+        import importlib
+        mod = importlib.import_module(f'.stress_responses.{spec}', __package__)
+        return getattr(mod, 'antimony_str', None) or mod.ant
+    raise SystemExit(f"model {spec!r} is neither a file nor one of {', '.join(MODEL_MODULES)}")
+
+
+def _save_result(result, path: Optional[str], quantiles: bool = False) -> None:
+    import numpy as np
+
+    print(f"{result.n_runs} runs, {result.times.size} time points, observables: {', '.join(result.observables)}")
+    if not path:
+        return
+    arrays = {'times': result.times, 'observables': np.array(result.observables),
+              'mean': result.stats.mean, 'std': result.stats.std}
+    if quantiles and result.sketch is not None:
+        qs = (0.05, 0.25, 0.5, 0.75, 0.95)
+        arrays['quantile_levels'] = np.array(qs)
+        arrays['quantiles'] = result.sketch.quantiles(qs)
+    np.savez_compressed(path, **arrays)
+    print(f"wrote {path}")
+
+
+def _ensemble_args(p: argparse.ArgumentParser, duration: float, steps: int) -> None:
+    p.add_argument('--runs', type=int, default=1000, help="number of realizations")
+    p.add_argument('--duration', type=float, default=duration)
+    p.add_argument('--steps', type=int, default=steps, help="output intervals (run_time_course step_number)")
+    p.add_argument('--seed', type=int, default=0)
+    p.add_argument('--out', type=str, default=None, help=".npz file for mean/std (and quantiles)")
+    p.add_argument('--cache', action='store_true', help="look the run up in (and add it to) the result cache")
+
+
+# =============================================================================
+# Engines
+# =============================================================================
+def _ssa_parser(p: argparse.ArgumentParser) -> None:
+    p.add_argument('--model', default='srna',
+                   help="'srna' (ssa.srna_model) or a copasi_models definition key")
+    _ensemble_args(p, 100.0, 200)
+    p.add_argument('--batch-size', type=int, default=1000)
+    p.add_argument('--quantiles', action='store_true')
+    p.add_argument('--store', type=str, default=None, help="TrajectoryStore directory for raw runs")
+
+
+def _ssa_run(args: argparse.Namespace) -> None:
+    from .ssa import run_ensemble, srna_model
+
+    if args.model == 'srna':
+        model = srna_model()
+    else:
+        from .copasi_models import DEFINITIONS, to_mass_action
+        model = to_mass_action(DEFINITIONS[args.model])
+    result = run_ensemble(model, args.runs, args.duration, args.steps, seed=args.seed,
+                          batch_size=args.batch_size, quantiles=args.quantiles, store=args.store,
+                          cache=args.cache)
+    _save_result(result, args.out, args.quantiles)
+
+
+def _hybrid_parser(p: argparse.ArgumentParser) -> None:
+    _ensemble_args(p, 200.0, 400)
+    p.add_argument('--scale', type=float, default=1.0, help="system size of the ECOLI_ROS model")
+    p.add_argument('--workers', type=int, default=None)
+
+
+def _hybrid_run(args: argparse.Namespace) -> None:
+    from .hybrid import ecoli_ros_model, run_hybrid_ensemble
+
+    result = run_hybrid_ensemble(ecoli_ros_model(args.scale), args.runs, args.duration, args.steps,
+                                 seed=args.seed, n_workers=args.workers, cache=args.cache)
+    _save_result(result, args.out)
+
+
+def _basico_parser(p: argparse.ArgumentParser) -> None:
+    p.add_argument('model', help=".cps path or a model_registry key")
+    _ensemble_args(p, 100.0, 200)
+    p.add_argument('--workers', type=int, default=None)
+    p.add_argument('--quantiles', action='store_true')
+    p.add_argument('--store', type=str, default=None, help="TrajectoryStore directory for raw runs")
+
+
+def _basico_run(args: argparse.Namespace) -> None:
+    from .ensemble import run_basico_ensemble
+
+    path = args.model
+    if not os.path.exists(path):
+        from .model_registry import artifact
+        path = artifact(path)
+    result = run_basico_ensemble(path, args.runs, args.duration, args.steps, seed=args.seed,
+                                 n_workers=args.workers, quantiles=args.quantiles, store=args.store,
+                                 cache=args.cache)
+    _save_result(result, args.out, args.quantiles)
+
+
+def _colony_parser(p: argparse.ArgumentParser) -> None:
+    p.add_argument('--shape', type=int, nargs=2, default=(128, 128))
+    p.add_argument('--cells', type=int, default=1000)
+    p.add_argument('--duration', type=float, default=10.0)
+    p.add_argument('--dt', type=float, default=0.1)
+    p.add_argument('--method', choices=('fft', 'stencil'), default='fft')
+    p.add_argument('--seed', type=int, default=0)
+    p.add_argument('--out', type=str, default=None, help=".npz file for the recorded means")
+
+
+def _colony_run(args: argparse.Namespace) -> None:
+    import numpy as np
+    from .colony import Colony
+
+    colony = Colony(shape=tuple(args.shape), n_cells=args.cells, method=args.method, seed=args.seed)
+    out = colony.run(args.duration, dt=args.dt)
+    means = ', '.join(f'{s}={v:.4g}' for s, v in zip(out['field_species'], out['field_mean'][-1]))
+    print(f"{colony.n_cells} cells, t={colony.time:g}: mean fields {means}")
+    if args.out:
+        np.savez_compressed(args.out, **out)
+        print(f"wrote {args.out}")
+
+
+def _profile_parser(p: argparse.ArgumentParser) -> None:
+    p.add_argument('model', help=f"SBML/CopasiML/.ant path or one of {', '.join(MODEL_MODULES)}")
+    p.add_argument('--duration', type=float, default=1000.0)
+    p.add_argument('--points', type=int, default=201)
+    p.add_argument('--rtol', type=float, default=1e-4, help="accuracy target, relative")
+    p.add_argument('--atol', type=float, default=1e-6, help="accuracy target, absolute")
+    p.add_argument('--record', nargs='?', const='', default=None, metavar='DIR',
+                   help="save the recommendation in DIR (default $STRESS_RESPONSES_INTEGRATOR_SETTINGS)")
+
+
+def _profile_run(args: argparse.Namespace) -> None:
+    from .integrator_profile import profile_model
+
+    prof = profile_model(_model_text(args.model), duration=args.duration, points=args.points,
+                         rtol=args.rtol, atol=args.atol, record=args.record is not None,
+                         root=args.record or None)
+    if prof.stiffness['ratio']:
+        print(f"stiffness ratio (max over samples): {max(prof.stiffness['ratio']):.3g}")
+    print(prof.table())
+    print(f"recommended: {prof.recommended['label']}  basico: {prof.basico_options}")
+
+
+def _map_parser(p: argparse.ArgumentParser) -> None:
+    p.add_argument('model', help=f"SBML/.ant path or one of {', '.join(MODEL_MODULES)}")
+    p.add_argument('x', help="parameter on the x axis")
+    p.add_argument('x_range', type=float, nargs=2)
+    p.add_argument('y', help="parameter on the y axis")
+    p.add_argument('y_range', type=float, nargs=2)
+    p.add_argument('--outputs', nargs='+', default=['RpoS'])
+    p.add_argument('--duration', type=float, default=1200.0)
+    p.add_argument('--levels', type=int, default=4, help="maximum refinement levels")
+    p.add_argument('--tol', type=float, default=0.01, help="refinement tolerance (fraction of range)")
+    p.add_argument('--log', choices=('x', 'y', 'xy'), default='')
+    p.add_argument('--workers', type=int, default=1)
+    p.add_argument('--out', type=str, default=None, help=".npz file for the mesh")
+
+
+def _map_run(args: argparse.Namespace) -> None:
+    from .parameter_map import SteadyStateEvaluator, map_plane
+
+    ev = SteadyStateEvaluator(_model_text(args.model), args.x, args.y, args.outputs, duration=args.duration)
+    pmap = map_plane(ev, tuple(args.x_range), tuple(args.y_range), args.x, args.y,
+                     max_level=args.levels, value_tol=args.tol, outputs=args.outputs,
+                     log=('x' in args.log, 'y' in args.log), n_workers=args.workers)
+    print(f"{pmap.n_evaluations} evaluations (uniform grid at the finest spacing: {pmap.uniform_equivalent})")
+    if args.out:
+        pmap.save(args.out)
+        print(f"wrote {args.out}")
+
+
+def _steady_parser(p: argparse.ArgumentParser) -> None:
+    p.add_argument('model', help=f"SBML/.ant path or one of {', '.join(MODEL_MODULES)}")
+    p.add_argument('parameter')
+    p.add_argument('range', type=float, nargs=2)
+    p.add_argument('--points', type=int, default=13)
+    p.add_argument('--outputs', nargs='+', default=['RpoS'])
+    p.add_argument('--t-max', type=float, default=10000.0, help="give up after this time")
+    p.add_argument('--rtol', type=float, default=1e-5, help="relative derivative norm, per time unit")
+    p.add_argument('--window', type=float, default=50.0, help="time the criterion must hold")
+    p.add_argument('--out', type=str, default=None, help=".npz file for the metric arrays")
+
+
+def _steady_run(args: argparse.Namespace) -> None:
+    import numpy as np
+    from .integrator_profile import _load
+    from .steady_state import steady_state_scan
+
+    rr = _load(_model_text(args.model))
+    values = np.linspace(args.range[0], args.range[1], args.points)
+    res = steady_state_scan(rr, args.parameter, values, args.outputs, t_max=args.t_max,
+                            rtol=args.rtol, window=args.window)
+    cols = [f'{o}.{m}' for o in args.outputs for m in ('steady', 'peak', 'rise_time', 'settling_time')]
+    print('  '.join([f'{args.parameter:>12}', f"{'t_stop':>9}"] + [f'{c:>18}' for c in cols]))
+    for i, v in enumerate(values):
+        flag = '' if res['reached'][i] else '*'
+        print('  '.join([f'{v:>12.5g}', f"{res['t_stop'][i]:>8g}{flag or ' '}"]
+                        + [f'{res[c][i]:>18.6g}' for c in cols]))
+    if not res['reached'].all():
+        print("* not steady by --t-max")
+    if args.out:
+        np.savez_compressed(args.out, **res)
+        print(f"wrote {args.out}")
+
+
+def _scan_parser(p: argparse.ArgumentParser) -> None:
+    p.add_argument('model', help=f"SBML/CopasiML/.ant path or one of {', '.join(MODEL_MODULES)}")
+    p.add_argument('parameter', help="global parameter (reaction-local ones as '<reaction>_<param>')")
+    p.add_argument('range', type=float, nargs=2)
+    p.add_argument('--points', type=int, default=11)
+    p.add_argument('--log', action='store_true', help="geometric spacing of the scan values")
+    p.add_argument('--duration', type=float, default=1000.0)
+    p.add_argument('--steps', type=int, default=200, help="output intervals")
+    p.add_argument('--outputs', nargs='+', default=None, help="species to record (default: all floating)")
+    p.add_argument('--out', type=str, default=None, help=".npz file for the trajectories")
+
+
+def _scan_run(args: argparse.Namespace) -> None:
+    import numpy as np
+    from .integrator_profile import _load
+    from .sbml_backend import parameter_scan
+
+    rr = _load(_model_text(args.model))
+    values = (np.geomspace if args.log else np.linspace)(args.range[0], args.range[1], args.points)
+    times, out, ids = parameter_scan(rr, args.parameter, values, args.duration, args.steps, args.outputs)
+    print('  '.join([f'{args.parameter:>12}'] + [f'{i:>14}' for i in ids]) + f'   (t = {times[-1]:g})')
+    for v, run in zip(values, out):
+        print('  '.join([f'{v:>12.5g}'] + [f'{x:>14.6g}' for x in run[-1]]))
+    if args.out:
+        np.savez_compressed(args.out, times=times, observables=np.array(ids),
+                            parameter=np.array(args.parameter), values=values, trajectories=out)
+        print(f"wrote {args.out}")
+
+
+def _batch_parser(p: argparse.ArgumentParser) -> None:
+    p.add_argument('spec', help="run spec (.json / .yaml)")
+    p.add_argument('out', help="output directory (rerun with the same directory to resume)")
+    p.add_argument('--workers', type=int, default=None)
+    p.add_argument('--max-tasks', type=int, default=None, help="stop after this many new tasks")
+    p.add_argument('--skip-failed', action='store_true', help="do not retry tasks that failed before")
+    p.add_argument('--quiet', action='store_true')
+
+
+def _batch_run(args: argparse.Namespace) -> None:
+    from .batch import run_batch
+
+    summary = run_batch(args.spec, args.out, n_workers=args.workers, max_tasks=args.max_tasks,
+                        retry_failed=not args.skip_failed, verbose=not args.quiet)
+    print(f"{summary['tasks']} tasks: {summary['skipped']} already done, {summary['done']} run, "
+          f"{summary['failed']} failed; store at {summary['store']}")
+
+
+def _queue_parser(p: argparse.ArgumentParser) -> None:
+    sub = p.add_subparsers(dest='action', required=True)
+    init = sub.add_parser('init', help="create a queue directory from a run spec")
+    init.add_argument('spec', help="run spec (.json / .yaml)")
+    init.add_argument('queue')
+    work = sub.add_parser('work', help="pull and run tasks until the queue is empty")
+    work.add_argument('queue')
+    work.add_argument('--workers', type=int, default=1, help="worker processes to start on this host")
+    work.add_argument('--max-tasks', type=int, default=None, help="per worker")
+    work.add_argument('--stale', type=float, default=60.0, help="seconds before a silent claim is reclaimed")
+    work.add_argument('--heartbeat', type=float, default=10.0)
+    work.add_argument('--quiet', action='store_true')
+    sub.add_parser('status', help="task counts per state").add_argument('queue')
+    reclaim = sub.add_parser('reclaim', help="return stale claims to pending now")
+    reclaim.add_argument('queue')
+    reclaim.add_argument('--stale', type=float, default=60.0)
+
+
+def _queue_run(args: argparse.Namespace) -> None:
+    from . import work_queue as wq
+
+    if args.action == 'init':
+        counts = wq.init_queue(args.spec, args.queue)
+    elif args.action == 'work':
+        kwargs = dict(max_tasks=args.max_tasks, stale=args.stale, heartbeat=args.heartbeat, verbose=not args.quiet)
+        if args.workers > 1:
+            counts = wq.run_local_workers(args.queue, args.workers, **kwargs)
+        else:
+            done = wq.work(args.queue, **kwargs)
+            print(f"this worker: {done['done']} done, {done['failed']} failed")
+            counts = wq.status(args.queue)
+    elif args.action == 'reclaim':
+        print(f"reclaimed {len(wq.reclaim(args.queue, args.stale))} tasks")
+        counts = wq.status(args.queue)
+    else:
+        counts = wq.status(args.queue)
+    print(', '.join(f'{k}: {v}' for k, v in counts.items()))
+
+
+def _tolerance_parser(p: argparse.ArgumentParser) -> None:
+    p.add_argument('models', nargs='+',
+                   help=f"SBML/.ant paths or any of {', '.join(MODEL_MODULES)} (RoadRunner ladders); "
+                        ".cps paths or model_registry keys (basico LSODA r_tol ladder)")
+    p.add_argument('--duration', type=float, default=1000.0)
+    p.add_argument('--points', type=int, default=201)
+    p.add_argument('--outputs', nargs='+', default=None, help="species to compare (default: all floating)")
+    p.add_argument('--metric', choices=('max_rel', 'rel_l2', 'final_rel'), default='max_rel')
+    p.add_argument('--required', type=float, default=1e-3, help="accuracy the cheapest setting must meet")
+    p.add_argument('--repeats', type=int, default=3, help="wall time is the best of this many runs")
+    p.add_argument('--explicit', choices=('auto', 'yes', 'no'), default='auto',
+                   help="RK45 / Euler rungs; auto offers them to non-stiff models only")
+    p.add_argument('--out', type=str, default=None, help=".json or .csv report")
+
+
+def _tolerance_workload(spec: str, args: argparse.Namespace):
+    from .tolerance_report import basico_workload, roadrunner_workload
+
+    if spec.endswith('.cps') or (not os.path.exists(spec) and spec not in MODEL_MODULES):
+        path = spec
+        if not os.path.exists(path):
+            from .model_registry import DEFINITIONS, artifact
+            if spec not in DEFINITIONS:
+                raise SystemExit(f"model {spec!r} is not a file, a stress_responses module or a registry key")
+            path = artifact(spec)
+        return basico_workload(path, args.duration, args.points - 1, name=spec)
+    return roadrunner_workload(_model_text(spec), args.duration, args.points, args.outputs,
+                               explicit={'auto': None, 'yes': True, 'no': False}[args.explicit], name=spec)
+
+
+def _tolerance_run(args: argparse.Namespace) -> None:
+    from .tolerance_report import assess
+
+    workloads = [_tolerance_workload(m, args) for m in args.models]
+    report = assess(workloads, args.metric, args.required, repeats=args.repeats)
+    print(report.table())
+    print("* Pareto front of wall time vs error   > cheapest setting within --required")
+    if args.out:
+        report.save(args.out)
+        print(f"wrote {args.out}")
+
+
+def _paper_dir() -> str:
+    return os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'process-bigraph', 'Paper')
+
+
+def _composite_parser(p: argparse.ArgumentParser) -> None:
+    p.add_argument('--mode', choices=('single', 'fig', 'feedback'), default='fig',
+                   help="single: σS pulse time course; fig: three allocation panels; "
+                        "feedback: multi-rate sigma/rpoS composite with and without coupling")
+    p.add_argument('--seed', type=int, default=None)
+    p.add_argument('--style', type=str, default='seaborn-v0_8', help="matplotlib style")
+    p.add_argument('--duration', type=float, default=100.0, help="feedback mode end time")
+
+
+def _composite_run(args: argparse.Namespace) -> None:
+    paper = _paper_dir()
+    if not os.path.isdir(paper):
+        raise SystemExit(f"the process-bigraph composites are scripts in the source tree; {paper} is missing")
+    if paper not in sys.path:
+        sys.path.insert(0, paper)
+    if args.mode != 'feedback':
+        import composite_utils
+        argv = ['--mode', args.mode, '--style', args.style]
+        composite_utils.main(argv + (['--seed', str(args.seed)] if args.seed is not None else []))
+        return
+    from rpos_feedback_composite import run_feedback
+
+    base = run_feedback(args.duration, coupled=False)
+    loop = run_feedback(args.duration, coupled=True)
+    print(f"SRNARegulator alone: P={base['P']:.2f}  {base['wall_time']:.3f}s")
+    print(f"with sigma feedback: P={loop['P']:.2f}  tx_scale={loop['tx_scale']:.3f}  "
+          f"{loop['wall_time']:.3f}s  ({loop['n_solves']} solves, {loop['n_skipped']} skipped)")
+
+
+ENGINES: Dict[str, tuple] = {
+    'ssa': (_ssa_parser, _ssa_run, "batched Gillespie ensemble of a mass-action model"),
+    'hybrid': (_hybrid_parser, _hybrid_run, "hybrid SSA/ODE ensemble of the E. coli ROS model"),
+    'basico-ensemble': (_basico_parser, _basico_run, "parallel basico/COPASI stochastic ensemble"),
+    'colony': (_colony_parser, _colony_run, "lattice colony with diffusing ROS fields"),
+    'profile': (_profile_parser, _profile_run, "integrator profiling and recommended settings"),
+    'map': (_map_parser, _map_run, "adaptive 2-D parameter-plane map"),
+    'steady': (_steady_parser, _steady_run, "1-D scan run to steady state with response metrics"),
+    'scan': (_scan_parser, _scan_run, "1-D RoadRunner parameter scan on one compiled model"),
+    'batch': (_batch_parser, _batch_run, "resumable batch of runs from a JSON/YAML spec"),
+    'queue': (_queue_parser, _queue_run, "shared-directory work queue for batch specs across hosts"),
+    'tolerance': (_tolerance_parser, _tolerance_run, "accuracy-versus-cost report over solver tolerances"),
+    'composite': (_composite_parser, _composite_run, "process-bigraph sigma-competition composites"),
+}
+
+
+# =============================================================================
+# Entry points
+# =============================================================================
+def parse_args(argv: Optional[List[str]] = None, engine: Optional[str] = None) -> argparse.Namespace:
+    """Parse argv for one engine, or for 'srs <engine> ...' when engine is None."""
+    if engine is not None:
+        build, run, help_text = ENGINES[engine]
+        p = argparse.ArgumentParser(prog=f'srs-{engine}', description=help_text)
+        build(p)
+        p.set_defaults(run=run)
+        return p.parse_args(argv)
+    p = argparse.ArgumentParser(prog='srs', description="Stress-response simulation engines")
+    sub = p.add_subparsers(dest='engine', required=True)
+    for name, (build, run, help_text) in ENGINES.items():
+        sp = sub.add_parser(name, help=help_text, description=help_text)
+        build(sp)
+        sp.set_defaults(run=run)
+    return p.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None, engine: Optional[str] = None) -> int:
+    args = parse_args(argv, engine)
+    args.run(args)
+    return 0
+
+
+def _entry(engine: str) -> Callable[[], int]:
+    def run() -> int:
+        return main(sys.argv[1:], engine)
+    run.__name__ = f"{engine.replace('-', '_')}_main"
+    return run
+
+
+ssa_main = _entry('ssa')
+hybrid_main = _entry('hybrid')
+basico_ensemble_main = _entry('basico-ensemble')
+colony_main = _entry('colony')
+profile_main = _entry('profile')
+map_main = _entry('map')
+steady_main = _entry('steady')
+scan_main = _entry('scan')
+batch_main = _entry('batch')
+queue_main = _entry('queue')
+tolerance_main = _entry('tolerance')
+composite_main = _entry('composite')
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,249 @@
+"""
+Spatial colony simulation: diffusing H2O2 / superoxide fields and per-cell
+OxyR/SoxRS kinetics.
+
+This module:
+- Holds H2O2 and O2- as 2-D lattice fields, diffused either spectrally
+  (exact FFT propagator, periodic boundaries) or with a sub-stepped 5-point
+  stencil (no-flux edges, or fixed-concentration reservoir edges).
+- Places cells on lattice sites and integrates the ECOLI_ROS mass-action
+  network (OxyR/KatG/AhpCF, SoxR/SoxS/SodA) for all of them at once as a
+  (n_cells, n_species) array with RK4.
+- Couples the two both ways: each cell sees the field value at its site, and
+  the H2O2 / O2- it consumes (detox, sensor oxidation) is summed per site and
+  removed from the field, scaled by the cell/site volume fraction.
+- Splits the per-cell update over threads (numpy releases the GIL), so 10^5
+  cells run on one multi-core node.
+"""
+
+from __future__ import annotations
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .ssa import MassActionModel
+
+# µm^2/s in water
+DEFAULT_DIFFUSION = {'H2O2': 1400.0, 'O2m': 2000.0}
+
+
+# =============================================================================
+# Diffusion
+# =============================================================================
+class FFTDiffusion:
+    """Exact diffusion step on a periodic lattice: f_hat *= exp(-D |k|^2 dt)."""
+
+    def __init__(self, shape: Tuple[int, int], dx: float, D: float) -> None:
+        kx = 2 * np.pi * np.fft.fftfreq(shape[0], d=dx)
+        ky = 2 * np.pi * np.fft.rfftfreq(shape[1], d=dx)
+        self._k2 = kx[:, None] ** 2 + ky[None, :] ** 2
+        self.shape = shape
+        self.D = float(D)
+        self._dt = None
+        self._kernel = None
+
+    def step(self, field: np.ndarray, dt: float) -> np.ndarray:
+        if dt != self._dt:
+            self._kernel = np.exp(-self.D * self._k2 * dt)
+            self._dt = dt
+        return np.fft.irfft2(np.fft.rfft2(field) * self._kernel, s=self.shape)
+
+
+class StencilDiffusion:
+    """
+    Explicit 5-point Laplacian, sub-stepped below the stability limit
+    dx^2 / (4 D). boundary=None gives no-flux edges; a number holds the
+    edges at that concentration (a reservoir).
+    """
+
+    def __init__(self, shape: Tuple[int, int], dx: float, D: float,
+                 boundary: Optional[float] = None, safety: float = 0.9) -> None:
+        self.shape = shape
+        self.dx = float(dx)
+        self.D = float(D)
+        self.boundary = boundary
+        self.dt_max = safety * dx * dx / (4.0 * D) if D > 0 else np.inf
+        self._pad = np.empty((shape[0] + 2, shape[1] + 2))
+
+    def step(self, field: np.ndarray, dt: float) -> np.ndarray:
+        if self.D <= 0:
+            return field
+        n_sub = max(1, int(np.ceil(dt / self.dt_max)))
+        h = dt / n_sub
+        c = self.D * h / (self.dx * self.dx)
+        f = field.copy()
+        p = self._pad
+        for _ in range(n_sub):
+            p[1:-1, 1:-1] = f
+            if self.boundary is None:
+                p[0, 1:-1], p[-1, 1:-1] = f[0], f[-1]
+                p[1:-1, 0], p[1:-1, -1] = f[:, 0], f[:, -1]
+            else:
+                p[0, :] = p[-1, :] = p[:, 0] = p[:, -1] = self.boundary
+            f += c * (p[:-2, 1:-1] + p[2:, 1:-1] + p[1:-1, :-2] + p[1:-1, 2:] - 4.0 * f)
+        return f
+
+
+# =============================================================================
+# Colony
+# =============================================================================
+class Colony:
+    """
+    Cells on an (nx, ny) lattice with diffusing extracellular fields.
+
+    model: MassActionModel whose species include the field species (default
+    ECOLI_ROS via hybrid.ecoli_ros_model). Field species inside a cell track
+    the local field; everything else is per-cell state. cell_fraction is
+    V_cell / V_site, the factor converting a cell's consumption into a change
+    of the site concentration. production gives per-cell release rates of
+    field species (e.g. metabolic superoxide).
+    """
+
+    def __init__(
+        self,
+        model: Optional[MassActionModel] = None,
+        shape: Tuple[int, int] = (128, 128),
+        dx: float = 2.0,
+        n_cells: int = 1000,
+        positions: Optional[np.ndarray] = None,
+        field_species: Sequence[str] = ('H2O2', 'O2m'),
+        diffusion: Optional[Mapping[str, float]] = None,
+        method: str = 'fft',
+        boundary: Optional[Mapping[str, float]] = None,
+        initial_fields: Optional[Mapping[str, float]] = None,
+        production: Optional[Mapping[str, float]] = None,
+        cell_fraction: float = 0.25,
+        seed: Optional[int] = 0,
+        n_threads: Optional[int] = None,
+    ) -> None:
+        if model is None:
+            from .hybrid import ecoli_ros_model
+            model = ecoli_ros_model()
+        self.model = model
+        self.shape = (int(shape[0]), int(shape[1]))
+        self.dx = float(dx)
+        self.field_species = list(field_species)
+        self._field_idx = np.array([model.species.index(s) for s in self.field_species])
+        self.cell_fraction = float(cell_fraction)
+        self.n_threads = n_threads or os.cpu_count() or 1
+        self.time = 0.0
+
+        rng = np.random.default_rng(seed)
+        n_sites = self.shape[0] * self.shape[1]
+        if positions is None:
+            positions = rng.choice(n_sites, size=int(n_cells), replace=int(n_cells) > n_sites)
+            positions = np.column_stack(np.unravel_index(positions, self.shape))
+        self.positions = np.asarray(positions, dtype=np.int64)
+        self.site = np.ravel_multi_index((self.positions[:, 0], self.positions[:, 1]), self.shape)
+
+        # intracellular state starts from the model's initial pools
+        self.cells = np.tile(np.asarray(model.initial, dtype=float), (self.n_cells, 1))
+
+        init = dict(initial_fields or {})
+        self.fields: Dict[str, np.ndarray] = {}
+        for j, sid in zip(self._field_idx, self.field_species):
+            self.fields[sid] = np.full(self.shape, float(init.get(sid, model.initial[j])))
+
+        D = dict(DEFAULT_DIFFUSION)
+        D.update(diffusion or {})
+        bnd = dict(boundary or {})
+        self._diffusers = {}
+        for sid in self.field_species:
+            if method == 'fft':
+                if bnd:
+                    raise ValueError("reservoir boundaries need method='stencil'")
+                self._diffusers[sid] = FFTDiffusion(self.shape, self.dx, D.get(sid, 0.0))
+            elif method == 'stencil':
+                self._diffusers[sid] = StencilDiffusion(self.shape, self.dx, D.get(sid, 0.0), bnd.get(sid))
+            else:
+                raise ValueError(f"unknown diffusion method {method!r}")
+
+        self._production = np.zeros(len(self.field_species))
+        for i, sid in enumerate(self.field_species):
+            self._production[i] = float((production or {}).get(sid, 0.0))
+
+    @property
+    def n_cells(self) -> int:
+        return self.positions.shape[0]
+
+    # ------------------------ Kinetics ------------------------
+    def _react(self, x: np.ndarray, dt: float) -> np.ndarray:
+        """RK4 step of the per-cell network for a block of cells (in place)."""
+        rhs = self.model.rhs
+        k1 = rhs(x)
+        k2 = rhs(x + 0.5 * dt * k1)
+        k3 = rhs(x + 0.5 * dt * k2)
+        k4 = rhs(x + dt * k3)
+        x += (dt / 6.0) * (k1 + 2 * k2 + 2 * k3 + k4)
+        np.maximum(x, 0.0, out=x)
+        return x
+
+    def _blocks(self) -> List[slice]:
+        n = self.n_cells
+        n_blocks = min(self.n_threads, max(1, n // 2048))
+        edges = np.linspace(0, n, n_blocks + 1).astype(int)
+        return [slice(a, b) for a, b in zip(edges[:-1], edges[1:]) if b > a]
+
+    def step(self, dt: float) -> None:
+        """Diffuse the fields, then react all cells against their local field values."""
+        for sid in self.field_species:
+            self.fields[sid] = self._diffusers[sid].step(self.fields[sid], dt)
+
+        n_sites = self.shape[0] * self.shape[1]
+        flat = [self.fields[sid].reshape(-1) for sid in self.field_species]
+        x = self.cells
+        before = np.column_stack([f[self.site] for f in flat])
+        x[:, self._field_idx] = before
+
+        blocks = self._blocks()
+        if len(blocks) == 1:
+            self._react(x, dt)
+        elif blocks:
+            with ThreadPoolExecutor(max_workers=len(blocks)) as pool:
+                list(pool.map(lambda sl: self._react(x[sl], dt), blocks))
+
+        # per-site exchange: consumption (and release) by the cells there
+        change = (x[:, self._field_idx] - before + self._production * dt) * self.cell_fraction
+        for i, f in enumerate(flat):
+            f += np.bincount(self.site, weights=change[:, i], minlength=n_sites)
+            np.maximum(f, 0.0, out=f)
+        self.time += dt
+
+    def run(self, duration: float, dt: float = 0.1, record_every: int = 10,
+            snapshots: bool = False) -> Dict[str, np.ndarray]:
+        """
+        Advance by duration in steps of dt. Every record_every steps stores
+        the mean field concentrations and mean per-cell species (and full
+        field snapshots if asked).
+        """
+        n_steps = int(round(duration / dt))
+        times, field_means, cell_means, snaps = [], [], [], []
+
+        def record():
+            times.append(self.time)
+            field_means.append([self.fields[s].mean() for s in self.field_species])
+            cell_means.append(self.cells.mean(axis=0))
+            if snapshots:
+                snaps.append(np.stack([self.fields[s] for s in self.field_species]))
+
+        record()
+        for i in range(1, n_steps + 1):
+            self.step(dt)
+            if i % record_every == 0 or i == n_steps:
+                record()
+        out = {
+            'times': np.array(times),
+            'field_species': np.array(self.field_species),
+            'field_mean': np.array(field_means),
+            'species': np.array(self.model.species),
+            'cell_mean': np.array(cell_means),
+        }
+        if snapshots:
+            out['snapshots'] = np.array(snaps)
+        return out
+
+    def total(self, sid: str) -> float:
+        """Field amount in site-volume units (for checking conservation)."""
+        return float(self.fields[sid].sum())
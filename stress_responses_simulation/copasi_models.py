@@ -0,0 +1,134 @@
+"""
+Declarative definitions of the basico models in stress_reponses_simulation_copasi/.
+
+Each definition is plain JSON-serializable data:
+    {'name': ..., 'species': {id: initial copies}, 'reactions': [(name, scheme, k), ...]}
+All reactions are irreversible mass action in molecule counts (compartment
+'cytoplasm', volume 1), which is what the scripts describe in their comments.
+model_registry.py builds them into .cps artifacts; ssa.py / hybrid engines
+consume them through to_mass_action().
+"""
+
+from __future__ import annotations
+from typing import Dict, Mapping, Optional
+
+from .ssa import MassActionModel
+
+
+# stochastic.py
+SRNA_STOCHASTIC = {
+    'name': 'sRNA_stochastic',
+    'species': {'mRNA': 0, 'sRNA': 0, 'duplex': 0, 'protein': 0},
+    'reactions': [
+        ('transcription_mRNA', ' -> mRNA', 1.0),
+        ('transcription_sRNA', ' -> sRNA', 1.0),
+        ('degradation_mRNA', 'mRNA -> ', 0.1),
+        ('degradation_sRNA', 'sRNA -> ', 0.1),
+        ('binding', 'mRNA + sRNA -> duplex', 0.01),
+        ('degradation_duplex', 'duplex -> ', 0.5),
+        ('translation', 'mRNA -> mRNA + protein', 2.0),
+        ('degradation_protein', 'protein -> ', 0.05),
+    ],
+}
+
+# stochastic_deterministic.py
+SRNA_SOURCE = {
+    'name': 'sRNA_model',
+    'species': {'mRNA': 0, 'sRNA': 0, 'duplex': 0, 'protein': 0, 'Source': 1000000},
+    'reactions': [
+        ('transcription_mRNA', 'Source -> Source + mRNA', 0.01),
+        ('transcription_sRNA', 'Source -> Source + sRNA', 0.005),
+        ('degradation_mRNA', 'mRNA -> ', 0.1),
+        ('degradation_sRNA', 'sRNA -> ', 0.1),
+        ('binding', 'mRNA + sRNA -> duplex', 0.01),
+        ('degradation_duplex', 'duplex -> ', 0.5),
+        ('translation', 'mRNA -> mRNA + protein', 2.0),
+        ('degradation_protein', 'protein -> ', 0.05),
+    ],
+}
+
+# model/sRNA_test.py
+SRNA_TEST = {
+    'name': 'sRNA_stochastic',
+    'species': {'mRNA': 0, 'sRNA': 0, 'duplex': 0, 'protein': 0, 'Source': 1000000},
+    'reactions': [
+        ('transcription_mRNA', 'Source -> Source + mRNA', 1.0),
+        ('transcription_sRNA', 'Source -> Source + sRNA', 0.5),
+        ('degradation_mRNA', 'mRNA -> ', 0.1),
+        ('degradation_sRNA', 'sRNA -> ', 0.1),
+        ('binding', 'mRNA + sRNA -> duplex', 0.01),
+        ('degradation_duplex', 'duplex -> ', 0.5),
+        ('translation', 'mRNA -> mRNA + protein', 2.0),
+        ('degradation_protein', 'protein -> ', 0.05),
+    ],
+}
+
+# smbl.py (saved as srna_model_fixed.cps)
+SRNA_FIXED = {
+    'name': 'sRNA_model',
+    'species': {'M': 0, 'S': 0, 'D': 0, 'P': 0, 'SRC': 1000000},
+    'reactions': [
+        ('R_mRNA', 'SRC -> SRC + M', 0.01),
+        ('R_sRNA', 'SRC -> SRC + S', 0.005),
+        ('R_dm', 'M -> ', 0.1),
+        ('R_ds', 'S -> ', 0.1),
+        ('R_bind', 'M + S -> D', 0.01),
+        ('R_dd', 'D -> ', 0.5),
+        ('R_trans', 'M -> M + P', 2.0),
+        ('R_dp', 'P -> ', 0.05),
+    ],
+}
+
+# model/sbml model for oxidative stress.py (saved as OxyR_stress_model.cps)
+OXYR_STRESS = {
+    'name': 'OxyR_oxidative_stress',
+    'species': {'H2O2': 50, 'OxyR': 100, 'OxyRox': 0, 'KatG': 0, 'AhpCF': 0},
+    'reactions': [
+        ('R_act', 'OxyR + H2O2 -> OxyRox', 0.01),
+        ('R_katG', 'OxyRox -> OxyRox + KatG', 0.05),
+        ('R_ahpCF', 'OxyRox -> OxyRox + AhpCF', 0.02),
+        ('R_detox1', 'H2O2 + KatG -> KatG', 0.01),
+        ('R_detox2', 'H2O2 + AhpCF -> AhpCF', 0.005),
+        ('R_dKatG', 'KatG -> ', 0.001),
+        ('R_dAhp', 'AhpCF -> ', 0.001),
+    ],
+}
+
+# model/oxyR_SoxR.py (Ecoli_ROS_model.cps)
+ECOLI_ROS = {
+    'name': 'Ecoli_ROS_Response',
+    'species': {
+        'H2O2': 50, 'OxyR': 100, 'OxyRox': 0, 'KatG': 0, 'AhpCF': 0,
+        'O2m': 30, 'SoxR': 50, 'SoxRox': 0, 'SoxS': 0, 'SodA': 0,
+    },
+    'reactions': OXYR_STRESS['reactions'] + [
+        ('R_soxR', 'SoxR + O2m -> SoxRox', 0.02),
+        ('R_soxS', 'SoxRox -> SoxRox + SoxS', 0.05),
+        ('R_sodA', 'SoxS -> SoxS + SodA', 0.03),
+        ('R_sodA_detox', 'O2m + SodA -> SodA', 0.02),
+        ('R_dSoxS', 'SoxS -> ', 0.005),
+        ('R_dSodA', 'SodA -> ', 0.001),
+    ],
+}
+
+DEFINITIONS: Dict[str, Mapping] = {
+    'srna_stochastic': SRNA_STOCHASTIC,
+    'srna_source': SRNA_SOURCE,
+    'srna_test': SRNA_TEST,
+    'srna_fixed': SRNA_FIXED,
+    'oxyr_stress': OXYR_STRESS,
+    'ecoli_ros': ECOLI_ROS,
+}
+
+
+def to_mass_action(
+    definition: Mapping,
+    constant_pools: Optional[Mapping[str, float]] = None,
+) -> MassActionModel:
+    """MassActionModel for a definition (optionally folding pools like Source)."""
+    return MassActionModel(
+        definition['reactions'],
+        initial=definition['species'],
+        constant_pools=constant_pools,
+        name=definition['name'],
+    )
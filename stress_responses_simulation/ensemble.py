@@ -0,0 +1,332 @@
+"""
+Parallel stochastic ensembles with streaming statistics.
+
+This module:
+- Defines OnlineStats: per-time-point mean / variance / min / max accumulated
+  with Welford updates and mergeable across workers (Chan et al. pairwise form).
+- Runs seeded basico/COPASI realizations of a .cps model on a process pool,
+  loading the model once per worker process.
+- Keeps raw trajectories only when asked, so memory stays flat in n_runs;
+  quantile bands come from mergeable QuantileSketches (quantiles.py).
+"""
+
+from __future__ import annotations
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .quantiles import QuantileSketch
+
+
+# =============================================================================
+# Streaming statistics
+# =============================================================================
+class OnlineStats:
+    """
+    Welford accumulator over trajectories of shape (n_times, n_observables).
+    """
+
+    def __init__(self, n_times: int, n_observables: int) -> None:
+        shape = (int(n_times), int(n_observables))
+        self.count = 0
+        self.mean = np.zeros(shape)
+        self.m2 = np.zeros(shape)
+        self.min = np.full(shape, np.inf)
+        self.max = np.full(shape, -np.inf)
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.mean.shape
+
+    def push(self, traj: np.ndarray) -> None:
+        """Add one realization (n_times, n_observables)."""
+        x = np.asarray(traj, dtype=float)
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+        np.minimum(self.min, x, out=self.min)
+        np.maximum(self.max, x, out=self.max)
+
+    def push_batch(self, trajs: np.ndarray) -> None:
+        """Add a batch (n_batch, n_times, n_observables) in one merge."""
+        x = np.asarray(trajs, dtype=float)
+        if x.shape[0] == 0:
+            return
+        batch = OnlineStats(*self.shape)
+        batch.count = x.shape[0]
+        batch.mean = x.mean(axis=0)
+        batch.m2 = ((x - batch.mean) ** 2).sum(axis=0)
+        batch.min = x.min(axis=0)
+        batch.max = x.max(axis=0)
+        self.merge(batch)
+
+    def merge(self, other: "OnlineStats") -> "OnlineStats":
+        """Fold another accumulator into this one (in place) and return self."""
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count = other.count
+            self.mean = other.mean.copy()
+            self.m2 = other.m2.copy()
+            self.min = other.min.copy()
+            self.max = other.max.copy()
+            return self
+        n = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean = self.mean + delta * (other.count / n)
+        self.m2 = self.m2 + other.m2 + delta ** 2 * (self.count * other.count / n)
+        np.minimum(self.min, other.min, out=self.min)
+        np.maximum(self.max, other.max, out=self.max)
+        self.count = n
+        return self
+
+    @property
+    def variance(self) -> np.ndarray:
+        """Unbiased sample variance (zeros while count < 2)."""
+        if self.count < 2:
+            return np.zeros(self.shape)
+        return self.m2 / (self.count - 1)
+
+    @property
+    def std(self) -> np.ndarray:
+        return np.sqrt(self.variance)
+
+    @property
+    def sem(self) -> np.ndarray:
+        """Standard error of the mean."""
+        if self.count < 2:
+            return np.full(self.shape, np.inf)
+        return self.std / np.sqrt(self.count)
+
+
+class EnsembleResult:
+    """Time grid, observable names, merged OnlineStats, optional sketch and raw runs."""
+
+    def __init__(
+        self,
+        times: np.ndarray,
+        observables: Sequence[str],
+        stats: OnlineStats,
+        trajectories: Optional[np.ndarray] = None,
+        seeds: Optional[np.ndarray] = None,
+        sketch: Optional[QuantileSketch] = None,
+    ) -> None:
+        self.times = np.asarray(times, dtype=float)
+        self.observables = list(observables)
+        self.stats = stats
+        self.trajectories = trajectories
+        self.seeds = seeds
+        self.sketch = sketch
+
+    @property
+    def n_runs(self) -> int:
+        return self.stats.count
+
+    def index(self, name: str) -> int:
+        return self.observables.index(name)
+
+    def mean(self, name: str) -> np.ndarray:
+        return self.stats.mean[:, self.index(name)]
+
+    def std(self, name: str) -> np.ndarray:
+        return self.stats.std[:, self.index(name)]
+
+    def quantiles(self, name: str, qs: Sequence[float] = (0.05, 0.25, 0.5, 0.75, 0.95)) -> np.ndarray:
+        """(len(qs), n_times) quantiles of one observable; needs quantiles=True."""
+        if self.sketch is None:
+            raise ValueError("run the ensemble with quantiles=True to get quantile bands")
+        return self.sketch.quantiles(qs)[:, :, self.index(name)]
+
+    def to_frame(self):
+        """Mean trajectories as a DataFrame indexed by time (like run_time_course)."""
+        import pandas as pd
+        return pd.DataFrame(self.stats.mean, index=pd.Index(self.times, name='Time'),
+                            columns=self.observables)
+
+    def merge(self, other: "EnsembleResult") -> "EnsembleResult":
+        """Fold another result on the same grid into this one (in place)."""
+        if other.observables != self.observables or other.times.shape != self.times.shape:
+            raise ValueError("cannot merge ensembles with different grids or observables")
+        self.stats.merge(other.stats)
+        if self.sketch is not None and other.sketch is not None:
+            self.sketch.merge(other.sketch)
+        elif other.sketch is not None or self.sketch is not None:
+            self.sketch = None
+        if self.trajectories is not None and other.trajectories is not None:
+            self.trajectories = np.concatenate([self.trajectories, other.trajectories])
+        else:
+            self.trajectories = None
+        # seeds must stay aligned with runs: only kept when both sides have them
+        if self.seeds is not None and other.seeds is not None:
+            self.seeds = np.concatenate([self.seeds, other.seeds])
+        else:
+            self.seeds = None
+        return self
+
+
+# =============================================================================
+# basico workers
+# =============================================================================
+# One model per worker process, loaded by the pool initializer.
+_WORKER_MODEL = None
+
+
+def _init_worker(model_path: str) -> None:
+    global _WORKER_MODEL
+    import basico
+    _WORKER_MODEL = basico.load_model(model_path)
+
+
+def _run_one(model, seed: int, duration: float, step_number: int,
+             observables: Optional[Sequence[str]], options: Mapping) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+    import basico
+    df = basico.run_time_course(
+        duration=duration,
+        step_number=step_number,
+        method='stochastic',
+        use_numbers=True,
+        seed=int(seed),
+        use_seed=True,
+        model=model,
+        **dict(options),
+    )
+    if df is None or len(df) != step_number + 1:
+        raise RuntimeError(f"stochastic run with seed {seed} failed (see COPASI messages above)")
+    cols = list(observables) if observables else list(df.columns)
+    return df.index.to_numpy(dtype=float), df[cols].to_numpy(dtype=float), cols
+
+
+def _run_chunk(
+    seeds: Sequence[int],
+    duration: float,
+    step_number: int,
+    observables: Optional[Sequence[str]],
+    keep_trajectories: bool,
+    rel_accuracy: Optional[float],
+    options: Mapping,
+    store_path: Optional[str] = None,
+) -> Tuple[np.ndarray, List[str], OnlineStats, Optional[QuantileSketch], Optional[np.ndarray]]:
+    """
+    Run a block of seeds in this worker and return its partial statistics.
+    With store_path the block's trajectories are appended to that
+    TrajectoryStore from here, so they never travel back to the parent.
+    """
+    stats, sketch = None, None
+    kept: List[np.ndarray] = []
+    times, cols = None, None
+    for seed in seeds:
+        times, traj, cols = _run_one(_WORKER_MODEL, seed, duration, step_number, observables, options)
+        if stats is None:
+            stats = OnlineStats(*traj.shape)
+            if rel_accuracy is not None:
+                sketch = QuantileSketch(*traj.shape, rel_accuracy=rel_accuracy)
+        stats.push(traj)
+        if sketch is not None:
+            sketch.push(traj)
+        if keep_trajectories or store_path:
+            kept.append(traj)
+    if store_path and kept:
+        from .trajectory_store import TrajectoryStore
+        store = TrajectoryStore.create(store_path, times, cols, exist_ok=True)
+        store.append(np.stack(kept), seeds)
+    raw = np.stack(kept) if keep_trajectories and kept else None
+    return times, cols, stats, sketch, raw
+
+
+def _chunks(seeds: np.ndarray, chunk_size: int) -> List[np.ndarray]:
+    return [seeds[i:i + chunk_size] for i in range(0, len(seeds), chunk_size)]
+
+
+def run_basico_ensemble(
+    model_path: str,
+    n_runs: int,
+    duration: float = 100.0,
+    step_number: int = 200,
+    observables: Optional[Sequence[str]] = None,
+    seed: int = 0,
+    n_workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    keep_trajectories: bool = False,
+    quantiles: bool = False,
+    rel_accuracy: float = 0.01,
+    store: Optional[str] = None,
+    cache=None,
+    **options,
+) -> EnsembleResult:
+    """
+    Run n_runs seeded stochastic realizations of a .cps model in parallel.
+
+    Each worker loads the model once; realizations are grouped into chunks so
+    only per-chunk OnlineStats (and, if keep_trajectories, raw arrays) cross
+    process boundaries. With quantiles=True each chunk also fills a
+    QuantileSketch and the sketches are merged. Seeds are seed, seed+1, ... so
+    results are reproducible regardless of n_workers. With store (a directory)
+    every worker appends its chunks to a TrajectoryStore there, tagged with
+    their seeds. Extra keyword options go to run_time_course (recorded
+    integrator profiles are for deterministic runs and do not apply). cache as in
+    sbml_backend.simulate() (keyed on the model file's content); runs written
+    to a store are not cached.
+    """
+    n_runs = int(n_runs)
+    if n_runs < 1:
+        raise ValueError("n_runs must be >= 1")
+    from .result_cache import code_digest, resolve
+
+    results = resolve(cache) if store is None else None
+    if results is not None:
+        with open(model_path, 'rb') as fh:
+            model_sha = hashlib.sha256(fh.read()).hexdigest()
+        parts = {'model': model_sha, 'code': code_digest(_run_chunk, EnsembleResult, QuantileSketch), 'options': options,
+                 'observables': list(observables) if observables else None,
+                 'args': [n_runs, float(duration), int(step_number), int(seed), chunk_size,
+                          bool(keep_trajectories), bool(quantiles), float(rel_accuracy)]}
+        return results.cached('ensemble.run_basico_ensemble', parts, lambda: run_basico_ensemble(
+            model_path, n_runs, duration, step_number, observables, seed, n_workers, chunk_size,
+            keep_trajectories, quantiles, rel_accuracy, cache=False, **options))
+    n_workers = n_workers or os.cpu_count() or 1
+    chunk_size = chunk_size or max(1, min(64, -(-n_runs // (4 * n_workers))))
+    seeds = np.arange(seed, seed + n_runs, dtype=np.int64)
+    model_path = os.path.abspath(model_path)
+
+    total: Optional[OnlineStats] = None
+    sketch: Optional[QuantileSketch] = None
+    raw_parts: List[np.ndarray] = []
+    times, cols = None, None
+    with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker,
+                             initargs=(model_path,)) as pool:
+        futures = [
+            pool.submit(_run_chunk, block, duration, step_number, observables,
+                        keep_trajectories, rel_accuracy if quantiles else None, options,
+                        os.path.abspath(store) if store else None)
+            for block in _chunks(seeds, chunk_size)
+        ]
+        # Merge in submission order so raw trajectories line up with seeds.
+        for fut in futures:
+            times, cols, part, part_sketch, raw = fut.result()
+            total = part if total is None else total.merge(part)
+            if part_sketch is not None:
+                sketch = part_sketch if sketch is None else sketch.merge(part_sketch)
+            if raw is not None:
+                raw_parts.append(raw)
+
+    trajectories = np.concatenate(raw_parts) if raw_parts else None
+    return EnsembleResult(times, cols, total, trajectories=trajectories, seeds=seeds, sketch=sketch)
+
+
+def summarize(result: EnsembleResult, names: Optional[Sequence[str]] = None) -> Dict[str, Dict[str, np.ndarray]]:
+    """Per-observable dict of mean / std / min / max arrays."""
+    names = names or result.observables
+    out: Dict[str, Dict[str, np.ndarray]] = {}
+    for name in names:
+        j = result.index(name)
+        out[name] = {
+            'mean': result.stats.mean[:, j],
+            'std': result.stats.std[:, j],
+            'min': result.stats.min[:, j],
+            'max': result.stats.max[:, j],
+        }
+    return out
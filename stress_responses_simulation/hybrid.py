@@ -0,0 +1,302 @@
+"""
+Hybrid stochastic/deterministic simulation with dynamic partitioning.
+
+This module:
+- Splits species into a stochastic set (copy number below a threshold) and a
+  deterministic set, with hysteresis so species near the threshold do not
+  flip back and forth; the partition is re-checked at every firing and grid
+  point during a run.
+- Treats a reaction as stochastic if it changes any stochastic species; the
+  remaining reactions are integrated as mass-action ODEs (RK4).
+- Couples the two exactly at firings: the integrated stochastic propensity
+  g(t) = ∫ a0(x(s)) ds is carried alongside the ODE and the next reaction
+  fires when g reaches an Exp(1) draw (root located by regula falsi).
+- Advances a batch of realizations together: each keeps its own clock and
+  partition, and the RK4 stages and firing searches are evaluated for all
+  of them in one vectorized pass (ensembles run in seeded batches, as in
+  ssa.py).
+- Provides ecoli_ros_model() for the OxyR/SoxRS network of model/oxyR_SoxR.py.
+"""
+
+from __future__ import annotations
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from .copasi_models import ECOLI_ROS, to_mass_action
+from .ensemble import EnsembleResult, OnlineStats
+from .ssa import MassActionModel, time_grid
+
+
+def ecoli_ros_model(scale: float = 1.0) -> MassActionModel:
+    """
+    OxyR (H2O2) + SoxRS (O2-) network with the initial pools of oxyR_SoxR.py.
+    scale multiplies every initial pool and divides bimolecular rate constants
+    (a larger cell volume), which keeps the deterministic limit unchanged.
+    """
+    model = to_mass_action(ECOLI_ROS)
+    if scale != 1.0:
+        order = model.reactant_orders.sum(axis=1)
+        model.rate_constants = model.rate_constants * float(scale) ** (1 - order)
+        model.initial = model.initial * float(scale)
+    return model
+
+
+class HybridSimulator:
+    """
+    Single-realization hybrid SSA/ODE engine on a MassActionModel.
+
+    threshold: copy number separating stochastic (below) from deterministic
+    species. A deterministic species becomes stochastic below
+    threshold * (1 - hysteresis), a stochastic one becomes deterministic above
+    threshold * (1 + hysteresis). dt_max bounds the ODE step.
+    """
+
+    def __init__(
+        self,
+        model: MassActionModel,
+        threshold: float = 20.0,
+        hysteresis: float = 0.2,
+        dt_max: float = 0.1,
+        event_tol: float = 1e-9,
+    ) -> None:
+        self.model = model
+        self.threshold = float(threshold)
+        self.hysteresis = float(hysteresis)
+        self.dt_max = float(dt_max)
+        self.event_tol = float(event_tol)
+        self._S = model.stoichiometry.astype(float)
+
+    # ------------------------ Partitioning ------------------------
+    def initial_partition(self, x: np.ndarray) -> np.ndarray:
+        return x < self.threshold
+
+    def repartition(self, x: np.ndarray, stoch: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        """Update the stochastic mask(s) in place; rounds species entering SSA."""
+        lo = self.threshold * (1.0 - self.hysteresis)
+        hi = self.threshold * (1.0 + self.hysteresis)
+        to_det = stoch & (x > hi)
+        to_stoch = ~stoch & (x < lo)
+        if to_stoch.any():
+            # unbiased rounding keeps the mean copy number
+            v = np.maximum(x[to_stoch], 0.0)
+            base = np.floor(v)
+            x[to_stoch] = base + (rng.random(base.size) < (v - base))
+        stoch[to_det] = False
+        stoch[to_stoch] = True
+        return stoch
+
+    def reaction_mask(self, stoch: np.ndarray) -> np.ndarray:
+        """True for reactions that change at least one stochastic species."""
+        return (stoch.astype(float) @ (self.model.stoichiometry.T != 0)) > 0
+
+    # ------------------------ Integration ------------------------
+    # Rows are realizations: x (n, n_species), g and h (n,), r_stoch (n, n_reactions).
+    def _deriv(self, x: np.ndarray, r_stoch: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        a = self.model.propensities(np.maximum(x, 0.0))
+        dx = np.where(r_stoch, 0.0, a) @ self._S
+        return dx, np.where(r_stoch, a, 0.0).sum(axis=1)
+
+    def _rk4(self, x: np.ndarray, g: np.ndarray, h: np.ndarray,
+             r_stoch: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        hc = h[:, None]
+        k1, q1 = self._deriv(x, r_stoch)
+        k2, q2 = self._deriv(x + 0.5 * hc * k1, r_stoch)
+        k3, q3 = self._deriv(x + 0.5 * hc * k2, r_stoch)
+        k4, q4 = self._deriv(x + hc * k3, r_stoch)
+        x_new = x + (hc / 6.0) * (k1 + 2 * k2 + 2 * k3 + k4)
+        g_new = g + (h / 6.0) * (q1 + 2 * q2 + 2 * q3 + q4)
+        return np.maximum(x_new, 0.0), g_new
+
+    def _locate(self, x: np.ndarray, g: np.ndarray, h: np.ndarray, g_hi: np.ndarray,
+                target: np.ndarray, r_stoch: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Regula falsi (Illinois) for the sub-step at which g hits target, per row."""
+        a, b = np.zeros_like(h), h.copy()
+        fa, fb = g - target, g_hi - target
+        side = np.zeros(h.size, dtype=int)
+        tol = self.event_tol * np.maximum(1.0, np.abs(target))
+        c_out, x_out = h.copy(), x.copy()
+        live = np.arange(h.size)
+        for _ in range(60):
+            with np.errstate(divide='ignore', invalid='ignore'):
+                c = np.where(fb[live] != fa[live],
+                             b[live] - fb[live] * (b[live] - a[live]) / (fb[live] - fa[live]),
+                             0.5 * (a[live] + b[live]))
+            x_mid, g_mid = self._rk4(x[live], g[live], c, r_stoch[live])
+            fc = g_mid - target[live]
+            c_out[live], x_out[live] = c, x_mid
+            done = (np.abs(fc) <= tol[live]) | ((b[live] - a[live]) < 1e-14)
+            up = ~done & (fc > 0)
+            down = ~done & ~(fc > 0)
+            i = live[up]
+            b[i], fb[i] = c[up], fc[up]
+            fa[i[side[i] == -1]] *= 0.5
+            side[i] = -1
+            i = live[down]
+            a[i], fa[i] = c[down], fc[down]
+            fb[i[side[i] == 1]] *= 0.5
+            side[i] = 1
+            live = live[~done]
+            if not live.size:
+                break
+        return c_out, x_out
+
+    def simulate_batch(
+        self,
+        n_runs: int,
+        duration: float = 200.0,
+        step_number: int = 400,
+        seed: Optional[int] = None,
+        initial: Optional[np.ndarray] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        n_runs realizations advanced together on the run_time_course grid.
+        Every realization keeps its own clock, partition and firing target;
+        each pass takes one ODE step (or locates one firing) in all unfinished
+        realizations at once. Returns a dict with 'times', 'values'
+        (n_runs, n_times, n_species), 'stochastic' (partition masks per grid
+        point) and per-realization counters 'n_firings' / 'n_ode_steps'.
+        Results are reproducible for a given (seed, n_runs).
+        """
+        rng = np.random.default_rng(seed)
+        model = self.model
+        grid = time_grid(duration, step_number)
+        n_t = grid.size
+        B = int(n_runs)
+
+        x = np.empty((B, model.n_species))
+        x[:] = model.initial if initial is None else np.asarray(initial, dtype=float)
+        stoch = self.initial_partition(x)
+        self.repartition(x, stoch, rng)
+        r_stoch = self.reaction_mask(stoch)
+
+        values = np.empty((B, n_t, model.n_species))
+        parts = np.empty((B, n_t, model.n_species), dtype=bool)
+        values[:, 0], parts[:, 0] = x, stoch
+        k = np.ones(B, dtype=np.int64)  # next grid index to fill per run
+        t, g = np.zeros(B), np.zeros(B)
+        target = rng.exponential(size=B)
+        n_fire = np.zeros(B, dtype=np.int64)
+        n_steps = np.zeros(B, dtype=np.int64)
+        rows = np.arange(B)
+
+        while True:
+            idx = rows[k < n_t]
+            if not idx.size:
+                break
+            h = np.minimum(self.dt_max, grid[k[idx]] - t[idx])
+            x_new, g_new = self._rk4(x[idx], g[idx], h, r_stoch[idx])
+            n_steps[idx] += 1
+
+            ok = g_new < target[idx]
+            s = idx[ok]
+            t[s] += h[ok]
+            x[s], g[s] = x_new[ok], g_new[ok]
+            s = s[t[s] >= grid[k[s]] - 1e-12]
+            if s.size:
+                t[s] = grid[k[s]]
+                xs, ps = x[s], stoch[s]
+                self.repartition(xs, ps, rng)
+                x[s], stoch[s] = xs, ps
+                r_stoch[s] = self.reaction_mask(ps)
+                values[s, k[s]], parts[s, k[s]] = xs, ps
+                k[s] += 1
+
+            # a stochastic reaction fires inside this step
+            f = idx[~ok]
+            if not f.size:
+                continue
+            h_star, xf = self._locate(x[f], g[f], h[~ok], g_new[~ok], target[f], r_stoch[f])
+            t[f] += h_star
+            a = np.where(r_stoch[f], model.propensities(np.maximum(xf, 0.0)), 0.0)
+            a0 = a.sum(axis=1)
+            u = rng.random(f.size) * a0
+            j = np.minimum((np.cumsum(a, axis=1) <= u[:, None]).sum(axis=1), model.n_reactions - 1)
+            live = a0 > 0.0
+            xf[live] = np.maximum(xf[live] + self._S[j[live]], 0.0)
+            n_fire[f[live]] += 1
+            g[f], target[f] = 0.0, rng.exponential(size=f.size)
+            ps = stoch[f]
+            self.repartition(xf, ps, rng)
+            x[f], stoch[f] = xf, ps
+            r_stoch[f] = self.reaction_mask(ps)
+
+        return {
+            'times': grid,
+            'values': values,
+            'stochastic': parts,
+            'n_firings': n_fire,
+            'n_ode_steps': n_steps,
+        }
+
+    def simulate(
+        self,
+        duration: float = 200.0,
+        step_number: int = 400,
+        seed: Optional[int] = None,
+        initial: Optional[np.ndarray] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        One realization on the run_time_course grid. Returns a dict with
+        'times', 'values' (n_times, n_species), 'stochastic' (partition mask per
+        grid point) and counters 'n_firings' / 'n_ode_steps'.
+        """
+        out = self.simulate_batch(1, duration, step_number, seed=seed, initial=initial)
+        return {key: (v if key == 'times' else v[0]) for key, v in out.items()}
+
+
+# =============================================================================
+# Ensembles
+# =============================================================================
+def _run_batch(args) -> Tuple[np.ndarray, OnlineStats]:
+    model, options, n, batch_seed, duration, step_number = args
+    out = HybridSimulator(model, **options).simulate_batch(n, duration, step_number, seed=batch_seed)
+    stats = OnlineStats(*out['values'].shape[1:])
+    stats.push_batch(out['values'])
+    return out['times'], stats
+
+
+def run_hybrid_ensemble(
+    model: MassActionModel,
+    n_runs: int,
+    duration: float = 200.0,
+    step_number: int = 400,
+    seed: int = 0,
+    n_workers: Optional[int] = None,
+    batch_size: int = 250,
+    cache=None,
+    **options,
+) -> EnsembleResult:
+    """
+    Hybrid realizations in batches of batch_size, each simulated together by
+    HybridSimulator.simulate_batch; batches run on a process pool. Batch
+    seeds are spawned from np.random.SeedSequence(seed) as in
+    ssa.run_ensemble, so the result does not depend on n_workers. cache as
+    in sbml_backend.simulate().
+    """
+    from .result_cache import code_digest, resolve
+    from .ssa import model_parts
+
+    results = resolve(cache)
+    if results is not None:
+        parts = {'model': model_parts(model), 'code': code_digest(_run_batch, EnsembleResult), 'options': options,
+                 'args': [int(n_runs), float(duration), int(step_number), int(seed), int(batch_size)]}
+        return results.cached('hybrid.run_hybrid_ensemble', parts, lambda: run_hybrid_ensemble(
+            model, n_runs, duration, step_number, seed, n_workers, batch_size, cache=False, **options))
+    sizes = [min(int(batch_size), int(n_runs) - k) for k in range(0, int(n_runs), int(batch_size))]
+    batch_seeds = [int(child.generate_state(1, np.uint32)[0])
+                   for child in np.random.SeedSequence(seed).spawn(len(sizes))]
+    jobs = [(model, options, b, s, duration, step_number) for b, s in zip(sizes, batch_seeds)]
+    n_workers = max(1, min(len(jobs), n_workers or os.cpu_count() or 1))
+    if n_workers == 1:
+        parts = [_run_batch(j) for j in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            parts = list(pool.map(_run_batch, jobs))
+    times, total = parts[0]
+    for _, st in parts[1:]:
+        total.merge(st)
+    seeds = np.repeat(np.asarray(batch_seeds, dtype=np.int64), sizes)
+    return EnsembleResult(times, model.species, total, seeds=seeds)
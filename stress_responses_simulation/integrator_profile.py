@@ -0,0 +1,363 @@
+"""
+Integrator profiling and recommended settings per model.
+
+This module:
+- Measures stiffness along a trajectory as the spread of the full
+  Jacobian's eigenvalues (slowest / fastest timescale).
+- Times candidate RoadRunner integrators against a tight-tolerance CVODE
+  BDF reference: CVODE BDF and Adams at several tolerances, and RK45 /
+  Euler when the model is not too stiff for explicit methods. Each trial
+  records wall time, internal step count and error on the output grid.
+- Recommends the fastest candidate whose error stays within
+  atol + rtol * |reference|, plus equivalent basico run_time_course options.
+- Records the recommendation, when asked to, in a settings directory
+  (root, or $STRESS_RESPONSES_INTEGRATOR_SETTINGS; nothing is written by
+  default) under a digest of the model's SBML and of its file.
+- Applies recorded settings to RoadRunner runs (sbml_backend.simulate() /
+  parameter_scan(), the batch 'tellurium' engine) and fills in r_tol /
+  a_tol for deterministic basico runs of a profiled model file (the batch
+  'basico' engine, result_cache.basico_time_course). Stochastic runs,
+  including ensemble.run_basico_ensemble, are never changed.
+"""
+
+from __future__ import annotations
+import hashlib
+import json
+import os
+import tempfile
+import time
+from typing import Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+# settings directory used when no root is given; unset, nothing is recorded or looked up
+DEFAULT_ROOT: Optional[str] = os.environ.get('STRESS_RESPONSES_INTEGRATOR_SETTINGS') or None
+
+# (relative, absolute) tolerance pairs tried for the adaptive integrators
+DEFAULT_TOLERANCES: Tuple[Tuple[float, float], ...] = ((1e-4, 1e-7), (1e-6, 1e-9), (1e-8, 1e-12))
+REFERENCE = ('cvode', {'stiff': True, 'relative_tolerance': 1e-10, 'absolute_tolerance': 1e-14,
+                       'maximum_num_steps': 1_000_000})
+
+
+def model_digest(rr) -> str:
+    """sha256 of the SBML the RoadRunner was loaded from (parameter changes don't alter it)."""
+    return hashlib.sha256(rr.getSBML().encode('utf-8')).hexdigest()
+
+
+def _load(model):
+    if isinstance(model, str):
+        if os.path.exists(model):
+            from .sbml_backend import load_roadrunner
+            return load_roadrunner(model)
+        from .qssa import _load as load_text
+        return load_text(model)
+    return model
+
+
+def configure(rr, name: str, settings: Optional[Mapping] = None) -> None:
+    """Select integrator name on rr with its default settings overridden by settings."""
+    rr.setIntegrator(name)
+    integrator = rr.getIntegrator()
+    integrator.resetSettings()
+    for key, value in (settings or {}).items():
+        integrator.setValue(key, value)
+
+
+# =============================================================================
+# Stiffness
+# =============================================================================
+def stiffness(rr, sample_times: Sequence[float] = (0.0, 50.0, 300.0, 1000.0)) -> Dict[str, List[float]]:
+    """Per sample time: fastest and slowest Jacobian timescale and their ratio."""
+    from .qssa import jacobian_timescales
+
+    out: Dict[str, List[float]] = {'times': [], 'fastest': [], 'slowest': [], 'ratio': []}
+    for t, taus in jacobian_timescales(rr, sample_times).items():
+        if not taus.size:
+            continue
+        out['times'].append(t)
+        out['fastest'].append(float(taus[0]))
+        out['slowest'].append(float(taus[-1]))
+        out['ratio'].append(float(taus[-1] / taus[0]))
+    return out
+
+
+# =============================================================================
+# Trials
+# =============================================================================
+def candidates(
+    stiffness_ratio: float,
+    tolerances: Sequence[Tuple[float, float]] = DEFAULT_TOLERANCES,
+    explicit_limit: float = 1e3,
+    euler_substeps: Sequence[int] = (1, 10, 100),
+) -> Iterator[Tuple[str, str, Dict]]:
+    """(label, integrator, settings); explicit methods only below explicit_limit."""
+    for rtol, atol in tolerances:
+        for stiff, label in ((True, 'bdf'), (False, 'adams')):
+            yield (f'cvode-{label} rtol={rtol:g}', 'cvode',
+                   {'stiff': stiff, 'relative_tolerance': rtol, 'absolute_tolerance': atol})
+    if stiffness_ratio > explicit_limit:
+        return
+    for rtol, _atol in tolerances:
+        yield f'rk45 eps={rtol:g}', 'rk45', {'epsilon': rtol}
+    for n in euler_substeps:
+        yield f'euler x{n}', 'euler', {'subdivision_steps': int(n)}
+
+
+def _simulate(rr, duration: float, points: int, selections: Sequence[str]) -> np.ndarray:
+    rr.reset()
+    rr.timeCourseSelections = ['time'] + list(selections)
+    return np.asarray(rr.simulate(0.0, duration, points))
+
+
+def _count_steps(rr, name: str, duration: float, points: int) -> int:
+    """Internal steps: one output row per step in variable-step mode."""
+    if name == 'euler':
+        return (points - 1) * int(rr.getIntegrator().getValue('subdivision_steps'))
+    integrator = rr.getIntegrator()
+    rows = integrator.getValue('max_output_rows')
+    integrator.setValue('variable_step_size', True)
+    integrator.setValue('max_output_rows', 10_000_000)
+    try:
+        rr.reset()
+        return np.asarray(rr.simulate(0.0, duration)).shape[0] - 1
+    finally:
+        integrator.setValue('variable_step_size', False)
+        integrator.setValue('max_output_rows', rows)
+
+
+def run_trial(
+    rr,
+    name: str,
+    settings: Mapping,
+    duration: float,
+    points: int,
+    selections: Sequence[str],
+    reference: np.ndarray,
+    rtol: float = 1e-4,
+    atol: float = 1e-6,
+    repeats: int = 3,
+) -> Dict:
+    """
+    Best-of-repeats wall time, step count and error of one integrator setting.
+    error is max |x - ref| / (atol + rtol |ref|); ok means it ran and error <= 1.
+    """
+    trial = {'integrator': name, 'settings': dict(settings)}
+    try:
+        configure(rr, name, settings)
+        if rr.getIntegrator().hasValue('variable_step_size'):
+            rr.getIntegrator().setValue('variable_step_size', False)
+        walls = []
+        for _ in range(max(1, int(repeats))):
+            t0 = time.perf_counter()
+            res = _simulate(rr, duration, points, selections)
+            walls.append(time.perf_counter() - t0)
+        steps = _count_steps(rr, name, duration, points)
+    except RuntimeError as exc:
+        trial.update(ok=False, error=float('inf'), wall=float('inf'), steps=None, message=str(exc))
+        return trial
+    vals = res[:, 1:]
+    if not np.all(np.isfinite(vals)):
+        err = float('inf')
+    else:
+        err = float((np.abs(vals - reference) / (atol + rtol * np.abs(reference))).max())
+    trial.update(ok=err <= 1.0, error=err, wall=min(walls), steps=steps)
+    return trial
+
+
+class IntegratorProfile:
+    """Outcome of profile_model(): stiffness, every trial and the recommendation."""
+
+    def __init__(self, digest: str, stiffness: Mapping, trials: Sequence[Mapping],
+                 recommended: Mapping, target: Mapping) -> None:
+        self.digest = digest
+        self.stiffness = dict(stiffness)
+        self.trials = [dict(t) for t in trials]
+        self.recommended = dict(recommended)
+        self.target = dict(target)
+
+    @property
+    def basico_options(self) -> Dict:
+        """run_time_course keywords matching the recommended tolerances (LSODA)."""
+        settings = self.recommended['settings']
+        rtol = settings.get('relative_tolerance', settings.get('epsilon', self.target['rtol']))
+        atol = settings.get('absolute_tolerance', self.target['atol'])
+        return {'method': 'deterministic', 'r_tol': float(rtol), 'a_tol': float(atol)}
+
+    def to_dict(self) -> Dict:
+        return {
+            'digest': self.digest,
+            'stiffness': self.stiffness,
+            'trials': self.trials,
+            'recommended': self.recommended,
+            'target': self.target,
+            'basico': self.basico_options,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping) -> 'IntegratorProfile':
+        return cls(data['digest'], data['stiffness'], data['trials'], data['recommended'], data['target'])
+
+    def table(self) -> str:
+        """Plain-text table of the trials, recommended row marked with '*'."""
+        lines = [f"{'':2}{'candidate':<26}{'wall [ms]':>11}{'steps':>9}{'error':>11}"]
+        for t in self.trials:
+            mark = '*' if t['label'] == self.recommended.get('label') else ' '
+            steps = '-' if t['steps'] is None else str(t['steps'])
+            status = f"{t['error']:.3g}" if t['ok'] or np.isfinite(t['error']) else 'failed'
+            lines.append(f"{mark} {t['label']:<26}{1e3 * t['wall']:>11.2f}{steps:>9}{status:>11}")
+        return '\n'.join(lines)
+
+
+def profile_model(
+    model,
+    duration: float = 1000.0,
+    points: int = 201,
+    selections: Optional[Sequence[str]] = None,
+    rtol: float = 1e-4,
+    atol: float = 1e-6,
+    sample_times: Sequence[float] = (0.0, 50.0, 300.0, 1000.0),
+    tolerances: Sequence[Tuple[float, float]] = DEFAULT_TOLERANCES,
+    explicit_limit: float = 1e3,
+    repeats: int = 3,
+    record: bool = False,
+    root: Optional[str] = None,
+) -> IntegratorProfile:
+    """
+    Profile model (RoadRunner, SBML/CopasiML path, SBML or Antimony text).
+
+    Every candidate runs on the same output grid; the fastest one within
+    atol + rtol * |reference| is recommended (the reference settings if none
+    qualify). With record=True the profile is saved for the model's digest
+    in root (default DEFAULT_ROOT; one of them must be set).
+    The integrator of a passed-in RoadRunner is restored to its defaults
+    with the recommendation applied.
+    """
+    if record and not (root or DEFAULT_ROOT):
+        raise ValueError("record=True needs root or STRESS_RESPONSES_INTEGRATOR_SETTINGS")
+    rr = _load(model)
+    digest = model_digest(rr)
+    ids = list(selections) if selections else list(rr.model.getFloatingSpeciesIds())
+
+    stiff = stiffness(rr, sample_times)
+    ratio = max(stiff['ratio']) if stiff['ratio'] else 1.0
+
+    configure(rr, *REFERENCE)
+    reference = _simulate(rr, duration, points, ids)[:, 1:]
+
+    trials = []
+    for label, name, settings in candidates(ratio, tolerances, explicit_limit):
+        trial = run_trial(rr, name, settings, duration, points, ids, reference, rtol, atol, repeats)
+        trial['label'] = label
+        trials.append(trial)
+
+    passing = [t for t in trials if t['ok']]
+    if passing:
+        best = min(passing, key=lambda t: t['wall'])
+        recommended = {'label': best['label'], 'integrator': best['integrator'], 'settings': best['settings']}
+    else:
+        recommended = {'label': 'reference', 'integrator': REFERENCE[0], 'settings': dict(REFERENCE[1])}
+
+    profile = IntegratorProfile(digest, stiff, trials, recommended,
+                                {'rtol': rtol, 'atol': atol, 'duration': duration, 'points': points})
+    apply(rr, profile.recommended)
+    if record:
+        save(profile, root)
+        if isinstance(model, str) and os.path.exists(model):
+            save(profile, root, key=file_digest(model))
+    return profile
+
+
+# =============================================================================
+# Recorded settings
+# =============================================================================
+def file_digest(path: str) -> str:
+    with open(path, 'rb') as fh:
+        return hashlib.sha256(fh.read()).hexdigest()
+
+
+def _path(key: str, root: Optional[str]) -> Optional[str]:
+    root = root or DEFAULT_ROOT
+    return os.path.join(os.path.abspath(root), f'{key[:16]}.json') if root else None
+
+
+def save(profile: IntegratorProfile, root: Optional[str] = None, key: Optional[str] = None) -> str:
+    """Write the profile (atomically) under key, default its SBML digest."""
+    path = _path(key or profile.digest, root)
+    if path is None:
+        raise ValueError("no settings directory: pass root or set STRESS_RESPONSES_INTEGRATOR_SETTINGS")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(suffix='.json', dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, 'w') as fh:
+            json.dump(profile.to_dict(), fh, indent=1)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return path
+
+
+def recorded(model, root: Optional[str] = None) -> Optional[IntegratorProfile]:
+    """Saved profile for a RoadRunner (by SBML digest) or a model file (by file digest)."""
+    if not (root or DEFAULT_ROOT):
+        return None
+    key = file_digest(model) if isinstance(model, str) else model_digest(model)
+    path = _path(key, root)
+    if not os.path.exists(path):
+        return None
+    with open(path) as fh:
+        return IntegratorProfile.from_dict(json.load(fh))
+
+
+def apply(rr, recommendation: Mapping) -> None:
+    """Put rr on the recommended integrator and settings (fixed-grid output)."""
+    configure(rr, recommendation['integrator'], recommendation['settings'])
+    integrator = rr.getIntegrator()
+    if integrator.hasValue('variable_step_size'):
+        integrator.setValue('variable_step_size', False)
+
+
+def apply_recorded(rr, root: Optional[str] = None) -> Optional[Dict]:
+    """
+    Apply the recorded recommendation for rr's model, if there is one.
+    Stochastic integrators (gillespie) are left alone. Returns what was applied.
+    """
+    if rr.getIntegrator().getName() == 'gillespie':
+        return None
+    profile = recorded(rr, root)
+    if profile is None:
+        return None
+    apply(rr, profile.recommended)
+    return profile.recommended
+
+
+def basico_options(path: str, root: Optional[str] = None) -> Dict:
+    """Recorded run_time_course keywords for a model file ({} if never profiled)."""
+    profile = recorded(path, root)
+    return profile.basico_options if profile is not None else {}
+
+
+def with_basico_options(path: Optional[str], options: Mapping, root: Optional[str] = None) -> Dict:
+    """
+    run_time_course keywords options with the recorded r_tol / a_tol of the
+    model file path added, for deterministic runs that do not set them.
+    """
+    out = dict(options)
+    if str(out.get('method', 'deterministic')).lower() not in ('deterministic', 'lsoda', 'radau5'):
+        return out
+    if path and os.path.exists(path):
+        for key, value in basico_options(path, root).items():
+            if key != 'method':
+                out.setdefault(key, value)
+    return out
+
+
+if __name__ == '__main__':
+    import sys
+    from .stress_responses.model import antimony_str
+
+    prof = profile_model(sys.argv[1] if len(sys.argv) > 1 else antimony_str, duration=5000.0, points=1001)
+    print(f"max stiffness ratio {max(prof.stiffness['ratio']):.3g}")
+    print(prof.table())
+    print('recommended:', prof.recommended)
+    print('basico:', prof.basico_options)
@@ -0,0 +1,124 @@
+"""
+Build-once registry of COPASI model artifacts.
+
+This module:
+- Hashes each model definition (copasi_models.py style) into a digest.
+- Builds the definition into '<key>-<digest>.cps' once, under a cache
+  directory, and loads that artifact on later runs; a changed definition gets
+  a new digest and is rebuilt.
+- Writes artifacts atomically (temp file + os.replace), so concurrent worker
+  processes can ask for the same model without clobbering each other.
+- Caches loaded basico models per process, keyed by digest.
+"""
+
+from __future__ import annotations
+import hashlib
+import json
+import os
+import tempfile
+from typing import Dict, Mapping, Optional
+
+from .copasi_models import DEFINITIONS, to_mass_action
+
+# Bump when the builder changes in a way that alters the written .cps.
+BUILDER_VERSION = 1
+
+DEFAULT_ROOT = os.environ.get(
+    'STRESS_RESPONSES_MODEL_CACHE',
+    os.path.join(os.path.expanduser('~'), '.cache', 'stress_responses', 'models'),
+)
+
+# Per-process cache of loaded basico models.
+_LOADED: Dict[str, object] = {}
+
+
+def definition_digest(definition: Mapping) -> str:
+    """Stable sha256 of a definition (canonical JSON) and the builder version."""
+    payload = json.dumps({'builder': BUILDER_VERSION, 'definition': definition},
+                         sort_keys=True, separators=(',', ':'), default=list)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def build_cps(definition: Mapping, path: str) -> str:
+    """Construct the model with basico and save it as .cps at path."""
+    return to_mass_action(definition).to_basico(path)
+
+
+class ModelRegistry:
+    """Named model definitions backed by content-addressed .cps artifacts."""
+
+    def __init__(self, root: Optional[str] = None,
+                 definitions: Optional[Mapping[str, Mapping]] = None) -> None:
+        self.root = os.path.abspath(root or DEFAULT_ROOT)
+        self.definitions: Dict[str, Mapping] = dict(DEFINITIONS if definitions is None else definitions)
+
+    def register(self, key: str, definition: Mapping) -> str:
+        """Add or replace a definition; returns its digest."""
+        self.definitions[key] = definition
+        return self.digest(key)
+
+    def digest(self, key: str) -> str:
+        return definition_digest(self.definitions[key])
+
+    def artifact_path(self, key: str) -> str:
+        return os.path.join(self.root, f'{key}-{self.digest(key)[:16]}.cps')
+
+    def is_built(self, key: str) -> bool:
+        return os.path.exists(self.artifact_path(key))
+
+    def artifact(self, key: str, force: bool = False) -> str:
+        """Path to the .cps for key, building it first if missing (or force)."""
+        path = self.artifact_path(key)
+        if force or not os.path.exists(path):
+            os.makedirs(self.root, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(suffix='.cps', dir=self.root)
+            os.close(fd)
+            try:
+                build_cps(self.definitions[key], tmp)
+                os.replace(tmp, path)
+            finally:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+        return path
+
+    def load(self, key: str):
+        """basico model for key, loaded once per process."""
+        digest = self.digest(key)
+        model = _LOADED.get(digest)
+        if model is None:
+            import basico
+            model = basico.load_model(self.artifact(key))
+            _LOADED[digest] = model
+        return model
+
+    def prune(self) -> int:
+        """Delete artifacts whose digest no longer matches a definition."""
+        if not os.path.isdir(self.root):
+            return 0
+        keep = {os.path.basename(self.artifact_path(k)) for k in self.definitions}
+        removed = 0
+        for fname in os.listdir(self.root):
+            if fname.endswith('.cps') and fname not in keep:
+                os.remove(os.path.join(self.root, fname))
+                removed += 1
+        return removed
+
+
+_DEFAULT: Optional[ModelRegistry] = None
+
+
+def default_registry() -> ModelRegistry:
+    global _DEFAULT
+    if _DEFAULT is None:
+        _DEFAULT = ModelRegistry()
+    return _DEFAULT
+
+
+def artifact(key: str) -> str:
+    """Path to the built .cps for a named definition in the default registry."""
+    return default_registry().artifact(key)
+
+
+def load(key: str):
+    """basico model for a named definition in the default registry."""
+    return default_registry().load(key)
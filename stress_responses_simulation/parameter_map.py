@@ -0,0 +1,334 @@
+"""
+Adaptive mapping of model outputs over a 2-D parameter plane.
+
+This module:
+- Starts from a coarse grid of cells on a rectangle (linear or log axes),
+  evaluates each cell's center and edge midpoints and splits the cell into
+  four when bilinear interpolation from its corners misses any of them by
+  more than value_tol of the output's range over the plane, or when they
+  disagree on the character of the steady state.
+- Places every point on an integer lattice of the finest level, so corners
+  shared by neighbouring cells are evaluated once; each refinement level is
+  evaluated as one parallel batch.
+- SteadyStateEvaluator runs an SBML/Antimony model to a fixed end time (as
+  the practice4 scans do) or until it settles, and labels the end state:
+  'node', 'focus' or 'unstable' from the Jacobian's dominant eigenvalue, or
+  'oscillating' / 'transient' when the outputs have not settled.
+- ParameterMap holds the scattered points, their outputs and the leaf
+  cells, with a Delaunay triangulation for interpolation and resampling
+  onto a regular grid.
+"""
+
+from __future__ import annotations
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+Evaluator = Callable[[float, float], Mapping]
+
+
+# =============================================================================
+# Evaluator
+# =============================================================================
+# RoadRunner instances per process, keyed by model digest.
+_RUNNERS: Dict[str, object] = {}
+
+
+class SteadyStateEvaluator:
+    """
+    Picklable (x, y) -> {output: value, 'character': label} for a model.
+
+    Sets parameters x_param / y_param (on top of fixed), simulates 0..duration
+    and reports the final value of each output. With until_steady the run
+    stops once steady_state.simulate_to_steady_state's criterion holds
+    (duration becomes the cap). Each worker process loads the model once and
+    applies its recorded integrator profile.
+    """
+
+    def __init__(self, model: str, x_param: str, y_param: str, outputs: Sequence[str] = ('RpoS',),
+                 duration: float = 1200.0, points: int = 241, settle_window: float = 0.1,
+                 settle_rtol: float = 1e-3, fixed: Optional[Mapping[str, float]] = None,
+                 until_steady: bool = False) -> None:
+        self.model = model
+        self.x_param = x_param
+        self.y_param = y_param
+        self.outputs = list(outputs)
+        self.duration = float(duration)
+        self.points = int(points)
+        self.settle_window = float(settle_window)
+        self.settle_rtol = float(settle_rtol)
+        self.fixed = dict(fixed or {})
+        self.until_steady = bool(until_steady)
+        self._key = hashlib.sha256(model.encode('utf-8')).hexdigest()
+
+    def _runner(self):
+        rr = _RUNNERS.get(self._key)
+        if rr is None:
+            from .integrator_profile import _load, apply_recorded
+            rr = _load(self.model)
+            apply_recorded(rr)
+            _RUNNERS[self._key] = rr
+        return rr
+
+    def character(self, rr, traj: np.ndarray, settled: Optional[bool] = None) -> str:
+        """Label of the end state (see module docstring); settled skips the tail test."""
+        if not np.all(np.isfinite(traj)):
+            return 'failed'
+        n = max(3, int(round(self.settle_window * traj.shape[0])))
+        tail = traj[-n:]
+        scale = np.maximum(np.abs(tail[-1]), 1e-12)
+        if settled is None:
+            settled = bool(np.all(np.abs(tail[-1] - tail[0]) / scale <= self.settle_rtol))
+        if settled:
+            J = np.asarray(rr.getFullJacobian())
+            if not np.all(np.isfinite(J)):
+                return 'node'
+            ev = np.linalg.eigvals(J)
+            dom = ev[np.argmax(ev.real)]
+            if dom.real > 1e-9:
+                return 'unstable'
+            return 'focus' if abs(dom.imag) > 1e-9 else 'node'
+        d = np.diff(tail, axis=0)
+        flips = np.sum(np.signbit(d[1:]) != np.signbit(d[:-1]), axis=0)
+        return 'oscillating' if np.any(flips >= 2) else 'transient'
+
+    def __call__(self, x: float, y: float) -> Dict:
+        rr = self._runner()
+        rr.resetAll()
+        for k, v in self.fixed.items():
+            rr[k] = float(v)
+        rr[self.x_param] = float(x)
+        rr[self.y_param] = float(y)
+        try:
+            if self.until_steady:
+                from .steady_state import simulate_to_steady_state
+                run = simulate_to_steady_state(rr, self.outputs, t_max=self.duration,
+                                               dt=self.duration / (self.points - 1))
+                traj, settled = run.values, (True if run.reached else None)
+            else:
+                rr.timeCourseSelections = ['time'] + self.outputs
+                traj, settled = np.asarray(rr.simulate(0.0, self.duration, self.points))[:, 1:], None
+        except RuntimeError:
+            return {**{o: float('nan') for o in self.outputs}, 'character': 'failed'}
+        out: Dict = {o: float(traj[-1, j]) for j, o in enumerate(self.outputs)}
+        out['character'] = self.character(rr, traj, settled)
+        return out
+
+
+def _evaluate_one(evaluate: Evaluator, x: float, y: float) -> Mapping:
+    return evaluate(x, y)
+
+
+# =============================================================================
+# Map
+# =============================================================================
+class ParameterMap:
+    """
+    Points (n, 2) in parameter units with outputs {name: (n,)} and, if the
+    evaluator reports one, character (n,) labels. cells are the leaf
+    rectangles (x0, y0, x1, y1) of the refinement.
+    """
+
+    def __init__(self, x_name: str, y_name: str, points: np.ndarray, values: Mapping[str, np.ndarray],
+                 character: Optional[np.ndarray], cells: np.ndarray, log: Tuple[bool, bool],
+                 uniform_equivalent: int, history: Sequence[Mapping]) -> None:
+        self.x_name = x_name
+        self.y_name = y_name
+        self.points = np.asarray(points, dtype=float)
+        self.values = {k: np.asarray(v, dtype=float) for k, v in values.items()}
+        self.character = character
+        self.cells = np.asarray(cells, dtype=float)
+        self.log = tuple(log)
+        self.uniform_equivalent = int(uniform_equivalent)
+        self.history = list(history)
+        self._tri = None
+
+    @property
+    def n_evaluations(self) -> int:
+        return self.points.shape[0]
+
+    def _scaled(self, pts: np.ndarray) -> np.ndarray:
+        pts = np.array(pts, dtype=float)
+        for k in (0, 1):
+            if self.log[k]:
+                pts[..., k] = np.log10(pts[..., k])
+        return pts
+
+    def triangulation(self):
+        """Delaunay triangulation of the points (in log units on log axes)."""
+        if self._tri is None:
+            from scipy.spatial import Delaunay
+            self._tri = Delaunay(self._scaled(self.points))
+        return self._tri
+
+    def interpolator(self, name: str) -> Callable[[np.ndarray, np.ndarray], np.ndarray]:
+        """Piecewise-linear f(x, y) over the triangulation for output name."""
+        from scipy.interpolate import LinearNDInterpolator
+
+        interp = LinearNDInterpolator(self.triangulation(), self.values[name])
+
+        def f(x, y):
+            x, y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+            return interp(self._scaled(np.stack([x, y], axis=-1)))
+        return f
+
+    def on_grid(self, name: str, nx: int = 101, ny: int = 101) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(xs, ys, Z) with Z[j, i] = output at (xs[i], ys[j]) on a regular grid."""
+        lo, hi = self.points.min(axis=0), self.points.max(axis=0)
+        xs = np.geomspace(lo[0], hi[0], nx) if self.log[0] else np.linspace(lo[0], hi[0], nx)
+        ys = np.geomspace(lo[1], hi[1], ny) if self.log[1] else np.linspace(lo[1], hi[1], ny)
+        X, Y = np.meshgrid(xs, ys)
+        return xs, ys, self.interpolator(name)(X, Y)
+
+    def save(self, path: str) -> None:
+        arrays = {f'value_{k}': v for k, v in self.values.items()}
+        if self.character is not None:
+            arrays['character'] = self.character.astype(str)
+        np.savez_compressed(path, points=self.points, cells=self.cells, names=np.array([self.x_name, self.y_name]),
+                            log=np.array(self.log), uniform_equivalent=self.uniform_equivalent, **arrays)
+
+
+def map_plane(
+    evaluate: Evaluator,
+    x_range: Tuple[float, float],
+    y_range: Tuple[float, float],
+    x_name: str = 'x',
+    y_name: str = 'y',
+    initial: Tuple[int, int] = (5, 5),
+    max_level: int = 4,
+    value_tol: float = 0.05,
+    outputs: Optional[Sequence[str]] = None,
+    log: Tuple[bool, bool] = (False, False),
+    n_workers: Optional[int] = 1,
+) -> ParameterMap:
+    """
+    Adaptively map evaluate(x, y) over x_range x y_range.
+
+    initial is the number of coarse grid points per axis; each of max_level
+    refinements halves the spacing of the cells that are split. Cells that
+    are not split keep their evaluated center as an extra mesh point. outputs
+    limits which numeric outputs drive refinement (default all). n_workers > 1
+    evaluates each level in a process pool (evaluate must be picklable,
+    e.g. a SteadyStateEvaluator). uniform_equivalent is the size of the
+    uniform grid at the finest spacing.
+    """
+    nx0, ny0 = int(initial[0]), int(initial[1])
+    if nx0 < 2 or ny0 < 2:
+        raise ValueError("initial needs at least 2 points per axis")
+    scale = 2 ** int(max_level)
+    NX, NY = (nx0 - 1) * scale, (ny0 - 1) * scale  # finest lattice intervals per axis
+
+    def axis(lo, hi, n, is_log):
+        u = np.arange(n + 1) / n
+        if is_log:
+            return 10 ** (np.log10(lo) + u * (np.log10(hi) - np.log10(lo)))
+        return lo + u * (hi - lo)
+    xs = axis(float(x_range[0]), float(x_range[1]), NX, log[0])
+    ys = axis(float(y_range[0]), float(y_range[1]), NY, log[1])
+
+    results: Dict[Tuple[int, int], Mapping] = {}
+    history: List[Dict] = []
+
+    pool = ProcessPoolExecutor(max_workers=n_workers) if (n_workers or os.cpu_count() or 1) > 1 else None
+    try:
+        def run(keys: List[Tuple[int, int]]) -> None:
+            keys = [k for k in dict.fromkeys(keys) if k not in results]
+            if not keys:
+                return
+            if pool is None:
+                outs = [evaluate(xs[i], ys[j]) for i, j in keys]
+            else:
+                outs = list(pool.map(_evaluate_one, [evaluate] * len(keys),
+                                     [xs[i] for i, _ in keys], [ys[j] for _, j in keys]))
+            results.update(zip(keys, outs))
+
+        cells = [(i * scale, j * scale, scale) for i in range(nx0 - 1) for j in range(ny0 - 1)]
+        run([(c[0] + a, c[1] + b) for c in cells for a in (0, c[2]) for b in (0, c[2])])
+
+        leaves = []
+        for level in range(int(max_level)):
+            # centers and edge midpoints: the points a split would need anyway
+            run([(i + a, j + b) for i, j, s in cells for a, b in _probes(s)])
+            names = outputs or [k for k, v in next(iter(results.values())).items()
+                                if not isinstance(v, str)]
+            span = {}
+            for k in names:
+                vals = np.array([r[k] for r in results.values()], dtype=float)
+                vals = vals[np.isfinite(vals)]
+                span[k] = float(vals.max() - vals.min()) if vals.size else 0.0
+
+            split = []
+            for c in cells:
+                i, j, s = c
+                corners = [results[(i + a, j + b)] for a in (0, s) for b in (0, s)]
+                probes = [results[(i + a, j + b)] for a, b in _probes(s)]
+                (split if _needs_split(corners, probes, names, span, value_tol) else leaves).append(c)
+            history.append({'level': level, 'split': len(split), 'evaluations': len(results)})
+            children = []
+            for i, j, s in split:
+                h = s // 2
+                children += [(i, j, h), (i + h, j, h), (i, j + h, h), (i + h, j + h, h)]
+            run([(i + a, j + b) for i, j, s in children for a in (0, s) for b in (0, s)])
+            cells = children
+            if not cells:
+                break
+        cells = leaves + cells
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    keys = list(results)
+    points = np.array([(xs[i], ys[j]) for i, j in keys])
+    first = results[keys[0]]
+    values = {k: np.array([results[key][k] for key in keys], dtype=float)
+              for k, v in first.items() if not isinstance(v, str)}
+    character = np.array([results[key]['character'] for key in keys]) if 'character' in first else None
+    leaf_boxes = np.array([(xs[i], ys[j], xs[i + s], ys[j + s]) for i, j, s in cells])
+    return ParameterMap(x_name, y_name, points, values, character, leaf_boxes, log,
+                        (NX + 1) * (NY + 1), history)
+
+
+def _probes(s: int) -> List[Tuple[int, int]]:
+    """Lattice offsets of a cell's center and edge midpoints (bottom, top, left, right)."""
+    h = s // 2
+    return [(h, h), (h, 0), (h, s), (0, h), (s, h)]
+
+
+# corner weights (corners ordered (0,0), (0,s), (s,0), (s,s)) of the bilinear
+# interpolant at each probe of _probes
+_PROBE_WEIGHTS = np.array([[0.25, 0.25, 0.25, 0.25],
+                           [0.5, 0.0, 0.5, 0.0],
+                           [0.0, 0.5, 0.0, 0.5],
+                           [0.5, 0.5, 0.0, 0.0],
+                           [0.0, 0.0, 0.5, 0.5]])
+
+
+def _needs_split(corners: Sequence[Mapping], probes: Sequence[Mapping], names: Sequence[str],
+                 span: Mapping[str, float], value_tol: float) -> bool:
+    """
+    Split when the character changes or bilinear interpolation from the
+    corners misses the center or an edge midpoint (probes, as in _probes)
+    by more than value_tol of the span. The center alone is blind to a
+    switch running through it: the corners then average to the center.
+    """
+    if len({c.get('character') for c in [*corners, *probes]}) > 1:
+        return True
+    for k in names:
+        vals = np.array([c[k] for c in corners], dtype=float)
+        mids = np.array([p[k] for p in probes], dtype=float)
+        if not (np.all(np.isfinite(vals)) and np.all(np.isfinite(mids))):
+            return True
+        if span[k] > 0 and np.abs(mids - _PROBE_WEIGHTS @ vals).max() > value_tol * span[k]:
+            return True
+    return False
+
+
+def uniform_map(evaluate: Evaluator, xs: Sequence[float], ys: Sequence[float]) -> Dict[str, np.ndarray]:
+    """Reference map on a full grid: {output: Z} with Z[j, i] = output at (xs[i], ys[j])."""
+    rows = [[evaluate(float(x), float(y)) for x in xs] for y in ys]
+    first = rows[0][0]
+    return {k: np.array([[r[k] for r in row] for row in rows], dtype=float)
+            for k, v in first.items() if not isinstance(v, str)}
@@ -0,0 +1,190 @@
+"""
+Fast ensemble plotting from arrays.
+
+This module:
+- Draws all realizations of one observable as a single LineCollection
+  instead of one pandas .plot() call per run and species.
+- Decimates trajectories to pixel resolution with min/max buckets, which keeps
+  spikes and extremes that plain striding would drop.
+- Renders density shading (per-time histograms, one translucent layer per
+  observable tinted with its color) or quantile bands for very large
+  ensembles.
+- Works headless: figures are built on the Agg canvas and saved to files
+  without importing pyplot.
+- Takes EnsembleResult / (n_runs, n_times) arrays from ensemble.py, ssa.py or
+  hybrid.py directly.
+"""
+
+from __future__ import annotations
+from typing import Dict, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+DEFAULT_COLORS = ('tab:blue', 'tab:red', 'tab:green', 'tab:purple',
+                  'tab:orange', 'tab:brown', 'black', 'tab:cyan')
+
+
+# =============================================================================
+# Decimation
+# =============================================================================
+def downsample_minmax(times: np.ndarray, values: np.ndarray, n_pixels: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Decimate (n_runs, n_times) trajectories to ~4 points per pixel column:
+    first, min, max, last of each bucket. Returns (times, values) with the
+    same leading dimension; inputs shorter than 4 * n_pixels pass through.
+    """
+    t = np.asarray(times, dtype=float)
+    y = np.atleast_2d(np.asarray(values, dtype=float))
+    n_t = t.size
+    if n_pixels <= 0 or n_t <= 4 * n_pixels:
+        return t, y
+    starts = np.linspace(0, n_t, n_pixels + 1).astype(np.int64)[:-1]
+    ends = np.append(starts[1:], n_t) - 1
+    mid = (t[starts] + t[ends]) * 0.5
+    lo = np.minimum.reduceat(y, starts, axis=1)
+    hi = np.maximum.reduceat(y, starts, axis=1)
+    first, last = y[:, starts], y[:, ends]
+    t_out = np.stack([t[starts], mid, mid, t[ends]], axis=1).ravel()
+    # min before max when the bucket trends upward, so the path stays monotone
+    rising = last >= first
+    a = np.where(rising, lo, hi)
+    b = np.where(rising, hi, lo)
+    y_out = np.stack([first, a, b, last], axis=2).reshape(y.shape[0], -1)
+    return t_out, y_out
+
+
+# =============================================================================
+# Artists
+# =============================================================================
+def add_lines(ax, times: np.ndarray, trajs: np.ndarray, color='tab:blue', alpha: float = 0.2,
+              lw: float = 0.8, n_pixels: Optional[int] = None, label: Optional[str] = None):
+    """Add every row of trajs (n_runs, n_times) as one LineCollection."""
+    from matplotlib.collections import LineCollection
+
+    if n_pixels is None:
+        n_pixels = int(ax.figure.get_figwidth() * ax.figure.dpi)
+    t, y = downsample_minmax(times, trajs, n_pixels)
+    segs = np.empty((y.shape[0], t.size, 2))
+    segs[:, :, 0] = t
+    segs[:, :, 1] = y
+    lc = LineCollection(segs, colors=color, alpha=alpha, linewidths=lw, label=label)
+    ax.add_collection(lc)
+    ax.update_datalim(np.array([[t.min(), np.nanmin(y)], [t.max(), np.nanmax(y)]]))
+    ax.autoscale_view()
+    return lc
+
+
+def _tinted_cmap(color, max_alpha: float = 0.8):
+    """Colormap from fully transparent to color at max_alpha, so layers can overlap."""
+    from matplotlib.colors import LinearSegmentedColormap, to_rgba
+
+    r, g, b, _ = to_rgba(color)
+    return LinearSegmentedColormap.from_list(f'tint-{color}', [(r, g, b, 0.0), (r, g, b, max_alpha)])
+
+
+def add_density(ax, times: np.ndarray, trajs: np.ndarray, bins: int = 100, cmap: str = 'Blues',
+                log: bool = True, y_range: Optional[Tuple[float, float]] = None,
+                color=None, max_alpha: float = 0.8):
+    """
+    Shade the per-time distribution of trajs (n_runs, n_times) as a 2-D
+    histogram. With color the shading runs from transparent (empty bins) to
+    color at max_alpha instead of using cmap, so several observables can
+    share one axes.
+    """
+    y = np.asarray(trajs, dtype=float)
+    n_runs, n_t = y.shape
+    lo, hi = y_range if y_range else (float(np.nanmin(y)), float(np.nanmax(y)))
+    if hi <= lo:
+        hi = lo + 1.0
+    yb = np.clip(((y - lo) / (hi - lo) * bins).astype(np.int64), 0, bins - 1)
+    flat = (np.arange(n_t)[None, :] * bins + yb).ravel()
+    dens = np.bincount(flat, minlength=n_t * bins).reshape(n_t, bins).T / n_runs
+    if log:
+        dens = np.log1p(dens * n_runs)
+    t = np.asarray(times, dtype=float)
+    t_edges = np.concatenate([[t[0]], 0.5 * (t[1:] + t[:-1]), [t[-1]]])
+    y_edges = np.linspace(lo, hi, bins + 1)
+    if color is not None:
+        cmap = _tinted_cmap(color, max_alpha)
+    return ax.pcolormesh(t_edges, y_edges, dens, cmap=cmap, shading='flat')
+
+
+def new_figure(figsize=(8, 5), dpi: int = 100):
+    """(fig, ax) on the Agg canvas, independent of pyplot's global state."""
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    fig = Figure(figsize=figsize, dpi=dpi)
+    FigureCanvasAgg(fig)
+    return fig, fig.add_subplot(1, 1, 1)
+
+
+# =============================================================================
+# Ensemble figures
+# =============================================================================
+def plot_ensemble(
+    result,
+    observables: Optional[Sequence[str]] = None,
+    mode: str = 'lines',
+    path: Optional[str] = None,
+    ax=None,
+    colors: Optional[Mapping[str, str]] = None,
+    deterministic: Optional[Tuple[np.ndarray, Mapping[str, np.ndarray]]] = None,
+    show_mean: bool = True,
+    title: Optional[str] = None,
+    xlabel: str = "Time (min)",
+    ylabel: str = "Molecule count",
+):
+    """
+    Plot an EnsembleResult.
+
+    mode 'lines' (needs keep_trajectories=True) draws one LineCollection per
+    observable; 'density' shades per-time histograms of the stored runs, one
+    translucent layer per observable in its color; 'bands' uses the
+    QuantileSketch (quantiles=True) and needs no stored runs.
+    deterministic = (times, {name: values}) overlays solid ODE curves. With
+    path the figure is written to that file and returned.
+    """
+    from .quantiles import plot_bands
+
+    names = list(observables or result.observables)
+    palette: Dict[str, str] = {n: DEFAULT_COLORS[i % len(DEFAULT_COLORS)] for i, n in enumerate(names)}
+    palette.update(colors or {})
+    if ax is None:
+        fig, ax = new_figure()
+    else:
+        fig = ax.figure
+
+    for name in names:
+        j = result.index(name)
+        color = palette[name]
+        if mode == 'lines':
+            if result.trajectories is None:
+                raise ValueError("mode='lines' needs an ensemble run with keep_trajectories=True")
+            add_lines(ax, result.times, result.trajectories[:, :, j], color=color)
+        elif mode == 'density':
+            if result.trajectories is None:
+                raise ValueError("mode='density' needs an ensemble run with keep_trajectories=True")
+            add_density(ax, result.times, result.trajectories[:, :, j], color=color)
+        elif mode == 'bands':
+            if result.sketch is None:
+                raise ValueError("mode='bands' needs an ensemble run with quantiles=True")
+            plot_bands(result.times, result.sketch, j, ax=ax, color=color, label=f'{name} (median)')
+        else:
+            raise ValueError(f"unknown mode {mode!r}")
+        if show_mean:
+            ax.plot(result.times, result.stats.mean[:, j], color=color, ls='--', lw=2, zorder=3,
+                    label=f'{name} (stoch avg)')
+        if deterministic is not None and name in deterministic[1]:
+            ax.plot(deterministic[0], deterministic[1][name], color=color, lw=2,
+                    label=f'{name} (det)')
+
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    if title:
+        ax.set_title(title)
+    ax.legend()
+    if path:
+        fig.tight_layout()
+        fig.savefig(path)
+    return fig
@@ -0,0 +1,150 @@
+"""
+Streaming, mergeable quantile sketches for stochastic ensembles.
+
+This module:
+- Defines QuantileSketch: one log-bucket histogram (DDSketch style) per
+  (time point, observable), with a fixed, known memory footprint.
+- Quantiles carry a relative-error guarantee of rel_accuracy for values in
+  [min_value, max_value]; values below min_value (e.g. zero copies) share one
+  exact bucket, values above max_value are clamped into the last bucket.
+- Sketches from different workers merge by adding counts.
+- plot_bands() draws 5/25/50/75/95% bands straight from a sketch.
+"""
+
+from __future__ import annotations
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+
+DEFAULT_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+
+class QuantileSketch:
+    """
+    Per-time-point quantile sketch over trajectories (n_times, n_observables).
+
+    Bucket 0 holds values < min_value (reported as 0.0); bucket i >= 1 holds
+    values in (min_value * gamma^(i-2), min_value * gamma^(i-1)], with
+    gamma = (1 + a) / (1 - a) for a = rel_accuracy.
+    """
+
+    def __init__(
+        self,
+        n_times: int,
+        n_observables: int,
+        rel_accuracy: float = 0.01,
+        min_value: float = 0.5,
+        max_value: float = 1e7,
+        dtype=np.uint32,
+    ) -> None:
+        if not 0.0 < rel_accuracy < 1.0:
+            raise ValueError("rel_accuracy must be in (0, 1)")
+        self.rel_accuracy = float(rel_accuracy)
+        self.gamma = (1.0 + rel_accuracy) / (1.0 - rel_accuracy)
+        self.min_value = float(min_value)
+        self.max_value = float(max_value)
+        self.n_buckets = 2 + int(np.ceil(np.log(max_value / min_value) / np.log(self.gamma)))
+        self.counts = np.zeros((int(n_times), int(n_observables), self.n_buckets), dtype=dtype)
+        self.count = 0
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.counts.shape[:2]
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the bucket counts (independent of the number of runs)."""
+        return int(self.counts.nbytes)
+
+    def _compatible(self, other: "QuantileSketch") -> bool:
+        return (self.counts.shape == other.counts.shape
+                and self.gamma == other.gamma
+                and self.min_value == other.min_value)
+
+    def bucket_index(self, values: np.ndarray) -> np.ndarray:
+        v = np.asarray(values, dtype=float)
+        idx = np.zeros(v.shape, dtype=np.int64)
+        pos = v >= self.min_value
+        with np.errstate(divide='ignore', invalid='ignore'):
+            k = np.ceil(np.log(v[pos] / self.min_value) / np.log(self.gamma)).astype(np.int64)
+        idx[pos] = np.clip(k + 1, 1, self.n_buckets - 1)
+        return idx
+
+    def bucket_values(self) -> np.ndarray:
+        """Representative value per bucket (within rel_accuracy of every member)."""
+        i = np.arange(self.n_buckets, dtype=float)
+        vals = self.min_value * self.gamma ** (i - 1) * 2.0 / (1.0 + self.gamma)
+        vals[0] = 0.0
+        return vals
+
+    def push(self, traj: np.ndarray) -> None:
+        self.push_batch(np.asarray(traj)[None, ...])
+
+    def push_batch(self, trajs: np.ndarray) -> None:
+        """Add realizations shaped (n_batch, n_times, n_observables)."""
+        x = np.asarray(trajs)
+        n_b, n_t, n_o = x.shape
+        b = self.bucket_index(x)
+        cell = (np.arange(n_t)[:, None] * n_o + np.arange(n_o)[None, :]) * self.n_buckets
+        flat = (cell[None, :, :] + b).ravel()
+        add = np.bincount(flat, minlength=self.counts.size)
+        self.counts += add.reshape(self.counts.shape).astype(self.counts.dtype)
+        self.count += n_b
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """Add another sketch's counts into this one (in place) and return self."""
+        if not self._compatible(other):
+            raise ValueError("cannot merge sketches with different shapes or accuracy")
+        self.counts += other.counts
+        self.count += other.count
+        return self
+
+    def quantiles(self, qs: Sequence[float] = DEFAULT_QUANTILES) -> np.ndarray:
+        """Array (len(qs), n_times, n_observables) of estimated quantiles."""
+        if self.count == 0:
+            raise ValueError("empty sketch")
+        cum = np.cumsum(self.counts, axis=-1, dtype=np.int64)
+        vals = self.bucket_values()
+        out = np.empty((len(qs),) + self.shape)
+        for i, q in enumerate(qs):
+            rank = q * (self.count - 1)
+            idx = (cum <= rank).sum(axis=-1)
+            out[i] = vals[np.minimum(idx, self.n_buckets - 1)]
+        return out
+
+    def histogram(self, time_index: int, observable: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(bucket upper edges, counts) at one time point, trimmed to non-empty range."""
+        c = self.counts[time_index, observable]
+        nz = np.nonzero(c)[0]
+        if nz.size == 0:
+            return np.zeros(0), np.zeros(0, dtype=c.dtype)
+        lo, hi = nz[0], nz[-1] + 1
+        edges = self.min_value * self.gamma ** (np.arange(self.n_buckets, dtype=float) - 1)
+        edges[0] = self.min_value
+        return edges[lo:hi], c[lo:hi]
+
+
+def plot_bands(
+    times: np.ndarray,
+    sketch: QuantileSketch,
+    observable: int,
+    ax=None,
+    color: str = 'tab:blue',
+    label: Optional[str] = None,
+    qs: Sequence[float] = DEFAULT_QUANTILES,
+):
+    """
+    Shade symmetric quantile bands (outer lighter) and draw the median on
+    ax; pyplot's current axes are used (and pyplot imported) only without one.
+    """
+    if ax is None:
+        import matplotlib.pyplot as plt
+        ax = plt.gca()
+    q = sketch.quantiles(qs)[:, :, observable]
+    n = len(qs)
+    for i in range(n // 2):
+        ax.fill_between(times, q[i], q[n - 1 - i], color=color, alpha=0.15 + 0.15 * i, lw=0)
+    if n % 2:
+        ax.plot(times, q[n // 2], color=color, lw=2, label=label)
+    return ax
@@ -0,0 +1,360 @@
+"""
+Content-addressed on-disk cache of simulation results.
+
+This module:
+- Hashes everything that determines a result (model content, parameter
+  overrides, initial state, time grid, solver and tolerances, seed and the
+  versions of the simulation libraries) into a sha256 key.
+- Stores results as pickles under '<root>/<key[:2]>/<key>.pkl', written
+  atomically, and evicts least-recently-used entries once the cache grows
+  beyond max_bytes.
+- Counts hits, misses, stores and evictions per ResultCache.
+- Wraps the common entry points: te_simulate (tellurium/RoadRunner
+  simulate), basico_time_course (run_time_course) and cached_update (one
+  process-bigraph Process.update, e.g. a SigmaCompetition allocation point).
+  Unseeded stochastic runs are never cached.
+- Is opt-in at sbml_backend.simulate / parameter_scan and the ssa, hybrid
+  and basico ensemble runners (cache=True: the default cache, a
+  ResultCache, or None/False: off, the default) and in SigmaCompetition's
+  step_alloc_once scans ('result_cache' config). Hashing and pickling
+  cost more than a short run, so nothing is cached unless asked;
+  STRESS_RESPONSES_RESULT_CACHE_OFF=1 turns the default cache off globally.
+- Keys code-defined results on code_digest(): the source of every module
+  defining the class or function and its bases, so editing a base class or
+  a module-level helper invalidates entries; an explicit version string
+  can be added for code outside those modules.
+"""
+
+from __future__ import annotations
+import functools
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import sys
+import tempfile
+from importlib import metadata
+from typing import Callable, Dict, Mapping, Optional, Sequence
+
+import numpy as np
+
+DEFAULT_ROOT = os.environ.get(
+    'STRESS_RESPONSES_RESULT_CACHE',
+    os.path.join(os.path.expanduser('~'), '.cache', 'stress_responses', 'results'),
+)
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+# any of '1', 'true', 'yes' disables default_cache()
+DISABLE_ENV = 'STRESS_RESPONSES_RESULT_CACHE_OFF'
+
+# Distributions whose versions are part of every key.
+TRACKED_PACKAGES = ('numpy', 'scipy', 'pandas', 'libroadrunner', 'tellurium',
+                    'copasi-basico', 'python-copasi', 'process-bigraph', 'bigraph-schema')
+
+_MISS = object()
+
+
+@functools.lru_cache(maxsize=1)
+def library_versions() -> Dict[str, Optional[str]]:
+    versions = {}
+    for name in TRACKED_PACKAGES:
+        try:
+            versions[name] = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            versions[name] = None
+    return versions
+
+
+def canonical(obj):
+    """JSON-able form of obj with numpy values and arrays made deterministic."""
+    if isinstance(obj, Mapping):
+        return {str(k): canonical(v) for k, v in sorted(obj.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(obj, (list, tuple)):
+        return [canonical(v) for v in obj]
+    if isinstance(obj, np.ndarray):
+        return {'__ndarray__': hashlib.sha256(np.ascontiguousarray(obj).tobytes()).hexdigest(),
+                'dtype': obj.dtype.str, 'shape': list(obj.shape)}
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, float):
+        return repr(obj)  # keeps every bit, unlike json's float formatting
+    return obj
+
+
+def result_key(namespace: str, parts: Mapping) -> str:
+    """sha256 over namespace, parts and library_versions()."""
+    payload = json.dumps({'ns': namespace, 'parts': canonical(parts), 'lib': library_versions()},
+                         sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ResultCache:
+    """Pickle store keyed by result_key(), bounded to max_bytes with LRU eviction."""
+
+    def __init__(self, root: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES,
+                 enabled: bool = True) -> None:
+        self.root = os.path.abspath(root or DEFAULT_ROOT)
+        self.max_bytes = int(max_bytes)
+        self.enabled = bool(enabled)
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self._size: Optional[int] = None
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], f'{key}.pkl')
+
+    def get(self, key: str, default=None):
+        """Cached value for key (refreshing its recency) or default."""
+        value = self._get(key)
+        return default if value is _MISS else value
+
+    def _get(self, key: str):
+        path = self.path(key)
+        try:
+            with open(path, 'rb') as fh:
+                value = pickle.load(fh)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return _MISS
+        try:
+            os.utime(path)  # mtime doubles as last-used time for eviction
+        except OSError:
+            pass
+        return value
+
+    def put(self, key: str, value) -> None:
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as fh:
+                pickle.dump(value, fh, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        self.stores += 1
+        if self._size is not None:
+            self._size += os.path.getsize(path)
+        self._evict()
+
+    def cached(self, namespace: str, parts: Mapping, compute: Callable[[], object]):
+        """Return the cached result for (namespace, parts), computing it on a miss."""
+        if not self.enabled:
+            return compute()
+        key = result_key(namespace, parts)
+        value = self._get(key)
+        if value is not _MISS:
+            self.hits += 1
+            return value
+        self.misses += 1
+        value = compute()
+        self.put(key, value)
+        return value
+
+    # ------------------------ Housekeeping ------------------------
+    def _entries(self):
+        if not os.path.isdir(self.root):
+            return []
+        out = []
+        for sub in os.listdir(self.root):
+            folder = os.path.join(self.root, sub)
+            if not os.path.isdir(folder):
+                continue
+            for fname in os.listdir(folder):
+                if fname.endswith('.pkl'):
+                    st = os.stat(os.path.join(folder, fname))
+                    out.append((st.st_mtime, st.st_size, os.path.join(folder, fname)))
+        return out
+
+    def size(self) -> int:
+        """Bytes on disk (rescanned, then tracked incrementally)."""
+        self._size = sum(e[1] for e in self._entries())
+        return self._size
+
+    def _evict(self) -> None:
+        if self._size is None:
+            self.size()
+        if self._size <= self.max_bytes:
+            return
+        entries = sorted(self._entries())
+        total = sum(e[1] for e in entries)
+        for _mtime, nbytes, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= nbytes
+            self.evictions += 1
+        self._size = total
+
+    def clear(self) -> int:
+        removed = 0
+        for _mtime, _nbytes, path in self._entries():
+            os.remove(path)
+            removed += 1
+        self._size = 0
+        return removed
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'stores': self.stores,
+            'evictions': self.evictions,
+            'entries': len(self._entries()),
+            'bytes': self.size(),
+            'max_bytes': self.max_bytes,
+        }
+
+
+_DEFAULT: Optional[ResultCache] = None
+
+
+def default_cache() -> ResultCache:
+    global _DEFAULT
+    if _DEFAULT is None:
+        off = os.environ.get(DISABLE_ENV, '').strip().lower() in ('1', 'true', 'yes')
+        _DEFAULT = ResultCache(enabled=not off)
+    return _DEFAULT
+
+
+def resolve(cache) -> Optional[ResultCache]:
+    """
+    The cache an entry point's cache argument selects: None/False off (the
+    default everywhere), True the default_cache(), or a ResultCache.
+    """
+    if cache is None or cache is False:
+        return None
+    if cache is True:
+        cache = default_cache()
+    return cache if cache.enabled else None
+
+
+# =============================================================================
+# Code digests
+# =============================================================================
+@functools.lru_cache(maxsize=256)
+def _file_digest(path: str, mtime_ns: int) -> str:
+    with open(path, 'rb') as fh:
+        return hashlib.sha256(fh.read()).hexdigest()
+
+
+def _module_digest(name: str) -> str:
+    module = sys.modules.get(name)
+    path = getattr(module, '__file__', None)
+    if not path or not os.path.exists(path):
+        return name  # builtins and frozen modules change only with library_versions()
+    return _file_digest(path, os.stat(path).st_mtime_ns)
+
+
+def code_digest(*objs, version: Optional[str] = None) -> str:
+    """
+    Hash of the source files of the modules defining objs (classes,
+    instances or functions) and, for classes, every base in their MRO.
+    Editing any of them, including module-level helpers next to a class,
+    changes the digest. Pass the classes of everything the cached value
+    pickles (e.g. EnsembleResult, QuantileSketch) next to the function that
+    computes it; version is mixed in for dependencies outside those modules.
+    """
+    modules = set()
+    for obj in objs:
+        if not isinstance(obj, type) and not callable(obj):
+            obj = type(obj)
+        classes = inspect.getmro(obj) if isinstance(obj, type) else (obj,)
+        modules |= {c.__module__ for c in classes if c.__module__ != 'builtins'}
+    modules = sorted(modules)
+    payload = json.dumps({'modules': {m: _module_digest(m) for m in modules}, 'version': version})
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+# =============================================================================
+# Engine wrappers
+# =============================================================================
+def te_simulate(rr, start: float = 0.0, end: float = 100.0, points: int = 101,
+                selections: Optional[Sequence[str]] = None, seed: Optional[int] = None,
+                cache: Optional[ResultCache] = None):
+    """
+    Cached rr.simulate(start, end, points). The key covers rr.getCurrentSBML()
+    (current parameter values and state), the integrator and all its
+    settings, the selections and the grid. A hit returns the stored
+    NamedArray without touching rr, so rr is not advanced to the end time as
+    a real simulate() would; call rr.reset() between runs when that matters.
+    Gillespie runs are cached only when a seed is given.
+    """
+    cache = cache or default_cache()
+    integrator = rr.getIntegrator()
+    name = integrator.getName()
+    if name == 'gillespie' and seed is None:
+        if selections is not None:
+            return rr.simulate(start, end, points, list(selections))
+        return rr.simulate(start, end, points)
+    if name == 'gillespie':
+        integrator.setValue('seed', int(seed))
+    parts = {
+        'sbml': rr.getCurrentSBML(),
+        'integrator': name,
+        'settings': {k: integrator.getValue(k) for k in integrator.getSettings()},
+        'selections': list(selections) if selections is not None else list(rr.timeCourseSelections),
+        'grid': [start, end, int(points)],
+        'seed': seed,
+    }
+
+    def run():
+        if selections is not None:
+            return rr.simulate(start, end, points, list(selections))
+        return rr.simulate(start, end, points)
+    return cache.cached('tellurium.simulate', parts, run)
+
+
+def basico_time_course(model=None, cache: Optional[ResultCache] = None, **kwargs):
+    """
+    Cached basico.run_time_course(model=model, **kwargs). The key covers the
+    model's CopasiML (with its current parameters and initial state) and all
+    keyword arguments; stochastic runs are cached only with use_seed=True.
+    Deterministic runs of a profiled model file get its recorded r_tol /
+    a_tol unless kwargs set them (integrator_profile.with_basico_options).
+    """
+    import basico
+    from .integrator_profile import with_basico_options
+
+    cache = cache or default_cache()
+    method = str(kwargs.get('method', 'deterministic')).lower()
+    deterministic = method in ('deterministic', 'lsoda', 'radau5')
+    if not deterministic and not kwargs.get('use_seed', False):
+        return basico.run_time_course(model=model, **kwargs)
+    dm = model if model is not None else basico.get_current_model()
+    if deterministic:
+        kwargs = with_basico_options(dm.getFileName(), kwargs)
+    parts = {
+        'cps': basico.save_model_to_string(model=dm),
+        'kwargs': kwargs,
+    }
+    return cache.cached('basico.run_time_course', parts,
+                        lambda: basico.run_time_course(model=dm, **kwargs))
+
+
+def cached_update(process, state: Mapping, interval: float = 1.0,
+                  cache: Optional[ResultCache] = None, version: Optional[str] = None) -> Dict:
+    """
+    Cached process.update(state, interval) for a deterministic, stateless
+    process-bigraph Process, keyed on code_digest(type(process), version),
+    its config, input state and interval.
+    """
+    cache = cache or default_cache()
+    cls = type(process)
+    parts = {
+        'process': f'{cls.__module__}.{cls.__qualname__}',
+        'source': code_digest(cls, version),
+        'config': dict(process.config),
+        'state': dict(state),
+        'interval': float(interval),
+    }
+    return cache.cached('process_bigraph.update', parts,
+                        lambda: process.update(dict(state), interval))
+
@@ -1,5 +1,13 @@
-import roadrunner
-rr = roadrunner.RoadRunner("BIOMD0000000507.xml")
-results = rr.simulate(0, 2000, 200)
-rr.plot()
-print(results)
\ No newline at end of file
+import os
+
+
+def main():
+    import roadrunner
+    rr = roadrunner.RoadRunner(os.path.join(os.path.dirname(os.path.abspath(__file__)), "BIOMD0000000507.xml"))
+    results = rr.simulate(0, 2000, 200)
+    rr.plot()
+    print(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,386 @@
+"""
+Native NumPy Gillespie (SSA) engine for small mass-action networks.
+
+This module:
+- Defines MassActionModel, built from COPASI-style schemes ('M + S -> D').
+- Folds constant pools (the 'Source' species of the basico scripts) into
+  zero-order reactions instead of simulating a species with 10^6 copies.
+- Runs a whole batch of realizations in lock-step (vectorized propensities,
+  one seeded Generator per batch) and samples them on the same grid as
+  run_time_course(duration=..., step_number=...).
+- Provides srna_model(), the sRNA/mRNA/duplex/protein network of
+  stochastic.py / stochastic_deterministic.py, and compare_with_copasi() to
+  validate ensemble moments against basico.
+"""
+
+from __future__ import annotations
+import os
+import tempfile
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from .ensemble import EnsembleResult, OnlineStats
+from .quantiles import QuantileSketch
+from .trajectory_store import TrajectoryStore
+
+
+# =============================================================================
+# Model
+# =============================================================================
+def _parse_side(side: str) -> Dict[str, int]:
+    counts: Dict[str, int] = {}
+    for term in side.split('+'):
+        term = term.strip()
+        if not term:
+            continue
+        parts = term.split()
+        if len(parts) == 2:
+            n, name = int(parts[0]), parts[1]
+        else:
+            n, name = 1, parts[0]
+        counts[name] = counts.get(name, 0) + n
+    return counts
+
+
+def parse_scheme(scheme: str) -> Tuple[Dict[str, int], Dict[str, int]]:
+    """'M + S -> D' -> ({'M': 1, 'S': 1}, {'D': 1}); empty sides allowed."""
+    if '->' not in scheme:
+        raise ValueError(f"irreversible scheme expected, got {scheme!r}")
+    lhs, rhs = scheme.split('->', 1)
+    return _parse_side(lhs), _parse_side(rhs)
+
+
+class MassActionModel:
+    """
+    Mass-action network on molecule counts.
+
+    reactions: iterable of (name, scheme, k). Species named in constant_pools
+    are removed from the state and multiplied into k (k * pool^order), so a
+    'Source -> Source + M' reaction becomes a zero-order birth of M.
+    Species follow the order of initial, then first appearance in reactions.
+    Propensity for a reactant of order n uses the falling factorial
+    x (x-1) ... (x-n+1), which matches k * x^n at large copy numbers.
+    """
+
+    def __init__(
+        self,
+        reactions: Iterable[Tuple[str, str, float]],
+        initial: Optional[Mapping[str, float]] = None,
+        constant_pools: Optional[Mapping[str, float]] = None,
+        name: str = 'model',
+    ) -> None:
+        self.name = name
+        pools = dict(constant_pools or {})
+        initial = dict(initial or {})
+
+        parsed = []
+        species: List[str] = [s for s in initial if s not in pools]
+        for rname, scheme, k in reactions:
+            lhs, rhs = parse_scheme(scheme)
+            k = float(k)
+            for pool, amount in pools.items():
+                order = lhs.pop(pool, 0)
+                rhs.pop(pool, None)
+                k *= float(amount) ** order
+            for sid in list(lhs) + list(rhs):
+                if sid not in species:
+                    species.append(sid)
+            parsed.append((rname, lhs, rhs, k))
+
+        self.species = species
+        self.reaction_names = [p[0] for p in parsed]
+        self.rate_constants = np.array([p[3] for p in parsed], dtype=float)
+        self.constant_pools = pools
+        n_r, n_s = len(parsed), len(species)
+        self.reactant_orders = np.zeros((n_r, n_s), dtype=np.int64)
+        self.stoichiometry = np.zeros((n_r, n_s), dtype=np.int64)
+        for i, (_, lhs, rhs, _) in enumerate(parsed):
+            for sid, n in lhs.items():
+                j = species.index(sid)
+                self.reactant_orders[i, j] = n
+                self.stoichiometry[i, j] -= n
+            for sid, n in rhs.items():
+                self.stoichiometry[i, species.index(sid)] += n
+        self.initial = np.array([float(initial.get(s, 0.0)) for s in species])
+        self._schemes = [(p[0], p[1], p[2]) for p in parsed]
+        self._build_gather()
+
+    def _build_gather(self) -> None:
+        # One (species, offset) slot per reactant molecule, padded with a
+        # constant-one column, so propensities are a single gather + product.
+        slots = [[(j, m) for j in range(self.n_species)
+                  for m in range(int(self.reactant_orders[i, j]))]
+                 for i in range(self.n_reactions)]
+        width = max([len(sl) for sl in slots] + [1])
+        self._gather_idx = np.full((self.n_reactions, width), self.n_species, dtype=np.int64)
+        self._gather_off = np.zeros((self.n_reactions, width))
+        for i, sl in enumerate(slots):
+            for col, (j, m) in enumerate(sl):
+                self._gather_idx[i, col] = j
+                self._gather_off[i, col] = m
+
+    @property
+    def n_species(self) -> int:
+        return len(self.species)
+
+    @property
+    def n_reactions(self) -> int:
+        return len(self.reaction_names)
+
+    def with_parameters(self, **rates: float) -> "MassActionModel":
+        """Copy with some rate constants replaced (by reaction name)."""
+        clone = object.__new__(MassActionModel)
+        clone.__dict__.update(self.__dict__)
+        clone.rate_constants = self.rate_constants.copy()
+        for rname, k in rates.items():
+            clone.rate_constants[self.reaction_names.index(rname)] = float(k)
+        return clone
+
+    def propensities(self, x: np.ndarray) -> np.ndarray:
+        """Propensities (batch, n_reactions) for counts x (batch, n_species)."""
+        x = np.asarray(x, dtype=float)
+        ext = np.empty((x.shape[0], self.n_species + 1))
+        ext[:, :-1] = x
+        ext[:, -1] = 1.0
+        factors = np.maximum(ext[:, self._gather_idx] - self._gather_off, 0.0)
+        return self.rate_constants * factors.prod(axis=2)
+
+    def rates(self, x: np.ndarray) -> np.ndarray:
+        """Deterministic mass-action rates (batch, n_reactions) for states (batch, n_species)."""
+        x = np.atleast_2d(np.asarray(x, dtype=float))
+        ext = np.empty((x.shape[0], self.n_species + 1))
+        ext[:, :-1] = x
+        ext[:, -1] = 1.0
+        return self.rate_constants * ext[:, self._gather_idx].prod(axis=2)
+
+    def rhs(self, x: np.ndarray) -> np.ndarray:
+        """Deterministic mass-action derivative for states (batch, n_species)."""
+        return self.rates(x) @ self.stoichiometry
+
+    def to_basico(self, path: str) -> str:
+        """Write an equivalent COPASI model (counts, volume 1) for validation."""
+        import basico
+        dm = basico.new_model(name=self.name, quantity_unit='#', volume_unit='l', time_unit='s')
+        basico.add_compartment('cytoplasm', 1.0, model=dm)
+        for sid, x0 in zip(self.species, self.initial):
+            basico.add_species(sid, compartment='cytoplasm', initial_concentration=float(x0), model=dm)
+        for (rname, lhs, rhs), k in zip(self._schemes, self.rate_constants):
+            scheme = ' + '.join(_expand(lhs)) + ' -> ' + ' + '.join(_expand(rhs))
+            basico.add_reaction(rname, scheme, rate_law='Mass action (irreversible)', model=dm)
+            # COPASI turns source reactions into 'Constant flux' with parameter v
+            param = 'k1' if lhs else 'v'
+            basico.set_reaction_parameters(f'({rname}).{param}', value=float(k), model=dm)
+        basico.save_model(path, model=dm)
+        return path
+
+
+def _expand(side: Mapping[str, int]) -> List[str]:
+    return [sid if n == 1 else f'{n} {sid}' for sid, n in side.items()]
+
+
+def srna_model(
+    k_tx_m: float = 1.0,
+    k_tx_s: float = 1.0,
+    kdeg_m: float = 0.1,
+    kdeg_s: float = 0.1,
+    k_bind: float = 0.01,
+    kdeg_d: float = 0.5,
+    k_tl: float = 2.0,
+    kdeg_p: float = 0.05,
+    source: Optional[float] = None,
+) -> MassActionModel:
+    """
+    sRNA–mRNA–protein network of stochastic.py (ids as in sRNA_test.py).
+
+    With source=None transcription is zero-order at k_tx_m / k_tx_s. Passing
+    source=N reproduces the 'SRC -> SRC + M' form of stochastic_deterministic.py
+    (per-copy rate k times N copies) without tracking SRC.
+    """
+    if source is None:
+        tx = [('R_mRNA', ' -> M', k_tx_m), ('R_sRNA', ' -> S', k_tx_s)]
+        pools = None
+    else:
+        tx = [('R_mRNA', 'SRC -> SRC + M', k_tx_m), ('R_sRNA', 'SRC -> SRC + S', k_tx_s)]
+        pools = {'SRC': float(source)}
+    reactions = tx + [
+        ('R_dm', 'M -> ', kdeg_m),
+        ('R_ds', 'S -> ', kdeg_s),
+        ('R_bind', 'M + S -> D', k_bind),
+        ('R_dd', 'D -> ', kdeg_d),
+        ('R_trans', 'M -> M + P', k_tl),
+        ('R_dp', 'P -> ', kdeg_p),
+    ]
+    initial = {'M': 0, 'S': 0, 'D': 0, 'P': 0}
+    return MassActionModel(reactions, initial=initial, constant_pools=pools, name='sRNA_model')
+
+
+# =============================================================================
+# Lock-step batched SSA
+# =============================================================================
+def model_parts(model: MassActionModel) -> Dict[str, object]:
+    """Everything that defines a MassActionModel's dynamics, for result_cache keys."""
+    return {'species': list(model.species), 'k': model.rate_constants, 'orders': model.reactant_orders,
+            'stoichiometry': model.stoichiometry, 'initial': model.initial}
+
+
+def time_grid(duration: float, step_number: int, start: float = 0.0) -> np.ndarray:
+    """Output grid of run_time_course(duration, step_number)."""
+    return np.linspace(start, start + float(duration), int(step_number) + 1)
+
+
+def simulate_batch(
+    model: MassActionModel,
+    n_runs: int,
+    duration: float = 100.0,
+    step_number: int = 200,
+    seed: Optional[int] = None,
+    initial: Optional[np.ndarray] = None,
+    max_events: int = 10_000_000,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Direct-method SSA for n_runs realizations advanced together.
+
+    Returns (times, counts) with counts shaped (n_runs, n_times, n_species).
+    The state at each grid time is the state holding at that instant, as in
+    COPASI's stochastic output. Results are reproducible for a given
+    (seed, n_runs). max_events bounds the events of each realization, so
+    it does not depend on the batch size.
+    """
+    rng = np.random.default_rng(seed)
+    grid = time_grid(duration, step_number)
+    n_t = grid.size
+    B = int(n_runs)
+
+    x = np.empty((B, model.n_species), dtype=np.int64)
+    x[:] = model.initial if initial is None else np.asarray(initial)
+    out = np.empty((B, n_t, model.n_species), dtype=np.int64)
+    t = np.zeros(B)
+    nxt = np.zeros(B, dtype=np.int64)  # next grid index to fill per run
+    rows = np.arange(B)
+    stoich = model.stoichiometry
+
+    steps = 0  # every active run draws at most one event per step
+    active = np.ones(B, dtype=bool)
+    while active.any():
+        idx = rows[active]
+        a = model.propensities(x[idx])
+        a0 = a.sum(axis=1)
+        with np.errstate(divide='ignore'):
+            tau = rng.exponential(size=idx.size) / a0
+        t_new = t[idx] + tau  # inf where a0 == 0 (absorbing)
+
+        # fill every grid point passed before the jump with the current state
+        while True:
+            pending = (nxt[idx] < n_t)
+            pending[pending] &= grid[nxt[idx][pending]] < t_new[pending]
+            if not pending.any():
+                break
+            p = idx[pending]
+            out[p, nxt[p]] = x[p]
+            nxt[p] += 1
+
+        firing = np.isfinite(t_new) & (nxt[idx] < n_t)
+        if firing.any():
+            f = idx[firing]
+            cum = np.cumsum(a[firing], axis=1)
+            u = rng.random(f.size) * a0[firing]
+            r = (cum <= u[:, None]).sum(axis=1)
+            np.minimum(r, model.n_reactions - 1, out=r)
+            x[f] += stoich[r]
+            t[f] = t_new[firing]
+        active[idx[~firing]] = False
+
+        steps += 1
+        if steps > max_events:
+            raise RuntimeError(f"SSA exceeded max_events={max_events} in one realization")
+    return grid, out
+
+
+def run_ensemble(
+    model: MassActionModel,
+    n_runs: int,
+    duration: float = 100.0,
+    step_number: int = 200,
+    seed: int = 0,
+    batch_size: int = 1000,
+    keep_trajectories: bool = False,
+    quantiles: bool = False,
+    rel_accuracy: float = 0.01,
+    store: Optional[str] = None,
+    cache=None,
+) -> EnsembleResult:
+    """
+    Ensemble in batches of batch_size, folded into OnlineStats (ensemble.py)
+    and, with quantiles=True, a QuantileSketch, so memory is bounded by one
+    batch. Batch seeds are spawned from np.random.SeedSequence(seed), so
+    ensembles with nearby seeds share no streams; result.seeds holds the
+    batch seed of every run. With store (a directory) each batch is
+    appended to a TrajectoryStore as one chunk, tagged with its batch seed.
+    cache as in sbml_backend.simulate(); runs written to a store are not cached.
+    """
+    from .result_cache import code_digest, resolve
+
+    results = resolve(cache) if store is None else None
+    if results is not None:
+        parts = {'model': model_parts(model), 'code': code_digest(simulate_batch, EnsembleResult, QuantileSketch),
+                 'args': [int(n_runs), float(duration), int(step_number), int(seed), int(batch_size),
+                          bool(keep_trajectories), bool(quantiles), float(rel_accuracy)]}
+        return results.cached('ssa.run_ensemble', parts, lambda: run_ensemble(
+            model, n_runs, duration, step_number, seed, batch_size, keep_trajectories,
+            quantiles, rel_accuracy, cache=False))
+    stats = OnlineStats(int(step_number) + 1, model.n_species)
+    sketch = QuantileSketch(*stats.shape, rel_accuracy=rel_accuracy) if quantiles else None
+    kept: List[np.ndarray] = []
+    grid = time_grid(duration, step_number)
+    out = TrajectoryStore.create(store, grid, model.species, exist_ok=True) if store else None
+    sizes = [min(int(batch_size), int(n_runs) - k) for k in range(0, int(n_runs), int(batch_size))]
+    batch_seeds = [int(child.generate_state(1, np.uint32)[0])
+                   for child in np.random.SeedSequence(seed).spawn(len(sizes))]
+    for b, batch_seed in zip(sizes, batch_seeds):
+        grid, counts = simulate_batch(model, b, duration, step_number, seed=batch_seed)
+        if out is not None:
+            out.append(counts, np.full(b, batch_seed))
+        stats.push_batch(counts)
+        if sketch is not None:
+            sketch.push_batch(counts)
+        if keep_trajectories:
+            kept.append(counts)
+    raw = np.concatenate(kept) if kept else None
+    seeds = np.repeat(np.asarray(batch_seeds, dtype=np.int64), sizes)
+    return EnsembleResult(grid, model.species, stats, trajectories=raw, seeds=seeds, sketch=sketch)
+
+
+def compare_with_copasi(
+    model: MassActionModel,
+    n_runs: int = 200,
+    duration: float = 100.0,
+    step_number: int = 200,
+    seed: int = 0,
+    n_workers: Optional[int] = None,
+) -> Dict[str, Dict[str, float]]:
+    """
+    Run the same model with this engine and with basico/COPASI and compare
+    ensemble moments. For each species returns the largest difference of the
+    means in units of their combined standard error ('max_z_mean') and the
+    relative difference of the time-averaged standard deviations.
+    """
+    from .ensemble import run_basico_ensemble
+
+    ours = run_ensemble(model, n_runs, duration, step_number, seed=seed, cache=False)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = model.to_basico(os.path.join(tmp, f'{model.name}.cps'))
+        ref = run_basico_ensemble(path, n_runs, duration, step_number,
+                                  observables=model.species, seed=seed, n_workers=n_workers,
+                                  cache=False)
+
+    report: Dict[str, Dict[str, float]] = {}
+    for j, sid in enumerate(model.species):
+        m1, m2 = ours.stats.mean[1:, j], ref.stats.mean[1:, j]
+        se = np.sqrt(ours.stats.sem[1:, j] ** 2 + ref.stats.sem[1:, j] ** 2) + 1e-12
+        s1, s2 = ours.stats.std[1:, j].mean(), ref.stats.std[1:, j].mean()
+        report[sid] = {
+            'max_z_mean': float(np.max(np.abs(m1 - m2) / se)),
+            'rel_std_diff': float(abs(s1 - s2) / (s2 + 1e-12)),
+        }
+    return report
@@ -0,0 +1,227 @@
+"""
+Run-to-steady-state simulation with response metrics.
+
+This module:
+- Advances a RoadRunner model in chunks and stops as soon as the relative
+  derivative norm ||dx/dt|| / ||x|| of the state (all floating species by
+  default) has stayed below rtol (per time unit) for a whole window, instead
+  of running to a fixed generous horizon (the 600-1200 time units of the
+  practice scripts).
+- Tracks only the requested outputs while running and reduces them to
+  response metrics per output: initial and steady level, peak value and
+  time, overshoot, 10-90 % rise time and settling time into a band around
+  the steady level.
+- steady_state_scan() runs a 1-D scan with early termination and returns
+  scalars per point (metric arrays plus the stop time and whether the
+  criterion was met) rather than trajectory matrices.
+"""
+
+from __future__ import annotations
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+METRICS = ('initial', 'steady', 'peak', 'peak_time', 'overshoot', 'rise_time', 'settling_time')
+
+
+# =============================================================================
+# Metrics
+# =============================================================================
+def _crossing(times: np.ndarray, x: np.ndarray, level: float) -> float:
+    """First time x reaches level (x starts below it), linearly interpolated."""
+    idx = np.nonzero(x >= level)[0]
+    if idx.size == 0:
+        return float('nan')
+    i = int(idx[0])
+    if i == 0:
+        return float(times[0])
+    x0, x1 = x[i - 1], x[i]
+    frac = (level - x0) / (x1 - x0) if x1 != x0 else 1.0
+    return float(times[i - 1] + frac * (times[i] - times[i - 1]))
+
+
+def response_metrics(
+    times: np.ndarray,
+    x: np.ndarray,
+    steady: Optional[float] = None,
+    rise: Tuple[float, float] = (0.1, 0.9),
+    band: float = 0.02,
+) -> Dict[str, float]:
+    """
+    Metrics of one response x(t) (see METRICS). steady defaults to the last
+    value. Rise time runs from rise[0] to rise[1] of the way from the
+    initial to the steady level, for rising and falling responses alike;
+    settling time is when x last enters steady +/- band * |steady - initial|
+    (band * |steady| when the output does not move) and stays there.
+    peak is the extremum in the direction of the change (the maximum of a
+    rising response, the minimum of a falling one; the maximum without a
+    change) and overshoot how far it passes the steady level,
+    |peak - steady| / |steady - initial|, so a monotone response has 0;
+    NaN without a change.
+    """
+    times = np.asarray(times, dtype=float)
+    x = np.asarray(x, dtype=float)
+    x0 = float(x[0])
+    ss = float(x[-1]) if steady is None else float(steady)
+    change = ss - x0
+    k = int(np.argmin(x)) if change < 0 else int(np.argmax(x))
+    out = {'initial': x0, 'steady': ss, 'peak': float(x[k]), 'peak_time': float(times[k])}
+    out['overshoot'] = np.sign(change) * (out['peak'] - ss) / abs(change) if change != 0 else float('nan')
+
+    if change != 0:
+        progress = (x - x0) / change  # 0 at start, 1 at steady state, either direction
+        out['rise_time'] = _crossing(times, progress, rise[1]) - _crossing(times, progress, rise[0])
+    else:
+        out['rise_time'] = 0.0
+
+    tol = band * (abs(change) if change != 0 else max(abs(ss), 1e-12))
+    outside = np.nonzero(np.abs(x - ss) > tol)[0]
+    if outside.size == 0:
+        out['settling_time'] = float(times[0])
+    else:
+        i = int(outside[-1])
+        out['settling_time'] = float(times[min(i + 1, times.size - 1)])
+    return out
+
+
+# =============================================================================
+# Early-terminating simulation
+# =============================================================================
+class SteadyRun:
+    """
+    Outcome of simulate_to_steady_state: output traces (n_times, n_outputs)
+    on the sampled grid, stop time, whether the criterion held, and
+    metrics {output: {metric: value}}.
+    """
+
+    def __init__(self, times: np.ndarray, values: np.ndarray, outputs: Sequence[str],
+                 reached: bool, metrics: Dict[str, Dict[str, float]]) -> None:
+        self.times = times
+        self.values = values
+        self.outputs = list(outputs)
+        self.reached = reached
+        self.t_stop = float(times[-1])
+        self.metrics = metrics
+
+    def __repr__(self) -> str:
+        state = 'steady' if self.reached else 'not steady'
+        return f"SteadyRun({state} at t={self.t_stop:g}, outputs={self.outputs})"
+
+
+def simulate_to_steady_state(
+    rr,
+    outputs: Sequence[str] = ('RpoS',),
+    t_max: float = 10000.0,
+    dt: float = 1.0,
+    window: float = 50.0,
+    rtol: float = 1e-5,
+    atol: float = 1e-9,
+    chunk: float = 100.0,
+    max_chunk: float = 1000.0,
+    state: Optional[Sequence[str]] = None,
+    start: float = 0.0,
+    rise: Tuple[float, float] = (0.1, 0.9),
+    band: float = 0.02,
+) -> SteadyRun:
+    """
+    Simulate rr from its current state, sampled every dt, until
+    ||dx/dt||_2 / max(||x||_2, atol) < rtol at every sample of the last
+    `window` time units, or t_max. x is `state` (default: all floating
+    species), so an unobserved slow species keeps the run going. Chunks
+    start `chunk` time units long and grow 1.5x up to max_chunk, so slow
+    relaxations cost few integrator restarts. The caller resets rr and sets
+    parameters beforehand.
+
+    The criterion bounds the rate, not the distance to the steady state:
+    a relaxation with time constant tau stops roughly rtol * tau (relative)
+    short of its limit, so slow models need a smaller rtol.
+    """
+    outputs = list(outputs)
+    state = list(state) if state else list(rr.model.getFloatingSpeciesIds())
+    cols = ['time'] + state + [o for o in outputs if o not in state]
+    out_idx = [cols.index(o) for o in outputs]
+    n_state = len(state)
+    rr.timeCourseSelections = cols
+
+    need = max(2, int(round(window / dt)))
+    quiet_run = 0  # consecutive quiet samples up to the end of the previous chunk
+    traces: List[np.ndarray] = []
+    t, reached = float(start), False
+    prev: Optional[np.ndarray] = None
+    while t < start + t_max - 1e-12 and not reached:
+        t1 = min(t + chunk, start + t_max)
+        n = max(2, int(round((t1 - t) / dt)) + 1)
+        arr = np.asarray(rr.simulate(t, t1, n))
+        if prev is not None:
+            arr = arr[1:]  # first row repeats the last row of the previous chunk
+        block = arr if prev is None else np.vstack([prev[None, :], arr])
+        x = block[:, 1:1 + n_state]
+        rate = np.linalg.norm(np.diff(x, axis=0), axis=1) / np.diff(block[:, 0])
+        scale = np.maximum(np.linalg.norm(x[1:], axis=1), atol)
+        quiet = rate / scale < rtol
+        pos = np.arange(quiet.size)
+        last_loud = np.maximum.accumulate(np.where(quiet, -1, pos))
+        run = np.where(last_loud < 0, quiet_run + pos + 1, pos - last_loud)
+        hit = np.nonzero(run >= need)[0]
+        if hit.size:
+            # stop at the sample where the window first holds
+            stop = hit[0] + 1 if prev is None else hit[0]
+            arr = arr[:stop + 1]
+            reached = True
+        quiet_run = int(run[-1])
+        traces.append(arr[:, [0] + out_idx])
+        prev = arr[-1]
+        t = float(prev[0])
+        chunk = min(dt * np.ceil(1.5 * chunk / dt), max_chunk)
+
+    data = np.vstack(traces)
+    times, values = data[:, 0], data[:, 1:]
+    metrics = {o: response_metrics(times, values[:, j], rise=rise, band=band) for j, o in enumerate(outputs)}
+    return SteadyRun(times, values, outputs, reached, metrics)
+
+
+# =============================================================================
+# Scans
+# =============================================================================
+def steady_state_scan(
+    rr,
+    parameter: str,
+    values: Sequence[float],
+    outputs: Sequence[str] = ('RpoS',),
+    fixed: Optional[Mapping[str, float]] = None,
+    integrator='auto',
+    **kwargs,
+) -> Dict[str, np.ndarray]:
+    """
+    1-D scan with early termination. Returns {parameter: values,
+    't_stop': (n,), 'reached': (n,) bool, '<output>.<metric>': (n,)} for
+    every output and metric in METRICS. kwargs go to simulate_to_steady_state;
+    integrator as in sbml_backend.simulate().
+    """
+    from .sbml_backend import _use_integrator
+
+    _use_integrator(rr, integrator)
+    values = np.asarray(values, dtype=float)
+    result: Dict[str, np.ndarray] = {parameter: values,
+                                     't_stop': np.empty(values.size),
+                                     'reached': np.zeros(values.size, dtype=bool)}
+    for o in outputs:
+        for m in METRICS:
+            result[f'{o}.{m}'] = np.empty(values.size)
+    original = rr[parameter]
+    try:
+        for i, v in enumerate(values):
+            rr.resetAll()
+            for k, fv in (fixed or {}).items():
+                rr[k] = float(fv)
+            rr[parameter] = float(v)
+            run = simulate_to_steady_state(rr, outputs, **kwargs)
+            result['t_stop'][i] = run.t_stop
+            result['reached'][i] = run.reached
+            for o in outputs:
+                for m in METRICS:
+                    result[f'{o}.{m}'][i] = run.metrics[o][m]
+    finally:
+        rr.resetAll()
+        rr[parameter] = original
+    return result
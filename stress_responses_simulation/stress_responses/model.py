@@ -10,9 +10,6 @@ Core biology:
 - RpoS transcription depends on RNAP·σS (ES)
 """
 
-import tellurium as te
-import matplotlib.pyplot as plt
-
 # -----------------------------
 # Antimony model definition
 # -----------------------------
@@ -109,6 +106,7 @@ end
 # Helper functions
 # -----------------------------
 def load_model():
+    import tellurium as te
     return te.loada(antimony_str)
 
 def simulate_baseline(t_end=600, points=601):
@@ -121,6 +119,7 @@ def simulate_stress(stress_param, value, t_end=600, points=601):
     return r.simulate(0, t_end, points)
 
 def plot_species(result, species_list, title="Simulation"):
+    import matplotlib.pyplot as plt
     t = result[:,0]
     plt.figure(figsize=(7,4))
     for sid in species_list:
@@ -1,5 +1,3 @@
-import tellurium as te
-import matplotlib.pyplot as plt
 import numpy as np
 
 # ==============================
@@ -109,72 +107,81 @@ model RpoS_sRNA_core()
 end
 """
 
-# ==============================
-# Load model
-# ==============================
-r = te.loada(ant)
-species = r.getFloatingSpeciesIds()
-RpoS_idx = species.index('RpoS') + 1
-
-# ==============================
-# 1. Baseline
-# ==============================
-baseline = r.simulate(0, 600, 601)
-t = baseline[:, 0]
-
-plt.figure(figsize=(8,5))
-for i, sid in enumerate(species):
-    if sid != 'RpoS':
-        plt.plot(t, baseline[:, i+1], label=sid)
-plt.xlabel("Time"); plt.ylabel("Molecules (a.u.)")
-plt.title("RpoS network – RNAs (baseline)")
-plt.legend(); plt.tight_layout(); plt.show()
-
-plt.figure(figsize=(7,4))
-plt.plot(t, baseline[:, RpoS_idx])
-plt.xlabel("Time"); plt.ylabel("RpoS (a.u.)")
-plt.title("RpoS protein – baseline")
-plt.tight_layout(); plt.show()
-
-# ==============================
-# 2. Stress Scenarios
-# ==============================
-def simulate_stress(label, **stress):
-    r.resetAll()
-    for k, v in stress.items():
-        r[k] = v
-    out = r.simulate(0, 600, 601)
-    return label, out
-
-scenarios = [
-    simulate_stress("Cold (↑DsrA)", stress_cold=4),
-    simulate_stress("Envelope (↑RprA)", stress_env=4),
-    simulate_stress("Redox/Stationary (↑ArcZ)", stress_redx=3),
-    simulate_stress("Oxidative (↑OxyS)", stress_ox=4),
-]
-
-plt.figure(figsize=(8,5))
-for label, mat in scenarios:
-    plt.plot(mat[:,0], mat[:,RpoS_idx], label=label)
-plt.xlabel("Time"); plt.ylabel("RpoS (a.u.)")
-plt.title("RpoS protein responses to distinct stresses")
-plt.legend(); plt.tight_layout(); plt.show()
-
-# ==============================
-# 3. Parameter Scan (DsrA stress multiplier)
-# ==============================
-r.resetAll()
-scan = np.linspace(1, 6, 11)
-steady = []
-for s in scan:
+def main() -> None:
+    """Run the example simulations and show their figures."""
+    import tellurium as te
+    import matplotlib.pyplot as plt
+
+    # ==============================
+    # Load model
+    # ==============================
+    r = te.loada(ant)
+    species = r.getFloatingSpeciesIds()
+    RpoS_idx = species.index('RpoS') + 1
+
+    # ==============================
+    # 1. Baseline
+    # ==============================
+    baseline = r.simulate(0, 600, 601)
+    t = baseline[:, 0]
+
+    plt.figure(figsize=(8,5))
+    for i, sid in enumerate(species):
+        if sid != 'RpoS':
+            plt.plot(t, baseline[:, i+1], label=sid)
+    plt.xlabel("Time"); plt.ylabel("Molecules (a.u.)")
+    plt.title("RpoS network – RNAs (baseline)")
+    plt.legend(); plt.tight_layout(); plt.show()
+
+    plt.figure(figsize=(7,4))
+    plt.plot(t, baseline[:, RpoS_idx])
+    plt.xlabel("Time"); plt.ylabel("RpoS (a.u.)")
+    plt.title("RpoS protein – baseline")
+    plt.tight_layout(); plt.show()
+
+    # ==============================
+    # 2. Stress Scenarios
+    # ==============================
+    def simulate_stress(label, **stress):
+        r.resetAll()
+        for k, v in stress.items():
+            r[k] = v
+        out = r.simulate(0, 600, 601)
+        return label, out
+
+    scenarios = [
+        simulate_stress("Cold (↑DsrA)", stress_cold=4),
+        simulate_stress("Envelope (↑RprA)", stress_env=4),
+        simulate_stress("Redox/Stationary (↑ArcZ)", stress_redx=3),
+        simulate_stress("Oxidative (↑OxyS)", stress_ox=4),
+    ]
+
+    plt.figure(figsize=(8,5))
+    for label, mat in scenarios:
+        plt.plot(mat[:,0], mat[:,RpoS_idx], label=label)
+    plt.xlabel("Time"); plt.ylabel("RpoS (a.u.)")
+    plt.title("RpoS protein responses to distinct stresses")
+    plt.legend(); plt.tight_layout(); plt.show()
+
+    # ==============================
+    # 3. Parameter Scan (DsrA stress multiplier)
+    # ==============================
     r.resetAll()
-    r['stress_cold'] = s
-    mat = r.simulate(0, 1000, 1001)
-    steady.append(mat[-1, RpoS_idx])
-
-plt.figure(figsize=(7,4))
-plt.plot(scan, steady, marker='o')
-plt.xlabel("stress_cold multiplier (→ DsrA transcription)")
-plt.ylabel("RpoS steady level (last time-point)")
-plt.title("Dose–response: DsrA-driven activation of RpoS")
-plt.tight_layout(); plt.show()
+    scan = np.linspace(1, 6, 11)
+    steady = []
+    for s in scan:
+        r.resetAll()
+        r['stress_cold'] = s
+        mat = r.simulate(0, 1000, 1001)
+        steady.append(mat[-1, RpoS_idx])
+
+    plt.figure(figsize=(7,4))
+    plt.plot(scan, steady, marker='o')
+    plt.xlabel("stress_cold multiplier (→ DsrA transcription)")
+    plt.ylabel("RpoS steady level (last time-point)")
+    plt.title("Dose–response: DsrA-driven activation of RpoS")
+    plt.tight_layout(); plt.show()
+
+
+if __name__ == "__main__":
+    main()
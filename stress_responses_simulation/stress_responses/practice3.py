@@ -1,5 +1,3 @@
-import tellurium as te
-import matplotlib.pyplot as plt
 import numpy as np
 
 # ==============================
@@ -101,26 +99,35 @@ model RpoS_sRNA_core()
 end
 """
 
-# ==============================
-# Load model
-# ==============================
-r = te.loada(ant)
-species = r.getFloatingSpeciesIds()
-RpoS_idx = species.index('RpoS') + 1
-
-# ==============================
-# Run simulation with pulse
-# ==============================
-pulse = r.simulate(0, 600, 601)
-t = pulse[:, 0]
-
-plt.figure(figsize=(8, 5))
-plt.plot(t, pulse[:, RpoS_idx], label="RpoS (protein)")
-plt.axvspan(200, 400, color="red", alpha=0.2, label="Oxidative stress pulse")
-plt.xlabel("Time");
-plt.ylabel("RpoS (a.u.)")
-plt.title("RpoS dynamics under oxidative stress pulse (200–400)")
-plt.legend();
-plt.tight_layout();
-# plt.show()
-print(pulse)
\ No newline at end of file
+def main() -> None:
+    """Run the example simulations and show their figures."""
+    import tellurium as te
+    import matplotlib.pyplot as plt
+
+    # ==============================
+    # Load model
+    # ==============================
+    r = te.loada(ant)
+    species = r.getFloatingSpeciesIds()
+    RpoS_idx = species.index('RpoS') + 1
+
+    # ==============================
+    # Run simulation with pulse
+    # ==============================
+    pulse = r.simulate(0, 600, 601)
+    t = pulse[:, 0]
+
+    plt.figure(figsize=(8, 5))
+    plt.plot(t, pulse[:, RpoS_idx], label="RpoS (protein)")
+    plt.axvspan(200, 400, color="red", alpha=0.2, label="Oxidative stress pulse")
+    plt.xlabel("Time");
+    plt.ylabel("RpoS (a.u.)")
+    plt.title("RpoS dynamics under oxidative stress pulse (200–400)")
+    plt.legend();
+    plt.tight_layout();
+    # plt.show()
+    print(pulse)
+
+
+if __name__ == "__main__":
+    main()
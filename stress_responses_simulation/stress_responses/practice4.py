@@ -1,5 +1,3 @@
-import tellurium as te
-import matplotlib.pyplot as plt
 import numpy as np
 
 # =========================================
@@ -140,58 +138,67 @@ model RpoS_sRNA_competition()
 end
 """
 
-# Load the model
-r = te.loada(ant)
-species = r.getFloatingSpeciesIds()
-RpoS_idx = species.index('RpoS') + 1
-
-# --------------------------
-# 1) Baseline with competition
-# --------------------------
-base = r.simulate(0, 800, 801)
-t = base[:, 0]
-
-plt.figure(figsize=(7.5,4.2))
-plt.plot(t, base[:, RpoS_idx])
-plt.xlabel("Time"); plt.ylabel("RpoS (a.u.)")
-plt.title("Baseline with RNAP–σ competition (no stress)")
-plt.tight_layout(); plt.show()
-
-# --------------------------
-# 2) Show effect of σ70 competition vs σS on RpoS output
-#    Sweep Sig70_tot upward: more σ70 steals RNAP from σS → less ES → lower RpoS tx
-# --------------------------
-def steady_RpoS_for_sigma70(s70_total):
-    r.resetAll()
-    r["Sig70_tot"] = float(s70_total)
-    out = r.simulate(0, 1200, 1201)
-    return out[-1, RpoS_idx]
-
-sigma70_scan = np.linspace(200, 1400, 13)   # try a wide range
-RpoS_steady  = [steady_RpoS_for_sigma70(x) for x in sigma70_scan]
-
-plt.figure(figsize=(7.5,4.2))
-plt.plot(sigma70_scan, RpoS_steady, marker="o")
-plt.xlabel("σ70 total (molecules)")
-plt.ylabel("Steady RpoS (a.u.)")
-plt.title("Sigma-factor competition curve: increasing σ70 suppresses RpoS")
-plt.tight_layout(); plt.show()
-
-# --------------------------
-# 3)  two time-courses at different σ70_tot
-# --------------------------
-def timecourse_with_sigma70(s70_total):
-    r.resetAll()
-    r["Sig70_tot"] = float(s70_total)
-    return r.simulate(0, 800, 801)
-
-tc_low  = timecourse_with_sigma70(400)   # less σ70 → more ES → stronger RpoS tx
-tc_high = timecourse_with_sigma70(1200)  # more σ70 → less ES → weaker RpoS tx
-
-plt.figure(figsize=(7.5,4.2))
-plt.plot(tc_low[:,0],  tc_low[:, RpoS_idx],  label="σ70_tot = 400")
-plt.plot(tc_high[:,0], tc_high[:, RpoS_idx], label="σ70_tot = 1200")
-plt.xlabel("Time"); plt.ylabel("RpoS (a.u.)")
-plt.title("Time-courses under different σ70 pools")
-plt.legend()
-plt.tight_layout(); plt.show()
+def main() -> None:
+    """Run the example simulations and show their figures."""
+    import tellurium as te
+    import matplotlib.pyplot as plt
+
+    # Load the model
+    r = te.loada(ant)
+    species = r.getFloatingSpeciesIds()
+    RpoS_idx = species.index('RpoS') + 1
+
+    # --------------------------
+    # 1) Baseline with competition
+    # --------------------------
+    base = r.simulate(0, 800, 801)
+    t = base[:, 0]
+
+    plt.figure(figsize=(7.5,4.2))
+    plt.plot(t, base[:, RpoS_idx])
+    plt.xlabel("Time"); plt.ylabel("RpoS (a.u.)")
+    plt.title("Baseline with RNAP–σ competition (no stress)")
+    plt.tight_layout(); plt.show()
+
+    # --------------------------
+    # 2) Show effect of σ70 competition vs σS on RpoS output
+    #    Sweep Sig70_tot upward: more σ70 steals RNAP from σS → less ES → lower RpoS tx
+    # --------------------------
+    def steady_RpoS_for_sigma70(s70_total):
+        r.resetAll()
+        r["Sig70_tot"] = float(s70_total)
+        out = r.simulate(0, 1200, 1201)
+        return out[-1, RpoS_idx]
+
+    sigma70_scan = np.linspace(200, 1400, 13)   # try a wide range
+    RpoS_steady  = [steady_RpoS_for_sigma70(x) for x in sigma70_scan]
+
+    plt.figure(figsize=(7.5,4.2))
+    plt.plot(sigma70_scan, RpoS_steady, marker="o")
+    plt.xlabel("σ70 total (molecules)")
+    plt.ylabel("Steady RpoS (a.u.)")
+    plt.title("Sigma-factor competition curve: increasing σ70 suppresses RpoS")
+    plt.tight_layout(); plt.show()
+
+    # --------------------------
+    # 3)  two time-courses at different σ70_tot
+    # --------------------------
+    def timecourse_with_sigma70(s70_total):
+        r.resetAll()
+        r["Sig70_tot"] = float(s70_total)
+        return r.simulate(0, 800, 801)
+
+    tc_low  = timecourse_with_sigma70(400)   # less σ70 → more ES → stronger RpoS tx
+    tc_high = timecourse_with_sigma70(1200)  # more σ70 → less ES → weaker RpoS tx
+
+    plt.figure(figsize=(7.5,4.2))
+    plt.plot(tc_low[:,0],  tc_low[:, RpoS_idx],  label="σ70_tot = 400")
+    plt.plot(tc_high[:,0], tc_high[:, RpoS_idx], label="σ70_tot = 1200")
+    plt.xlabel("Time"); plt.ylabel("RpoS (a.u.)")
+    plt.title("Time-courses under different σ70 pools")
+    plt.legend()
+    plt.tight_layout(); plt.show()
+
+
+if __name__ == "__main__":
+    main()
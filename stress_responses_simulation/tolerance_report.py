@@ -0,0 +1,251 @@
+"""
+Accuracy-versus-cost reports for solver tolerances and step sizes.
+
+This module:
+- Describes a reference workload as a Workload: a run(setting) callable
+  returning an array (trajectories, steady values, ...), a ladder of
+  (label, setting) pairs to try and a tight-tolerance gold setting.
+- Runs the gold standard once and every ladder setting best-of-repeats,
+  and scores each against the gold run with trajectory error metrics:
+  max relative error (scaled by atol + |gold|), relative L2 error, and the
+  error of the final row (the 'steady' value most scans report).
+- Marks the Pareto front of error versus wall time and the cheapest
+  setting within a required accuracy, per workload, as a plain-text table
+  (or CSV / JSON).
+- Ships workloads for RoadRunner models (CVODE BDF / Adams tolerance
+  ladders, RK45, Euler sub-steps) and for basico run_time_course (LSODA
+  r_tol / a_tol); process-bigraph/Paper/tolerance_workloads.py adds the
+  SigmaCompetition fsolve xtol and SRNARegulator Euler dt ladders.
+"""
+
+from __future__ import annotations
+import json
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+METRICS = ('max_rel', 'rel_l2', 'final_rel')
+# rtol ladder for the adaptive integrators, loosest first (atol = rtol * 1e-3)
+RTOL_LADDER = (1e-3, 1e-4, 1e-5, 1e-6, 1e-7, 1e-8)
+
+
+class Workload:
+    """
+    A named reference computation. run(setting) returns an array; settings
+    is the ladder of (label, setting) to assess, gold the reference setting.
+    atol is the absolute floor in the max_rel metric.
+    """
+
+    def __init__(self, name: str, run: Callable[[object], np.ndarray],
+                 settings: Sequence[Tuple[str, object]], gold: object, atol: float = 1e-9) -> None:
+        self.name = name
+        self.run = run
+        self.settings = list(settings)
+        self.gold = gold
+        self.atol = float(atol)
+
+    def __repr__(self) -> str:
+        return f"Workload({self.name!r}, {len(self.settings)} settings)"
+
+
+# =============================================================================
+# Metrics
+# =============================================================================
+def trajectory_errors(x: np.ndarray, gold: np.ndarray, atol: float = 1e-9) -> Dict[str, float]:
+    """max_rel, rel_l2 and final_rel of x against gold (same shape; rows = time)."""
+    x = np.asarray(x, dtype=float)
+    gold = np.asarray(gold, dtype=float)
+    if x.shape != gold.shape or not np.all(np.isfinite(x)):
+        return {m: float('inf') for m in METRICS}
+    diff = np.abs(x - gold)
+    out = {
+        'max_rel': float((diff / (atol + np.abs(gold))).max()) if diff.size else 0.0,
+        'rel_l2': float(np.linalg.norm(diff) / max(np.linalg.norm(gold), atol)),
+    }
+    last, glast = np.atleast_1d(x[-1]), np.atleast_1d(gold[-1])
+    out['final_rel'] = float((np.abs(last - glast) / (atol + np.abs(glast))).max())
+    return out
+
+
+def pareto_front(walls: Sequence[float], errors: Sequence[float]) -> np.ndarray:
+    """Boolean mask of rows not beaten on both wall time and error by another row."""
+    walls = np.asarray(walls, dtype=float)
+    errors = np.asarray(errors, dtype=float)
+    front = np.zeros(walls.size, dtype=bool)
+    for i in range(walls.size):
+        if not np.isfinite(errors[i]):
+            continue
+        beaten = ((walls <= walls[i]) & (errors <= errors[i]) & ((walls < walls[i]) | (errors < errors[i])))
+        front[i] = not beaten.any()
+    return front
+
+
+# =============================================================================
+# Report
+# =============================================================================
+class ToleranceReport:
+    """Rows per workload: label, setting, wall [s], errors, pareto, and the gold run's wall time."""
+
+    def __init__(self, metric: str = 'max_rel', required: Optional[float] = None) -> None:
+        if metric not in METRICS:
+            raise ValueError(f"metric must be one of {METRICS}")
+        self.metric = metric
+        self.required = required
+        self.workloads: Dict[str, Dict] = {}
+
+    def add(self, name: str, rows: List[Dict], gold_wall: float) -> None:
+        front = pareto_front([r['wall'] for r in rows], [r[self.metric] for r in rows])
+        for r, p in zip(rows, front):
+            r['pareto'] = bool(p)
+        self.workloads[name] = {'rows': rows, 'gold_wall': gold_wall}
+
+    def cheapest(self, name: str, required: Optional[float] = None) -> Optional[Dict]:
+        """Fastest row of a workload whose error is within required (None if none is)."""
+        required = self.required if required is None else required
+        if required is None:
+            return None
+        ok = [r for r in self.workloads[name]['rows'] if r[self.metric] <= required]
+        return min(ok, key=lambda r: r['wall']) if ok else None
+
+    def table(self) -> str:
+        """Per workload, rows by wall time; '*' Pareto front, '>' cheapest within required."""
+        lines = []
+        for name, w in self.workloads.items():
+            best = self.cheapest(name)
+            lines.append(f"{name}  (gold {1e3 * w['gold_wall']:.2f} ms)")
+            lines.append(f"{'':3}{'setting':<28}{'wall [ms]':>11}" + ''.join(f'{m:>12}' for m in METRICS))
+            for r in sorted(w['rows'], key=lambda r: r['wall']):
+                mark = ('>' if best is r else ' ') + ('*' if r['pareto'] else ' ')
+                wall = f"{1e3 * r['wall']:.2f}" if np.isfinite(r['wall']) else 'failed'
+                errs = ''.join(f'{r[m]:>12.3g}' for m in METRICS)
+                lines.append(f"{mark} {r['label']:<28}{wall:>11}{errs}")
+            if self.required is not None:
+                lines.append(f"   cheapest with {self.metric} <= {self.required:g}: "
+                             f"{best['label'] if best else 'none'}")
+            lines.append('')
+        return '\n'.join(lines)
+
+    def to_dict(self) -> Dict:
+        def clean(r):
+            return {k: (v if not isinstance(v, float) or np.isfinite(v) else None) for k, v in r.items()}
+        return {'metric': self.metric, 'required': self.required,
+                'workloads': {n: {'gold_wall': w['gold_wall'], 'rows': [clean(r) for r in w['rows']]}
+                              for n, w in self.workloads.items()}}
+
+    def save(self, path: str) -> None:
+        """.json (everything) or .csv (one line per row)."""
+        if path.endswith('.csv'):
+            with open(path, 'w') as fh:
+                fh.write('workload,setting,wall_s,' + ','.join(METRICS) + ',pareto\n')
+                for name, w in self.workloads.items():
+                    for r in w['rows']:
+                        fh.write(f"{name},\"{r['label']}\",{r['wall']:.6g},"
+                                 + ','.join(f'{r[m]:.6g}' for m in METRICS) + f",{int(r['pareto'])}\n")
+            return
+        with open(path, 'w') as fh:
+            json.dump(self.to_dict(), fh, indent=1, default=str)
+
+
+def _timed(run: Callable[[object], np.ndarray], setting: object, repeats: int) -> Tuple[np.ndarray, float]:
+    walls, out = [], None
+    for _ in range(max(1, int(repeats))):
+        t0 = time.perf_counter()
+        out = np.asarray(run(setting))
+        walls.append(time.perf_counter() - t0)
+    return out, min(walls)
+
+
+def assess(
+    workloads: Sequence[Workload],
+    metric: str = 'max_rel',
+    required: Optional[float] = None,
+    repeats: int = 3,
+    verbose: bool = False,
+) -> ToleranceReport:
+    """
+    Run each workload's gold setting, then every ladder setting, and
+    collect errors and best-of-repeats wall times into a ToleranceReport.
+    A setting whose run raises is reported with infinite error and time.
+    """
+    report = ToleranceReport(metric, required)
+    for w in workloads:
+        gold, gold_wall = _timed(w.run, w.gold, 1)
+        rows = []
+        for label, setting in w.settings:
+            try:
+                out, wall = _timed(w.run, setting, repeats)
+                errs = trajectory_errors(out, gold, w.atol)
+            except Exception as exc:  # noqa: BLE001 - a failing setting is a result
+                wall, errs = float('inf'), {m: float('inf') for m in METRICS}
+                errs['message'] = str(exc)
+            rows.append({'label': label, 'setting': setting, 'wall': wall, **errs})
+            if verbose:
+                print(f"{w.name}: {label}  {1e3 * wall:.2f} ms  {metric}={errs[metric]:.3g}")
+        report.add(w.name, rows, gold_wall)
+    return report
+
+
+# =============================================================================
+# Workloads
+# =============================================================================
+def roadrunner_workload(
+    model,
+    duration: float = 1000.0,
+    points: int = 201,
+    selections: Optional[Sequence[str]] = None,
+    rtols: Sequence[float] = RTOL_LADDER,
+    explicit: Optional[bool] = None,
+    name: Optional[str] = None,
+    atol: float = 1e-9,
+) -> Workload:
+    """
+    CVODE BDF / Adams at each rtol (atol = rtol * 1e-3), plus RK45 / Euler
+    sub-steps, against integrator_profile.REFERENCE, on the
+    run_time_course-style grid of points over 0..duration. explicit=None
+    offers the explicit methods only where integrator_profile would (the
+    model's stiffness ratio is below its explicit limit); True / False
+    force them in or out.
+    """
+    from .integrator_profile import REFERENCE, _load, _simulate, candidates, configure, stiffness
+
+    rr = _load(model)
+    ids = list(selections) if selections else list(rr.model.getFloatingSpeciesIds())
+    tolerances = [(r, r * 1e-3) for r in rtols]
+    if explicit is None:
+        ratio = max(stiffness(rr)['ratio'])
+    else:
+        ratio = 0.0 if explicit else np.inf
+    ladder = [(label, (integrator, settings))
+              for label, integrator, settings in candidates(ratio, tolerances)]
+
+    def run(setting):
+        integrator, settings = setting
+        configure(rr, integrator, settings)
+        return _simulate(rr, duration, points, ids)[:, 1:]
+
+    label = name or (model if isinstance(model, str) and len(model) < 60 else 'roadrunner')
+    return Workload(label, run, ladder, REFERENCE, atol)
+
+
+def basico_workload(
+    path: str,
+    duration: float = 100.0,
+    step_number: int = 200,
+    rtols: Sequence[float] = RTOL_LADDER,
+    name: Optional[str] = None,
+    atol: float = 1e-9,
+) -> Workload:
+    """basico deterministic run_time_course at each r_tol (a_tol = r_tol * 1e-3) against 1e-12 / 1e-14."""
+    import basico
+
+    dm = basico.load_model(path)
+
+    def run(setting):
+        r_tol, a_tol = setting
+        df = basico.run_time_course(duration=duration, step_number=step_number, method='deterministic',
+                                    r_tol=r_tol, a_tol=a_tol, max_steps=1_000_000, model=dm)
+        return df.to_numpy(dtype=float)
+
+    ladder = [(f'lsoda r_tol={r:g}', (r, r * 1e-3)) for r in rtols]
+    return Workload(name or f'{path} (basico)', run, ladder, (1e-12, 1e-14), atol)
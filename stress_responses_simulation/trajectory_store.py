@@ -0,0 +1,360 @@
+"""
+Chunked on-disk store for run x time x observable trajectories.
+
+This module:
+- Defines TrajectoryStore, a directory holding a JSON header (time grid,
+  observable names, parameter names, dtype) and one .npy file per appended
+  chunk of runs, with a sidecar .meta.npz carrying the seeds and parameter
+  values of those runs.
+- Lets parallel workers append without coordination: every chunk gets a
+  unique file name and is written to a temporary file then os.replace()d, so
+  readers only ever see complete chunks.
+- Orders chunks by a sequence number (write time in ns) kept in their
+  metadata, so run indices are stable as chunks arrive: new chunks go
+  after the existing ones, and a chunk replaced by name keeps its place.
+  append() and refresh() read the metadata of new chunks only.
+- Stores float64 or float32, optionally zlib-compressed (.npz chunks, which
+  are loaded per chunk instead of memory-mapped).
+- Reads lazily: uncompressed chunks are opened with mmap_mode='r', and
+  observable(), iter_chunks() and stats() stream chunk by chunk so 10^5-run
+  studies never need to fit in RAM.
+- Converts tellurium NamedArrays and basico DataFrames to arrays.
+"""
+
+from __future__ import annotations
+import glob
+import json
+import os
+import tempfile
+import time
+import uuid
+from typing import Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+HEADER = 'store.json'
+FORMAT_VERSION = 1
+
+ParamValues = Union[None, np.ndarray, Sequence[Sequence[float]], Mapping[str, Sequence[float]]]
+
+
+def _atomic_write(path: str, write) -> None:
+    """Call write(fh) on a temp file next to path, then rename into place."""
+    folder = os.path.dirname(path)
+    fd, tmp = tempfile.mkstemp(dir=folder, prefix='.tmp-', suffix=os.path.splitext(path)[1])
+    try:
+        with os.fdopen(fd, 'wb') as fh:
+            write(fh)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def as_array(result, observables: Optional[Sequence[str]] = None) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+    """
+    (times, values, names) from a tellurium simulate() NamedArray ('time',
+    '[X]' columns) or a basico run_time_course DataFrame (Time index).
+    """
+    if hasattr(result, 'colnames'):
+        names = [c.strip('[]') for c in result.colnames]
+        arr = np.asarray(result, dtype=float)
+        times, values, names = arr[:, 0], arr[:, 1:], names[1:]
+    else:
+        times = result.index.to_numpy(dtype=float)
+        values = result.to_numpy(dtype=float)
+        names = [str(c) for c in result.columns]
+    if observables is not None:
+        idx = [names.index(o) for o in observables]
+        values, names = values[:, idx], list(observables)
+    return times, values, names
+
+
+class TrajectoryStore:
+    """
+    Directory-backed (n_runs, n_times, n_observables) array with per-run
+    seeds and parameter values. Use create() for a new store and the
+    constructor to open an existing one.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = os.path.abspath(path)
+        header_path = os.path.join(self.path, HEADER)
+        if not os.path.exists(header_path):
+            raise FileNotFoundError(f"no trajectory store at {self.path}")
+        with open(header_path, encoding='utf-8') as fh:
+            header = json.load(fh)
+        if header.get('format') != FORMAT_VERSION:
+            raise ValueError(f"unsupported store format {header.get('format')!r}")
+        self.times = np.asarray(header['times'], dtype=float)
+        self.observables: List[str] = list(header['observables'])
+        self.param_names: List[str] = list(header['param_names'])
+        self.dtype = np.dtype(header['dtype'])
+        self.compress = bool(header['compress'])
+        self.attrs: Dict = dict(header.get('attrs', {}))
+        self._chunks: List[Dict] = []
+        self._known: Dict[str, Dict] = {}
+        self.refresh()
+
+    @classmethod
+    def create(
+        cls,
+        path: str,
+        times: Sequence[float],
+        observables: Sequence[str],
+        param_names: Sequence[str] = (),
+        dtype: str = 'float64',
+        compress: bool = False,
+        attrs: Optional[Mapping] = None,
+        exist_ok: bool = False,
+    ) -> "TrajectoryStore":
+        """
+        Create a store. With exist_ok an existing store is opened instead,
+        provided its grid, observables and parameter names match, which
+        lets several workers race to create the same store.
+        """
+        path = os.path.abspath(path)
+        header = {
+            'format': FORMAT_VERSION,
+            'times': [float(t) for t in times],
+            'observables': list(observables),
+            'param_names': list(param_names),
+            'dtype': np.dtype(dtype).name,
+            'compress': bool(compress),
+            'attrs': dict(attrs or {}),
+        }
+        header_path = os.path.join(path, HEADER)
+        if os.path.exists(header_path):
+            if not exist_ok:
+                raise FileExistsError(f"trajectory store already exists at {path}")
+            store = cls(path)
+            if (not np.allclose(store.times, header['times']) or store.observables != header['observables']
+                    or store.param_names != header['param_names']):
+                raise ValueError(f"existing store at {path} has a different layout")
+            return store
+        os.makedirs(os.path.join(path, 'chunks'), exist_ok=True)
+        data = json.dumps(header, indent=1).encode('utf-8')
+        _atomic_write(header_path, lambda fh: fh.write(data))
+        return cls(path)
+
+    # ------------------------ Writing ------------------------
+    def append(self, trajs: np.ndarray, seeds: Optional[Sequence[int]] = None,
+               params: ParamValues = None, name: Optional[str] = None) -> str:
+        """
+        Write trajs (n, n_times, n_observables) as one new chunk. params is an
+        (n, n_params) array or a {name: values} mapping over param_names.
+        Returns the chunk file name. Safe to call from several processes.
+        A given name replaces any chunk of that name, so re-appending the
+        same unit of work (e.g. a retried batch task) is idempotent.
+        """
+        x = np.asarray(trajs)
+        if x.ndim == 2:
+            x = x[None]
+        n = x.shape[0]
+        if x.shape[1:] != (self.times.size, len(self.observables)):
+            raise ValueError(f"expected (n, {self.times.size}, {len(self.observables)}) trajectories, got {x.shape}")
+        seeds_arr = np.full(n, -1, dtype=np.int64) if seeds is None else np.asarray(seeds, dtype=np.int64)
+        if isinstance(params, Mapping):
+            params = np.column_stack([np.broadcast_to(np.asarray(params[p], dtype=float), (n,))
+                                      for p in self.param_names]) if self.param_names else None
+        params_arr = (np.zeros((n, len(self.param_names))) if params is None
+                      else np.asarray(params, dtype=float).reshape(n, len(self.param_names)))
+
+        name = name or f"{os.getpid()}-{uuid.uuid4().hex[:12]}"
+        base = os.path.join(self.path, 'chunks', name)
+        data_path = base + ('.npz' if self.compress else '.npy')
+        seq = self._sequence(base + '.meta.npz')
+        # metadata first: a data file without its sidecar is never listed
+        _atomic_write(base + '.meta.npz',
+                      lambda fh: np.savez(fh, seeds=seeds_arr, params=params_arr, seq=seq))
+        data = np.ascontiguousarray(x, dtype=self.dtype)
+        if self.compress:
+            _atomic_write(data_path, lambda fh: np.savez_compressed(fh, data=data))
+        else:
+            _atomic_write(data_path, lambda fh: np.save(fh, data))
+
+        chunk = {'data': data_path, 'seeds': seeds_arr, 'params': params_arr, 'seq': seq,
+                 'mtime': os.stat(base + '.meta.npz').st_mtime_ns}
+        self._known[data_path] = chunk
+        old = next((i for i, c in enumerate(self._chunks) if c['data'] == data_path), None)
+        if old is None:
+            chunk['start'] = self.n_runs
+            self._chunks.append(chunk)
+        else:
+            self._chunks[old] = chunk
+            self._reindex()
+        return name
+
+    @staticmethod
+    def _sequence(meta_path: str) -> int:
+        """Sequence number of a chunk: kept when replacing one, else the write time."""
+        if os.path.exists(meta_path):
+            try:
+                with np.load(meta_path) as meta:
+                    if 'seq' in meta:
+                        return int(meta['seq'])
+            except (OSError, ValueError):
+                pass
+        return time.time_ns()
+
+    def writer(self, chunk_runs: int = 256) -> "StoreWriter":
+        return StoreWriter(self, chunk_runs)
+
+    # ------------------------ Reading ------------------------
+    def refresh(self) -> None:
+        """
+        Rescan chunk files, picking up chunks appended (or replaced) by other
+        processes; only their metadata is read.
+        """
+        ext = '.npz' if self.compress else '.npy'
+        chunks = []
+        for data_path in glob.glob(os.path.join(self.path, 'chunks', '*' + ext)):
+            if data_path.endswith('.meta.npz'):
+                continue
+            meta_path = data_path[:-len(ext)] + '.meta.npz'
+            if not os.path.exists(meta_path):
+                continue
+            mtime = os.stat(meta_path).st_mtime_ns
+            chunk = self._known.get(data_path)
+            if chunk is None or chunk.get('mtime') != mtime:
+                with np.load(meta_path) as meta:
+                    # stores written before sequence numbers: order by write time
+                    seq = int(meta['seq']) if 'seq' in meta else mtime
+                    chunk = {'data': data_path, 'seeds': meta['seeds'], 'params': meta['params'], 'seq': seq}
+                chunk['mtime'] = mtime
+                self._known[data_path] = chunk
+            chunks.append(chunk)
+        chunks.sort(key=lambda c: (c['seq'], c['data']))
+        self._chunks = chunks
+        self._reindex()
+
+    def _reindex(self) -> None:
+        offset = 0
+        for c in self._chunks:
+            c['start'] = offset
+            offset += c['seeds'].size
+
+    @property
+    def n_runs(self) -> int:
+        return sum(c['seeds'].size for c in self._chunks)
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        return self.n_runs, self.times.size, len(self.observables)
+
+    def __len__(self) -> int:
+        return self.n_runs
+
+    @property
+    def seeds(self) -> np.ndarray:
+        return np.concatenate([c['seeds'] for c in self._chunks]) if self._chunks else np.empty(0, np.int64)
+
+    @property
+    def params(self) -> np.ndarray:
+        """(n_runs, n_params) parameter values in run order."""
+        if not self._chunks:
+            return np.empty((0, len(self.param_names)))
+        return np.concatenate([c['params'] for c in self._chunks])
+
+    def param(self, name: str) -> np.ndarray:
+        return self.params[:, self.param_names.index(name)]
+
+    def index(self, name: str) -> int:
+        return self.observables.index(name)
+
+    def _load(self, chunk: Dict) -> np.ndarray:
+        if self.compress:
+            with np.load(chunk['data']) as z:
+                return z['data']
+        return np.load(chunk['data'], mmap_mode='r')
+
+    def iter_chunks(self) -> Iterator[Tuple[int, np.ndarray]]:
+        """Yield (first run index, chunk array) one chunk at a time."""
+        for c in self._chunks:
+            yield c['start'], self._load(c)
+
+    def __getitem__(self, run: int) -> np.ndarray:
+        """One run as an (n_times, n_observables) array."""
+        run = int(run) + (self.n_runs if run < 0 else 0)
+        for c in self._chunks:
+            if c['start'] <= run < c['start'] + c['seeds'].size:
+                return np.asarray(self._load(c)[run - c['start']])
+        raise IndexError(run)
+
+    def observable(self, name: str, runs: Optional[Sequence[int]] = None) -> np.ndarray:
+        """(n_selected, n_times) array of one observable, gathered chunk by chunk."""
+        j = self.index(name)
+        sel = np.arange(self.n_runs) if runs is None else np.asarray(runs, dtype=np.int64)
+        out = np.empty((sel.size, self.times.size), dtype=self.dtype)
+        for start, arr in self.iter_chunks():
+            hit = (sel >= start) & (sel < start + arr.shape[0])
+            if hit.any():
+                out[hit] = arr[sel[hit] - start, :, j]
+        return out
+
+    def select(self, **conditions: float) -> np.ndarray:
+        """Run indices whose parameters equal the given values (np.isclose)."""
+        params = self.params
+        mask = np.ones(params.shape[0], dtype=bool)
+        for name, value in conditions.items():
+            mask &= np.isclose(params[:, self.param_names.index(name)], value)
+        return np.flatnonzero(mask)
+
+    def stats(self, runs: Optional[Sequence[int]] = None, quantiles: bool = False,
+              rel_accuracy: float = 0.01):
+        """Stream runs into an EnsembleResult (OnlineStats and optional sketch)."""
+        from .ensemble import EnsembleResult, OnlineStats
+        from .quantiles import QuantileSketch
+
+        stats = OnlineStats(self.times.size, len(self.observables))
+        sketch = QuantileSketch(*stats.shape, rel_accuracy=rel_accuracy) if quantiles else None
+        sel = None if runs is None else np.asarray(runs, dtype=np.int64)
+        for start, arr in self.iter_chunks():
+            block = arr if sel is None else arr[sel[(sel >= start) & (sel < start + arr.shape[0])] - start]
+            stats.push_batch(block)
+            if sketch is not None:
+                sketch.push_batch(block)
+        seeds = self.seeds if sel is None else self.seeds[sel]
+        return EnsembleResult(self.times, self.observables, stats, seeds=seeds, sketch=sketch)
+
+    def __repr__(self) -> str:
+        return f"TrajectoryStore({self.path!r}, shape={self.shape}, dtype={self.dtype.name})"
+
+
+class StoreWriter:
+    """Buffers single runs and appends them to the store every chunk_runs runs."""
+
+    def __init__(self, store: TrajectoryStore, chunk_runs: int = 256) -> None:
+        self.store = store
+        self.chunk_runs = int(chunk_runs)
+        self._trajs: List[np.ndarray] = []
+        self._seeds: List[int] = []
+        self._params: List[Sequence[float]] = []
+
+    def add(self, traj: np.ndarray, seed: int = -1, params: Union[Sequence[float], Mapping[str, float], None] = None) -> None:
+        if isinstance(params, Mapping):
+            params = [params[p] for p in self.store.param_names]
+        self._trajs.append(np.asarray(traj))
+        self._seeds.append(int(seed))
+        self._params.append(params if params is not None else [0.0] * len(self.store.param_names))
+        if len(self._trajs) >= self.chunk_runs:
+            self.flush()
+
+    def add_result(self, result, seed: int = -1, params=None) -> None:
+        """Add a tellurium NamedArray or basico DataFrame on the store's grid."""
+        _, values, _ = as_array(result, self.store.observables)
+        self.add(values, seed, params)
+
+    def flush(self) -> None:
+        if not self._trajs:
+            return
+        self.store.append(np.stack(self._trajs), self._seeds,
+                          np.asarray(self._params, dtype=float).reshape(len(self._trajs), -1))
+        self._trajs, self._seeds, self._params = [], [], []
+
+    def __enter__(self) -> "StoreWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.flush()
@@ -0,0 +1,270 @@
+"""
+File-based work queue for running batch specs on several processes / hosts.
+
+This module:
+- Turns a run spec (see batch.py) into one JSON task file per task under
+  <queue>/pending. The only shared resource is the queue directory, so
+  workers on any host that mounts it can join or leave at any time.
+- Claims a task by renaming it into <queue>/claimed/<id>@<worker>.json.
+  rename() within one filesystem is atomic, so exactly one worker wins
+  each task; the losers see FileNotFoundError and move on.
+- Keeps claims alive with a heartbeat thread that touches the claim file.
+  Claims whose file has not been touched for `stale` seconds (judged by
+  the filesystem's own clock, so host clock skew does not matter) are
+  renamed back to pending by whichever worker notices first.
+- Writes results as per-task chunks of <queue>/store (a TrajectoryStore),
+  then a done/<id>.json marker. A task run twice (its worker stalled and
+  was presumed dead) rewrites the same chunk, so the store never holds
+  duplicates.
+- Moves failing tasks back to pending until max_attempts, then to failed/;
+  a worker that lost its claim in the meantime leaves the task alone.
+
+Typical use:
+
+    srs-queue init spec.yaml /shared/q        # once
+    srs-queue work /shared/q                  # on every host, as often as wanted
+    srs-queue status /shared/q
+"""
+
+from __future__ import annotations
+import json
+import os
+import random
+import socket
+import threading
+import time
+import uuid
+from typing import Dict, List, Mapping, Optional
+
+from .batch import SPEC_FILE, _check_spec, expand, load_spec, normalize_spec, run_task, store_task, task_store
+from .trajectory_store import TrajectoryStore, _atomic_write
+
+STATES = ('pending', 'claimed', 'done', 'failed')
+HEARTBEAT = 10.0      # seconds between claim touches
+STALE = 60.0          # seconds without a touch before a claim is reclaimed
+
+
+# =============================================================================
+# Queue layout
+# =============================================================================
+def _dir(queue: str, state: str) -> str:
+    return os.path.join(queue, state)
+
+
+def _write_json(path: str, data: Mapping) -> None:
+    payload = json.dumps(data).encode('utf-8')
+    _atomic_write(path, lambda fh: fh.write(payload))
+
+
+def _read_json(path: str) -> Optional[Dict]:
+    try:
+        with open(path) as fh:
+            return json.load(fh)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _task_id(filename: str) -> str:
+    return filename.split('@', 1)[0].rsplit('.json', 1)[0]
+
+
+def _listing(queue: str, state: str) -> List[str]:
+    try:
+        return [f for f in os.listdir(_dir(queue, state)) if f.endswith('.json') and not f.startswith('.')]
+    except FileNotFoundError:
+        return []
+
+
+def load_queue_spec(queue: str) -> Dict:
+    with open(os.path.join(queue, SPEC_FILE)) as fh:
+        return normalize_spec(json.load(fh))
+
+
+def init_queue(spec, queue: str) -> Dict[str, int]:
+    """
+    Create the queue for spec (a path or mapping) and add every task that
+    is not already pending, claimed or done. Calling it again is harmless
+    (it restores lost task files); a queue holds exactly one spec, so a
+    different spec is refused. Returns the task counts per state.
+    """
+    spec = load_spec(spec) if isinstance(spec, str) else normalize_spec(spec)
+    queue = os.path.abspath(queue)
+    for state in STATES:
+        os.makedirs(_dir(queue, state), exist_ok=True)
+    _check_spec(queue, spec)
+    known = {_task_id(f) for state in ('pending', 'claimed', 'done') for f in _listing(queue, state)}
+    for task in expand(spec):
+        if task['id'] not in known:
+            _write_json(os.path.join(_dir(queue, 'pending'), task['id'] + '.json'), {**task, 'attempts': 0})
+    return status(queue)
+
+
+def status(queue: str) -> Dict[str, int]:
+    """Number of task files in each state."""
+    return {state: len(_listing(queue, state)) for state in STATES}
+
+
+def _fs_now(queue: str) -> float:
+    """Current time on the queue's filesystem (mtime of a freshly touched probe)."""
+    probe = os.path.join(queue, '.clock')
+    with open(probe, 'a'):
+        pass
+    os.utime(probe, None)
+    return os.stat(probe).st_mtime
+
+
+def reclaim(queue: str, stale: float = STALE) -> List[str]:
+    """Move claims not touched for stale seconds back to pending. Returns their ids."""
+    now = _fs_now(queue)
+    moved = []
+    for name in _listing(queue, 'claimed'):
+        path = os.path.join(_dir(queue, 'claimed'), name)
+        try:
+            if now - os.stat(path).st_mtime < stale:
+                continue
+            os.rename(path, os.path.join(_dir(queue, 'pending'), _task_id(name) + '.json'))
+        except FileNotFoundError:
+            continue  # finished or reclaimed by someone else meanwhile
+        moved.append(_task_id(name))
+    return moved
+
+
+# =============================================================================
+# Workers
+# =============================================================================
+class _Heartbeat:
+    """Touch a claim file every interval seconds until stopped."""
+
+    def __init__(self, path: str, interval: float) -> None:
+        self.path = path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                os.utime(self.path, None)
+            except FileNotFoundError:
+                return  # reclaimed; the result is still written, idempotently
+
+    def __enter__(self) -> '_Heartbeat':
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+def worker_name() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+
+def claim(queue: str, worker: str) -> Optional[str]:
+    """Claim one pending task; returns the claim file path or None when none is left."""
+    names = _listing(queue, 'pending')
+    random.shuffle(names)  # spread workers over the listing instead of racing for its head
+    for name in names:
+        target = os.path.join(_dir(queue, 'claimed'), f"{_task_id(name)}@{worker}.json")
+        try:
+            os.rename(os.path.join(_dir(queue, 'pending'), name), target)
+        except FileNotFoundError:
+            continue
+        os.utime(target, None)  # rename keeps the old mtime; start the heartbeat clock now
+        return target
+    return None
+
+
+def work(
+    queue: str,
+    worker: Optional[str] = None,
+    max_tasks: Optional[int] = None,
+    heartbeat: float = HEARTBEAT,
+    stale: float = STALE,
+    max_attempts: int = 3,
+    wait_for_claimed: bool = True,
+    poll: float = 2.0,
+    verbose: bool = False,
+) -> Dict[str, int]:
+    """
+    Pull and run tasks until the queue is empty (or max_tasks are done).
+    With wait_for_claimed the worker keeps polling while other workers
+    hold claims, so it can take over tasks whose worker dies. Returns the
+    number of tasks this worker completed and failed.
+    """
+    queue = os.path.abspath(queue)
+    worker = worker or worker_name()
+    spec = load_queue_spec(queue)
+    store: Optional[TrajectoryStore] = None
+    counts = {'done': 0, 'failed': 0}
+    while max_tasks is None or counts['done'] + counts['failed'] < max_tasks:
+        reclaim(queue, stale)
+        path = claim(queue, worker)
+        if path is None:
+            if wait_for_claimed and _listing(queue, 'claimed'):
+                time.sleep(poll)
+                continue
+            break
+        task = _read_json(path)
+        if task is None:
+            continue  # reclaimed before we could read it
+        done_path = os.path.join(_dir(queue, 'done'), task['id'] + '.json')
+        if os.path.exists(done_path):  # a presumed-dead worker finished it after all
+            _remove(path)
+            continue
+        try:
+            with _Heartbeat(path, heartbeat):
+                task_id, values, ids, seconds = run_task(spec, task)
+                if store is None:
+                    store = task_store(os.path.join(queue, 'store'), spec, ids)
+                store_task(store, spec, task, values)
+        except Exception as exc:  # noqa: BLE001 - recorded in the task file
+            if not os.path.exists(path):
+                # reclaimed while we ran: the task now belongs to another worker
+                if verbose:
+                    print(f"{worker}: task {task['id']} failed ({exc!r}) after losing its claim")
+                continue
+            task['attempts'] = int(task.get('attempts', 0)) + 1
+            task['error'] = repr(exc)
+            state = 'pending' if task['attempts'] < max_attempts else 'failed'
+            _write_json(os.path.join(_dir(queue, state), task['id'] + '.json'), task)
+            _remove(path)
+            counts['failed'] += 1
+            if verbose:
+                print(f"{worker}: task {task['id']} failed ({exc!r}), -> {state}")
+            continue
+        _write_json(done_path, {'id': task_id, 'worker': worker, 'seconds': round(seconds, 4)})
+        _remove(path)
+        counts['done'] += 1
+        if verbose:
+            print(f"{worker}: {task['params']} seed={task['seed']} ({seconds:.2f}s)")
+    return counts
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _work_process(queue: str, kwargs: Mapping) -> None:
+    work(queue, **kwargs)
+
+
+def run_local_workers(queue: str, n_workers: int = 2, **kwargs) -> Dict[str, int]:
+    """Run n_workers worker processes on this host until the queue drains; returns status()."""
+    import multiprocessing as mp
+
+    procs = [mp.Process(target=_work_process, args=(queue, kwargs)) for _ in range(n_workers)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+    return status(queue)
+
+
+def open_store(queue: str) -> TrajectoryStore:
+    """The TrajectoryStore holding a queue's results."""
+    return TrajectoryStore(os.path.join(queue, 'store'))
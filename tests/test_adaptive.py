@@ -0,0 +1,45 @@
+"""Adaptive ensembles: batches stop at the first one that meets the CI width."""
+
+import numpy as np
+
+from stress_responses_simulation.adaptive import QuantileCITarget, SEMTarget, run_adaptive, ssa_batches
+from stress_responses_simulation.ssa import srna_model
+
+
+def _runs(rel_tol, max_runs=4000):
+    run_batch = ssa_batches(srna_model(), duration=20.0, step_number=10, quantiles=True, cache=False)
+    target = QuantileCITarget('P', q=0.9, times=[20.0], rel_tol=rel_tol)
+    result, report = run_adaptive(run_batch, [target], batch_size=50, min_runs=50, max_runs=max_runs)
+    ratios = [h['ratios'][repr(target)] for h in report['history']]
+    return result, report, target, ratios
+
+
+def test_stops_at_requested_ci_width():
+    result, report, target, ratios = _runs(0.15)
+    assert report['converged']
+    assert result.n_runs == report['n_runs'] == 50 * report['n_batches']
+    # the last batch is the first whose CI is narrow enough
+    assert ratios[-1] <= 1.0
+    assert all(r > 1.0 for r in ratios[:-1])
+    assert len(ratios) > 1
+    met, worst = target.evaluate(result)
+    assert met and worst == ratios[-1]
+
+    # a narrower CI needs more runs; an unreachable one spends the budget
+    _, tighter, _, _ = _runs(0.08)
+    assert tighter['converged'] and tighter['n_runs'] > report['n_runs']
+    _, capped, _, capped_ratios = _runs(0.01, max_runs=200)
+    assert not capped['converged'] and capped['n_runs'] == 200
+    assert capped_ratios[-1] > 1.0
+
+
+def test_sem_target_tracks_the_standard_error():
+    run_batch = ssa_batches(srna_model(), duration=20.0, step_number=10, cache=False)
+    target = SEMTarget('M', times=[10.0, 20.0], rel_tol=0.02)
+    result, report = run_adaptive(run_batch, [target], batch_size=100, min_runs=100, growth=2.0)
+    assert report['converged']
+    idx = [int(np.argmin(np.abs(result.times - t))) for t in (10.0, 20.0)]
+    j = result.index('M')
+    assert (result.stats.sem[idx, j] <= 0.02 * np.abs(result.stats.mean[idx, j])).all()
+    sizes = np.diff([0] + [h['n_runs'] for h in report['history']])
+    np.testing.assert_array_equal(sizes, 100 * 2 ** np.arange(sizes.size))
@@ -0,0 +1,109 @@
+"""Resumable batch runner: resume, spec checks, failed tasks and the basico engine."""
+
+import json
+import os
+
+import numpy as np
+import pytest
+
+from stress_responses_simulation import batch
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SPEC = {
+    'name': 'batch-test',
+    'model': 'srna',
+    'engine': 'ssa',
+    'parameters': {'R_bind': [0.005, 0.01, 0.02]},
+    'seeds': [0, 1],
+    'runs': 3,
+    'time': {'duration': 10, 'step_number': 10},
+}
+
+
+def _ids(out_dir, name):
+    path = os.path.join(out_dir, name)
+    if not os.path.exists(path):
+        return []
+    with open(path) as fh:
+        return [json.loads(line)['id'] for line in fh if line.strip()]
+
+
+def _ordered(store):
+    # chunks land in completion order; sort runs by (R_bind, seed), stable within a task
+    return np.stack([store[i] for i in np.lexsort((store.seeds, store.param('R_bind')))])
+
+
+def test_resume_after_max_tasks(tmp_path):
+    out = str(tmp_path / 'run')
+    first = batch.run_batch(SPEC, out, n_workers=1, max_tasks=4)
+    assert (first['tasks'], first['skipped'], first['done']) == (6, 0, 4)
+    second = batch.run_batch(SPEC, out, n_workers=1)
+    assert (second['skipped'], second['done']) == (4, 2)
+    assert batch.run_batch(SPEC, out, n_workers=1)['done'] == 0
+
+    ids = _ids(out, batch.COMPLETED_FILE)
+    assert sorted(ids) == sorted(t['id'] for t in batch.expand(batch.normalize_spec(SPEC)))
+    store = batch.open_store(out)
+    assert store.shape == (18, 11, 4)
+
+    # the same tasks in one go give the same trajectories
+    batch.run_batch(SPEC, str(tmp_path / 'whole'), n_workers=1)
+    whole = batch.open_store(str(tmp_path / 'whole'))
+    np.testing.assert_array_equal(_ordered(store), _ordered(whole))
+
+
+def test_output_directory_refuses_another_spec(tmp_path):
+    out = str(tmp_path / 'run')
+    batch.run_batch(SPEC, out, n_workers=1, max_tasks=1)
+    with pytest.raises(ValueError, match='different spec'):
+        batch.run_batch(dict(SPEC, runs=4), out, n_workers=1)
+    # the unchanged spec still resumes
+    assert batch.run_batch(SPEC, out, n_workers=1)['skipped'] == 1
+
+
+def test_failed_tasks_are_retried_unless_skipped(tmp_path, monkeypatch):
+    out = str(tmp_path / 'run')
+    run_ssa = batch._RUNNERS['ssa']
+
+    def flaky(spec, task):
+        if task['params']['R_bind'] == 0.02:
+            raise RuntimeError('solver blew up')
+        return run_ssa(spec, task)
+
+    monkeypatch.setitem(batch._RUNNERS, 'ssa', flaky)
+    first = batch.run_batch(SPEC, out, n_workers=1)
+    assert (first['done'], first['failed']) == (4, 2)
+    assert len(_ids(out, batch.FAILED_FILE)) == 2
+
+    # --skip-failed: failed ids count as settled
+    skipped = batch.run_batch(SPEC, out, n_workers=1, retry_failed=False)
+    assert (skipped['skipped'], skipped['done'], skipped['failed']) == (6, 0, 0)
+
+    monkeypatch.setitem(batch._RUNNERS, 'ssa', run_ssa)
+    retried = batch.run_batch(SPEC, out, n_workers=1)
+    assert (retried['skipped'], retried['done'], retried['failed']) == (4, 2, 0)
+    assert batch.open_store(out).shape[0] == 18
+
+
+def test_basico_tasks_share_one_datamodel(tmp_path):
+    pytest.importorskip('basico')
+    cps = os.path.join(ROOT, 'stress_reponses_simulation_copasi', 'srna_model.cps')
+    spec = batch.normalize_spec({
+        'model': cps, 'engine': 'basico',
+        'parameters': {'(binding).k1': [0.5, 0.1], 'M': [2.0]},
+        'time': {'duration': 20, 'step_number': 20}, 'outputs': ['P'],
+    })
+    batch._MODELS.clear()
+    tasks = batch.expand(spec)
+    strong = batch.run_task(spec, tasks[0])[1]
+    weak = batch.run_task(spec, tasks[1])[1]
+    assert len(batch._MODELS) == 1
+    assert not np.allclose(strong, weak)
+
+    # the shared model is back at its file values: a fresh worker agrees
+    dm, species = batch._basico_model(cps)
+    assert batch._basico_value(dm, species, '(binding).k1') == pytest.approx(0.1)
+    assert batch._basico_value(dm, species, 'M') == pytest.approx(1.0)
+    batch._MODELS.clear()
+    np.testing.assert_allclose(batch.run_task(spec, tasks[0])[1], strong, rtol=1e-10)
+    batch._MODELS.clear()
@@ -0,0 +1,61 @@
+"""BindingNetwork equilibria against the analytic single-binding solution and mass conservation."""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                'process-bigraph', 'Paper'))
+from binding_network import BindingNetwork, sigma_network  # noqa: E402
+
+
+def _bound(a, b, kd):
+    s = a + b + kd
+    return (s - np.sqrt(s * s - 4.0 * a * b)) / 2.0
+
+
+def test_single_binding_matches_quadratic_root():
+    net = BindingNetwork(['A', 'B'], {'AB': ({'A': 1, 'B': 1}, 2.0)})
+    a = np.geomspace(1e-2, 1e5, 40)
+    b = np.full_like(a, 300.0)
+    eq = net.solve({'A': a, 'B': b})
+    assert eq.converged.all()
+    np.testing.assert_allclose(eq['AB'], _bound(a, b, 2.0), rtol=1e-8)
+
+    one = net.solve({'A': 50.0, 'B': 300.0})
+    assert one.converged[0]
+    assert one['AB'][0] == pytest.approx(_bound(50.0, 300.0, 2.0), rel=1e-8)
+    x, ok = net.solve_one(np.array([50.0, 300.0]))
+    assert ok and np.exp(x[0]) == pytest.approx(50.0 - _bound(50.0, 300.0, 2.0), rel=1e-8)
+
+
+def test_nested_complex_constant_is_the_product():
+    net = BindingNetwork(['E', 's', 'R'], {'Es': ({'E': 1, 's': 1}, 2.0), 'EsR': ({'Es': 1, 'R': 1}, 0.5)})
+    np.testing.assert_array_equal(net.A, [[1, 1, 0], [1, 1, 1]])
+    assert np.exp(net.log_K[1]) == pytest.approx(1.0)
+
+
+def test_sigma_network_conserves_every_total():
+    net = sigma_network()
+    rng = np.random.default_rng(3)
+    T = rng.uniform(1.0, 1e4, (200, net.n_components))
+    eq = net.solve(T)
+    assert eq.converged.all()
+    resid = net.residual(eq.x, T, net.log_K_array(None, T.shape[0]))
+    assert np.abs(resid).max() < 1e-8
+    # warm start from the solution converges immediately
+    again = net.solve(T, x0=eq.x)
+    assert again.converged.all() and again.iterations <= 1
+
+
+def test_single_solve_clips_like_the_batch_solve():
+    # a wild warm start would overflow exp() without the clip solve() uses
+    net = BindingNetwork(['A', 'B'], {'AB': ({'A': 1, 'B': 1}, 2.0)})
+    T = np.array([50.0, 300.0])
+    with np.errstate(over='raise', invalid='raise'):
+        x, ok = net.solve_one(T, x0=np.array([800.0, 800.0]))
+        batch = net.solve(T[None, :], x0=np.array([[800.0, 800.0]]))
+    assert ok and batch.converged[0]
+    np.testing.assert_allclose(x, batch.x[0], rtol=1e-8)
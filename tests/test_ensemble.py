@@ -0,0 +1,45 @@
+"""OnlineStats / EnsembleResult merging against numpy on the pooled runs."""
+
+import numpy as np
+
+from stress_responses_simulation.ensemble import EnsembleResult, OnlineStats
+
+
+def _stats(x):
+    s = OnlineStats(*x.shape[1:])
+    s.push_batch(x)
+    return s
+
+
+def test_online_stats_merge_matches_pooled_moments():
+    rng = np.random.default_rng(0)
+    a, b = rng.gamma(2.0, 3.0, (7, 5, 2)), rng.gamma(5.0, 1.0, (12, 5, 2))
+    merged = _stats(a).merge(_stats(b))
+    pooled = np.concatenate([a, b])
+    assert merged.count == 19
+    np.testing.assert_allclose(merged.mean, pooled.mean(axis=0), rtol=1e-12)
+    np.testing.assert_allclose(merged.variance, pooled.var(axis=0, ddof=1), rtol=1e-10)
+    np.testing.assert_array_equal(merged.min, pooled.min(axis=0))
+    np.testing.assert_array_equal(merged.max, pooled.max(axis=0))
+
+    one_by_one = OnlineStats(5, 2)
+    for run in pooled:
+        one_by_one.push(run)
+    np.testing.assert_allclose(one_by_one.variance, merged.variance, rtol=1e-10)
+    # merging into / from an empty accumulator is a copy
+    np.testing.assert_allclose(OnlineStats(5, 2).merge(merged).mean, merged.mean)
+    assert merged.merge(OnlineStats(5, 2)).count == 19
+
+
+def test_ensemble_merge_drops_seeds_unless_both_have_them():
+    times = np.arange(5.0)
+    x = np.ones((3, 5, 2))
+
+    def result(seeds):
+        return EnsembleResult(times, ['A', 'B'], _stats(x), seeds=seeds)
+
+    both = result(np.array([1, 2, 3])).merge(result(np.array([4, 5, 6])))
+    assert both.n_runs == 6
+    np.testing.assert_array_equal(both.seeds, [1, 2, 3, 4, 5, 6])
+    assert result(np.array([1, 2, 3])).merge(result(None)).seeds is None
+    assert result(None).merge(result(np.array([4, 5, 6]))).seeds is None
@@ -0,0 +1,75 @@
+"""Integrator profiles: explicit recording and where recorded settings are applied."""
+
+import os
+
+import pytest
+
+pytest.importorskip('roadrunner')
+pytest.importorskip('basico')
+
+from stress_responses_simulation import batch, integrator_profile  # noqa: E402
+from stress_responses_simulation.result_cache import ResultCache, basico_time_course  # noqa: E402
+from stress_responses_simulation.sbml_backend import load_roadrunner, simulate  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CPS = os.path.join(ROOT, 'stress_reponses_simulation_copasi', 'srna_model.cps')
+DECAY = """
+model decay
+  A -> B; k * A;
+  A = 10; B = 0; k = 0.1;
+end
+"""
+
+
+def test_nothing_is_recorded_unless_asked(tmp_path, monkeypatch):
+    monkeypatch.setattr(integrator_profile, 'DEFAULT_ROOT', None)
+    monkeypatch.setenv('HOME', str(tmp_path))
+    prof = integrator_profile.profile_model(DECAY, duration=50.0, points=51, repeats=1)
+    assert prof.recommended['integrator']
+    assert os.listdir(tmp_path) == []
+    assert integrator_profile.recorded(CPS) is None
+    with pytest.raises(ValueError, match='root'):
+        integrator_profile.profile_model(DECAY, duration=50.0, points=51, repeats=1, record=True)
+    with pytest.raises(ValueError, match='settings directory'):
+        integrator_profile.save(prof)
+
+
+def test_recorded_profile_reaches_roadrunner_and_basico_runs(tmp_path, monkeypatch):
+    import basico
+
+    monkeypatch.setattr(integrator_profile, 'DEFAULT_ROOT', str(tmp_path))
+    prof = integrator_profile.profile_model(CPS, duration=50.0, points=51, repeats=1, record=True)
+    assert len(os.listdir(tmp_path)) == 2  # under the SBML digest and the file digest
+
+    # RoadRunner: 'auto' applies the recommendation
+    rr = load_roadrunner(CPS)
+    rr.setIntegrator('rk4')
+    simulate(rr, 10.0, 10)
+    assert rr.getIntegrator().getName() == prof.recommended['integrator']
+
+    # basico: recorded tolerances for deterministic runs that do not set their own
+    tols = {k: v for k, v in prof.basico_options.items() if k != 'method'}
+    assert integrator_profile.with_basico_options(CPS, {}) == tols
+    assert integrator_profile.with_basico_options(CPS, {'r_tol': 1e-3})['r_tol'] == 1e-3
+    assert integrator_profile.with_basico_options(CPS, {'method': 'stochastic'}) == {'method': 'stochastic'}
+
+    seen = []
+    run = basico.run_time_course
+
+    def spy(*args, **kwargs):
+        seen.append(kwargs)
+        return run(*args, **kwargs)
+
+    monkeypatch.setattr(basico, 'run_time_course', spy)
+    spec = batch.normalize_spec({'model': CPS, 'engine': 'basico', 'time': {'duration': 10, 'step_number': 10}})
+    batch._MODELS.clear()
+    batch.run_task(spec, batch.expand(spec)[0])
+    batch._MODELS.clear()
+    assert seen[-1]['r_tol'] == tols['r_tol'] and seen[-1]['a_tol'] == tols['a_tol']
+
+    dm = basico.load_model(CPS)
+    try:
+        basico_time_course(model=dm, cache=ResultCache(str(tmp_path / 'cache')), duration=10, step_number=10)
+    finally:
+        basico.remove_datamodel(dm)
+    assert seen[-1]['r_tol'] == tols['r_tol'] and seen[-1]['a_tol'] == tols['a_tol']
@@ -0,0 +1,65 @@
+"""Model registry: artifacts are built once and rebuilt after a definition changes."""
+
+import copy
+import os
+
+import pytest
+
+pytest.importorskip('basico')
+
+from stress_responses_simulation import model_registry  # noqa: E402
+from stress_responses_simulation.copasi_models import DEFINITIONS, SRNA_STOCHASTIC  # noqa: E402
+from stress_responses_simulation.model_registry import ModelRegistry  # noqa: E402
+
+
+def test_artifact_is_built_once(tmp_path, monkeypatch):
+    builds = []
+    build = model_registry.build_cps
+
+    def counting(definition, path):
+        builds.append(definition['name'])
+        return build(definition, path)
+
+    monkeypatch.setattr(model_registry, 'build_cps', counting)
+    reg = ModelRegistry(root=str(tmp_path))
+    assert not reg.is_built('srna_stochastic')
+    path = reg.artifact('srna_stochastic')
+    mtime = os.stat(path).st_mtime_ns
+    assert builds == ['sRNA_stochastic']
+
+    # a second registry on the same root (another process) reuses the file
+    again = ModelRegistry(root=str(tmp_path)).artifact('srna_stochastic')
+    assert again == path
+    assert os.stat(path).st_mtime_ns == mtime
+    assert builds == ['sRNA_stochastic']
+    assert os.listdir(tmp_path) == [os.path.basename(path)]
+
+
+def test_changed_definition_is_rebuilt_and_reloaded(tmp_path):
+    import basico
+
+    reg = ModelRegistry(root=str(tmp_path))
+    old_path = reg.artifact('srna_stochastic')
+    changed = copy.deepcopy(SRNA_STOCHASTIC)
+    changed['reactions'][4] = ('binding', 'mRNA + sRNA -> duplex', 0.05)
+    reg.register('srna_stochastic', changed)
+    assert not reg.is_built('srna_stochastic')
+
+    new_path = reg.artifact('srna_stochastic')
+    assert new_path != old_path
+    dm = basico.load_model(new_path)
+    try:
+        k = basico.get_reaction_parameters('(binding).k1', model=dm)['value'].iloc[0]
+    finally:
+        basico.remove_datamodel(dm)
+    assert k == pytest.approx(0.05)
+
+    # the stale artifact is what prune removes
+    assert reg.prune() == 1
+    assert sorted(os.listdir(tmp_path)) == [os.path.basename(new_path)]
+
+
+def test_every_script_definition_builds(tmp_path):
+    reg = ModelRegistry(root=str(tmp_path))
+    for key in DEFINITIONS:
+        assert os.path.getsize(reg.artifact(key)) > 0
@@ -0,0 +1,66 @@
+"""Adaptive plane mapping: the split criterion, lattice sharing and the saving over a uniform grid."""
+
+import numpy as np
+import pytest
+
+pytest.importorskip('scipy')
+
+from stress_responses_simulation.parameter_map import _needs_split, _probes, map_plane  # noqa: E402
+
+
+def _switch(sharpness):
+    return lambda x, y: np.tanh(sharpness * (x - 0.3 - 0.4 * y * y))
+
+
+def _max_error(m, f, n=513):
+    g = np.linspace(0.0, 1.0, n)
+    X, Y = np.meshgrid(g, g)
+    return float(np.nanmax(np.abs(m.interpolator('f')(X, Y) - f(X, Y))))
+
+
+def test_split_sees_a_switch_through_the_center():
+    # a step along the diagonal x = y: the corners average to the center exactly
+    f = lambda x, y: float(np.tanh(50 * (x - y)))
+    s = 8
+    corners = [{'f': f(a, b)} for a in (0, s) for b in (0, s)]
+    probes = [{'f': f(a, b)} for a, b in _probes(s)]
+    assert corners[1]['f'] + corners[2]['f'] == pytest.approx(0.0)
+    assert probes[0]['f'] == pytest.approx(0.25 * sum(c['f'] for c in corners))
+    assert _needs_split(corners, probes, ['f'], {'f': 2.0}, 0.05)
+
+    flat = [{'f': 1.0}] * 4
+    assert not _needs_split(flat, [{'f': 1.0}] * 5, ['f'], {'f': 2.0}, 0.05)
+    labelled = [{'f': 1.0, 'character': 'node'}] * 4
+    assert _needs_split(labelled, [{'f': 1.0, 'character': 'focus'}] + labelled, ['f'], {'f': 2.0}, 0.05)
+
+
+def test_shared_lattice_points_are_evaluated_once():
+    f = _switch(30)
+    calls = []
+
+    def evaluate(x, y):
+        calls.append((x, y))
+        return {'f': float(f(x, y))}
+
+    m = map_plane(evaluate, (0, 1), (0, 1), initial=(5, 5), max_level=4, value_tol=0.02)
+    assert len(calls) == m.n_evaluations == len(set(calls))
+    assert m.history[-1]['evaluations'] <= m.n_evaluations < m.uniform_equivalent
+
+
+def test_refinement_reaches_the_tolerance_on_a_sharp_switch():
+    # a finer level adds points only where the tolerance is not yet met
+    f = _switch(30)
+    evaluate = lambda x, y: {'f': float(f(x, y))}
+    m5 = map_plane(evaluate, (0, 1), (0, 1), initial=(5, 5), max_level=5, value_tol=0.02)
+    m6 = map_plane(evaluate, (0, 1), (0, 1), initial=(5, 5), max_level=6, value_tol=0.02)
+    assert _max_error(m5, f) < 0.03
+    assert m6.n_evaluations == m5.n_evaluations
+
+
+def test_adaptive_map_beats_a_uniform_grid():
+    # the uniform 257 x 257 grid misses tanh(100 ...) by 0.023; the map does better with far fewer points
+    f = _switch(100)
+    m = map_plane(lambda x, y: {'f': float(f(x, y))}, (0, 1), (0, 1),
+                  initial=(5, 5), max_level=7, value_tol=0.02)
+    assert _max_error(m, f) < 0.023
+    assert 5 * m.n_evaluations < 257 ** 2
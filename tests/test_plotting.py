@@ -0,0 +1,37 @@
+"""Min/max decimation: every bucket keeps its extremes, so spikes survive."""
+
+import numpy as np
+
+from stress_responses_simulation.plotting import downsample_minmax
+
+
+def test_decimation_keeps_bucket_extremes():
+    rng = np.random.default_rng(0)
+    t = np.linspace(0.0, 100.0, 10_001)
+    y = np.cumsum(rng.normal(size=(3, t.size)), axis=1)
+    y[1, 4321] += 500.0  # a one-sample spike that striding would miss
+    y[2, 777] -= 500.0
+    n_pixels = 50
+    t_out, y_out = downsample_minmax(t, y, n_pixels)
+    assert t_out.shape == (4 * n_pixels,) and y_out.shape == (3, 4 * n_pixels)
+    assert (np.diff(t_out) >= 0).all()
+    np.testing.assert_array_equal(y_out.max(axis=1), y.max(axis=1))
+    np.testing.assert_array_equal(y_out.min(axis=1), y.min(axis=1))
+
+    starts = np.linspace(0, t.size, n_pixels + 1).astype(int)
+    for k in range(n_pixels):
+        bucket = y[:, starts[k]:starts[k + 1]]
+        out = y_out[:, 4 * k:4 * k + 4]
+        np.testing.assert_array_equal(out.max(axis=1), bucket.max(axis=1))
+        np.testing.assert_array_equal(out.min(axis=1), bucket.min(axis=1))
+        np.testing.assert_array_equal(out[:, 0], bucket[:, 0])
+        np.testing.assert_array_equal(out[:, 3], bucket[:, -1])
+        assert t_out[4 * k] == t[starts[k]] and t_out[4 * k + 3] == t[starts[k + 1] - 1]
+
+
+def test_short_inputs_pass_through():
+    t = np.arange(10.0)
+    y = np.arange(10.0)
+    t_out, y_out = downsample_minmax(t, y, 5)
+    np.testing.assert_array_equal(t_out, t)
+    np.testing.assert_array_equal(y_out, y[None, :])
@@ -0,0 +1,62 @@
+"""Dividing population: lineage ids, parents and times stay consistent."""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+pytest.importorskip('process_bigraph')
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                'process-bigraph', 'model'))
+from population import LineageRecord, Population  # noqa: E402
+
+
+def _check_lineage(pop, n0):
+    lin = pop.lineage.to_arrays()
+    ids, parent = lin['id'], lin['parent']
+    np.testing.assert_array_equal(ids, np.arange(pop.lineage.n))
+    assert pop.lineage.n == n0 + 2 * pop.n_divisions
+
+    roots = parent < 0
+    assert roots.sum() == n0 and (ids[roots] == np.arange(n0)).all()
+    assert (lin['birth'][roots] == 0.0).all()
+    # every daughter is younger than its mother and born when she divided
+    child = ~roots
+    assert (parent[child] < ids[child]).all()
+    np.testing.assert_array_equal(lin['birth'][child], lin['division'][parent[child]])
+    # mothers have exactly two daughters, everyone else none
+    n_children = np.bincount(parent[child], minlength=ids.size)
+    divided = ~np.isnan(lin['division'])
+    assert divided.sum() == pop.n_divisions
+    np.testing.assert_array_equal(n_children, np.where(divided, 2, 0))
+    # live cells are distinct leaves
+    assert np.unique(pop.ids).size == pop.n_cells
+    assert not divided[pop.ids].any()
+    return lin
+
+
+def test_lineage_is_consistent_after_divisions():
+    pop = Population(n_cells=20, seed=1)
+    pop.run(120.0, dt=0.5)
+    assert pop.n_divisions > 40 and pop.weight == 1.0
+    assert pop.n_cells == 20 + pop.n_divisions
+    _check_lineage(pop, 20)
+
+
+def test_spilled_and_subsampled_lineage(tmp_path):
+    kept = Population(n_cells=20, seed=1)
+    kept.run(120.0, dt=0.5)
+    spilled = Population(n_cells=20, seed=1, lineage=LineageRecord(capacity=8, spill_dir=str(tmp_path),
+                                                                     spill_rows=10))
+    spilled.run(120.0, dt=0.5)
+    assert os.listdir(tmp_path) and spilled.lineage.first_id > 0
+    a, b = _check_lineage(kept, 20), _check_lineage(spilled, 20)
+    for k in a:
+        np.testing.assert_array_equal(a[k], b[k])
+
+    capped = Population(n_cells=20, max_cells=30, seed=1)
+    capped.run(120.0, dt=0.5)
+    assert capped.n_cells == 30 and capped.weight > 1.0
+    _check_lineage(capped, 20)
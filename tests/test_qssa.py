@@ -0,0 +1,111 @@
+"""QSSA reduction: binding roots in the totals, frozen blocks refused in scans, and the cost it saves."""
+
+import numpy as np
+import pytest
+
+pytest.importorskip('roadrunner')
+pytest.importorskip('tellurium')
+pytest.importorskip('sympy')
+
+from stress_responses_simulation.cli import _model_text  # noqa: E402
+from stress_responses_simulation.qssa import _load, compare_reduction, reduce_fast_pairs  # noqa: E402
+
+# one enzyme binding one substrate against fixed totals; the complex drives a slow product
+SINGLE = """
+model single
+  compartment cell = 1;
+  species C in cell, P in cell, $A_free in cell, $B_free in cell;
+  C = 0; P = 0;
+  A_tot = 50; B_tot = 20; kon = 1; koff = 5; k = 0.01; d = 0.001;
+  A_free := A_tot - C;
+  B_free := B_tot - C;
+  R_bind: A_free + B_free -> C; kon * A_free * B_free;
+  R_unbd: C -> A_free + B_free; koff * C;
+  J_P: -> P; k * C;
+  D_P: P -> ; d * P;
+end
+"""
+
+# three complexes on a triangle of partners: no shared one, no closed form
+TRIANGLE = """
+model triangle
+  compartment cell = 1;
+  species C1 in cell, C2 in cell, C3 in cell, P in cell;
+  species $A_free in cell, $B_free in cell, $D_free in cell;
+  C1 = 0; C2 = 0; C3 = 0; P = 0;
+  A_tot = 50; B_tot = 40; D_tot = 30; kon = 1; koff = 5; k = 0.01; d = 0.001;
+  A_free := A_tot - C1 - C3;
+  B_free := B_tot - C1 - C2;
+  D_free := D_tot - C2 - C3;
+  R_b1: A_free + B_free -> C1; kon * A_free * B_free;
+  R_u1: C1 -> A_free + B_free; koff * C1;
+  R_b2: B_free + D_free -> C2; kon * B_free * D_free;
+  R_u2: C2 -> B_free + D_free; koff * C2;
+  R_b3: D_free + A_free -> C3; kon * D_free * A_free;
+  R_u3: C3 -> D_free + A_free; koff * C3;
+  J_P: -> P; k * C1;
+  D_P: P -> ; d * P;
+end
+"""
+
+
+@pytest.fixture(scope='module')
+def practice4():
+    full = _model_text('practice4')
+    return full, reduce_fast_pairs(full)
+
+
+def test_single_binding_stays_an_expression_of_the_totals():
+    red = reduce_fast_pairs(SINGLE, pairs=['R_bind'])
+    assert 'C' in red.report['explicit_nonlinear'] and not red.report['frozen']
+    rr = _load(red.sbml)
+    for a_tot in (50.0, 200.0):
+        rr.resetAll()
+        rr.setValue('A_tot', a_tot)
+        rr.simulate(0, 1, 2)
+        b = 20.0
+        s = a_tot + b + 5.0
+        expected = (s - np.sqrt(s * s - 4 * a_tot * b)) / 2
+        assert rr.getValue('C') == pytest.approx(expected, rel=1e-9)
+    red.check_parameters(['A_tot', 'B_tot'])
+
+
+def test_sigma_competition_stays_a_function_of_the_totals(practice4):
+    full, red = practice4
+    assert set(red.report['explicit_nonlinear']) == {'E70', 'ES'} and not red.report['frozen']
+    red.check_parameters(['SigS_tot', 'Sig70_tot', 'E_tot'])
+    # σ70 / σS scans on the reduced model follow the full one
+    a, b = _load(full), _load(red.sbml)
+    for pid, value in (('SigS_tot', 600.0), ('SigS_tot', 10.0), ('Sig70_tot', 1e5), ('E_tot', 50.0)):
+        ends = []
+        for rr in (a, b):
+            rr.resetAll()
+            rr.setValue(pid, value)
+            ends.append(rr.simulate(0, 3000, 11, ['time', 'ES', 'RpoS'])[-1, 1:])
+        np.testing.assert_allclose(ends[1], ends[0], rtol=1e-3)
+
+
+def test_frozen_block_parameters_are_refused():
+    # three complexes with no partner in common: solved numerically and frozen
+    red = reduce_fast_pairs(TRIANGLE, pairs=['R_b1', 'R_b2', 'R_b3'])
+    assert set(red.report['frozen']) == {'C1', 'C2', 'C3'}
+    assert 'B_tot' in red.report['frozen_parameters']
+    with pytest.raises(ValueError, match='B_tot'):
+        red.check_parameters(['B_tot'])
+    red.check_parameters(['k'])
+    # nothing left in the reduced model for a scan to set silently
+    rr = _load(red.sbml)
+    for pid in ('A_tot', 'B_tot', 'D_tot'):
+        with pytest.raises(RuntimeError):
+            rr.setValue(pid, 1.0)
+
+
+def test_reduction_is_accurate_and_cheaper(practice4):
+    full, red = practice4
+    report = compare_reduction(full, red.sbml, repeats=3)
+    assert report['RpoS']['max_rel_error'] < 1e-3
+    cost = report['cost']
+    assert cost['states']['reduced'] < cost['states']['full']
+    assert cost['cvode-adams']['step_ratio'] > 10
+    assert cost['cvode-adams']['speedup'] > 5
+    assert cost['cvode-bdf']['reduced_steps'] <= cost['cvode-bdf']['full_steps']
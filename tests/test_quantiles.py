@@ -0,0 +1,47 @@
+"""QuantileSketch accuracy against exact order statistics, and merging."""
+
+import numpy as np
+import pytest
+
+from stress_responses_simulation.quantiles import QuantileSketch
+
+QS = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+
+def _exact(x, q):
+    # the sketch reports the order statistic at rank floor(q (n - 1))
+    return np.sort(x, axis=0)[int(np.floor(q * (x.shape[0] - 1)))]
+
+
+def test_quantiles_within_relative_accuracy():
+    rng = np.random.default_rng(1)
+    x = rng.lognormal(mean=np.log([[5.0, 300.0], [40.0, 2e4]]), sigma=1.0, size=(2000, 2, 2))
+    sk = QuantileSketch(2, 2, rel_accuracy=0.01, min_value=0.5, max_value=1e7)
+    sk.push_batch(x)
+    est = sk.quantiles(QS)
+    for i, q in enumerate(QS):
+        exact = _exact(x, q)
+        ok = exact >= sk.min_value
+        assert np.all(np.abs(est[i][ok] - exact[ok]) <= 0.01 * exact[ok] * (1 + 1e-9))
+
+
+def test_values_below_min_value_report_zero():
+    sk = QuantileSketch(1, 1, min_value=0.5)
+    sk.push_batch(np.array([0.0, 0.0, 0.0, 10.0]).reshape(4, 1, 1))
+    assert sk.quantiles((0.5,))[0, 0, 0] == 0.0
+    assert sk.quantiles((1.0,))[0, 0, 0] == pytest.approx(10.0, rel=0.01)
+
+
+def test_merge_equals_one_sketch_of_the_pooled_runs():
+    rng = np.random.default_rng(2)
+    a, b = rng.poisson(50, (300, 4, 3)), rng.poisson(400, (500, 4, 3))
+    left, right, pooled = (QuantileSketch(4, 3) for _ in range(3))
+    left.push_batch(a)
+    right.push_batch(b)
+    pooled.push_batch(np.concatenate([a, b]))
+    merged = left.merge(right)
+    assert merged.count == 800
+    np.testing.assert_array_equal(merged.counts, pooled.counts)
+    np.testing.assert_array_equal(merged.quantiles(QS), pooled.quantiles(QS))
+    with pytest.raises(ValueError):
+        merged.merge(QuantileSketch(4, 3, rel_accuracy=0.02))
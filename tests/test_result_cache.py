@@ -0,0 +1,77 @@
+"""Result cache hits and misses, and code digests over a class hierarchy."""
+
+import importlib
+import os
+import sys
+import time
+
+import numpy as np
+
+from stress_responses_simulation.result_cache import ResultCache, code_digest
+from stress_responses_simulation.ssa import run_ensemble, srna_model
+
+
+def test_hit_and_miss(tmp_path):
+    cache = ResultCache(str(tmp_path / 'c'))
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return np.arange(3)
+
+    a = cache.cached('ns', {'x': 1.0}, compute)
+    b = cache.cached('ns', {'x': 1.0}, compute)
+    cache.cached('ns', {'x': 2.0}, compute)
+    np.testing.assert_array_equal(a, b)
+    assert (cache.hits, cache.misses, len(calls)) == (1, 2, 2)
+
+
+def test_ensemble_runner_uses_cache(tmp_path):
+    cache = ResultCache(str(tmp_path / 'c'))
+    first = run_ensemble(srna_model(), 20, 10.0, 10, cache=cache)
+    again = run_ensemble(srna_model(), 20, 10.0, 10, cache=cache)
+    run_ensemble(srna_model(), 20, 10.0, 10, cache=False)
+    assert (cache.hits, cache.misses) == (1, 1)
+    np.testing.assert_array_equal(first.stats.mean, again.stats.mean)
+
+
+def test_digest_follows_base_class_module(tmp_path, monkeypatch):
+    (tmp_path / 'rc_base.py').write_text("def helper():\n    return 1\n\nclass Base:\n    pass\n")
+    (tmp_path / 'rc_child.py').write_text("from rc_base import Base\n\nclass Child(Base):\n    pass\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    try:
+        child = importlib.import_module('rc_child').Child
+        before = code_digest(child)
+        time.sleep(0.01)
+        (tmp_path / 'rc_base.py').write_text("def helper():\n    return 2\n\nclass Base:\n    pass\n")
+        os.utime(tmp_path / 'rc_base.py', ns=(time.time_ns(), time.time_ns() + 10 ** 9))
+        assert code_digest(child) != before
+        assert code_digest(child, version='2') != code_digest(child)
+    finally:
+        sys.modules.pop('rc_base', None)
+        sys.modules.pop('rc_child', None)
+
+
+def test_cache_is_opt_in(tmp_path):
+    from stress_responses_simulation.result_cache import resolve
+
+    assert resolve(None) is None and resolve(False) is None
+    cache = ResultCache(str(tmp_path / 'c'))
+    assert resolve(cache) is cache
+
+
+def test_digest_covers_every_given_module(tmp_path, monkeypatch):
+    (tmp_path / 'rc_fn.py').write_text("def run():\n    return 1\n")
+    (tmp_path / 'rc_result.py').write_text("class Result:\n    x = 1\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    try:
+        run = importlib.import_module('rc_fn').run
+        result = importlib.import_module('rc_result').Result
+        before = code_digest(run, result)
+        assert before != code_digest(run)
+        (tmp_path / 'rc_result.py').write_text("class Result:\n    x = 2\n")
+        os.utime(tmp_path / 'rc_result.py', ns=(time.time_ns(), time.time_ns() + 10 ** 9))
+        assert code_digest(run, result) != before
+    finally:
+        sys.modules.pop('rc_fn', None)
+        sys.modules.pop('rc_result', None)
@@ -0,0 +1,61 @@
+"""RoadRunnerProcess: incremental oneStep updates follow a direct simulate."""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+pytest.importorskip('process_bigraph')
+pytest.importorskip('tellurium')
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                'process-bigraph', 'model'))
+from roadrunner_process import build_core, load_model, rpos_process  # noqa: E402
+
+OUTPUTS = ('rpoS_mRNA', 'RpoS', 'ES', 'E70')
+
+
+def _direct(proc, t_end, change_at=None, sigs=None):
+    rr = load_model(proc.config['model'])
+    rr.getIntegrator().setValue('relative_tolerance', 1e-10)
+    rr.getIntegrator().setValue('absolute_tolerance', 1e-14)
+    if change_at is None:
+        rr.simulate(0.0, t_end, 2)
+    else:
+        rr.simulate(0.0, change_at, 2)
+        rr.setValue('SigS_tot', sigs)
+        rr.simulate(change_at, t_end, 2)
+    return np.array([rr.getValue(sid) for sid in OUTPUTS])
+
+
+def _incremental(proc, n_steps, change_at=None, sigs=None):
+    state = proc.initial_state()
+    for k in range(n_steps):
+        if change_at is not None and k == change_at:
+            state['SigS_tot'] = sigs
+        for port, delta in proc.update(state, 1.0).items():
+            state[port] += delta
+    return np.array([state[sid] for sid in OUTPUTS])
+
+
+def test_one_steps_match_simulate():
+    proc = rpos_process(build_core(), outputs=OUTPUTS, relative_tolerance=1e-10, absolute_tolerance=1e-14)
+    got = _incremental(proc, 60)
+    np.testing.assert_allclose(got, _direct(proc, 60.0), rtol=1e-6, atol=1e-9)
+    assert proc.time == pytest.approx(60.0)
+    # no input changed, so CVODE was only initialized once
+    assert proc.n_steps == 60 and proc.n_resets == 1
+
+
+def test_pushed_input_restarts_and_still_matches():
+    proc = rpos_process(build_core(), outputs=OUTPUTS, relative_tolerance=1e-10, absolute_tolerance=1e-14)
+    sigs = 2.0 * proc.initial_state()['SigS_tot'] + 10.0
+    got = _incremental(proc, 60, change_at=30, sigs=sigs)
+    np.testing.assert_allclose(got, _direct(proc, 60.0, change_at=30.0, sigs=sigs), rtol=1e-6, atol=1e-9)
+    assert proc.n_resets == 2
+
+    proc.reset()
+    assert proc.time == 0.0
+    again = _incremental(proc, 60)
+    np.testing.assert_allclose(again, _direct(proc, 60.0), rtol=1e-6, atol=1e-9)
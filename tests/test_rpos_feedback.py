@@ -0,0 +1,32 @@
+"""Multi-rate sigma feedback composite: drift-gated allocation solves."""
+
+import os
+import sys
+
+import pytest
+
+pytest.importorskip('process_bigraph')
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                'process-bigraph', 'Paper'))
+from rpos_feedback_composite import SigmaAllocationCoupling, build_core, run_feedback  # noqa: E402
+
+
+def test_allocation_is_solved_only_after_drift():
+    # dt_alloc = 1 over T_end = 100: one allocation step per time unit
+    gated = run_feedback(T_end=100.0)
+    every = run_feedback(T_end=100.0, alloc_config={'drift_rtol': 0.0})
+    assert gated['n_solves'] + gated['n_skipped'] == 100
+    assert every['n_solves'] == 100 and every['n_skipped'] == 0
+    assert gated['n_solves'] < 50
+    assert gated['P'] == pytest.approx(every['P'], rel=1e-3)
+    assert gated['tx_scale'] == pytest.approx(every['tx_scale'], rel=1e-3)
+
+    faster = run_feedback(T_end=100.0, dt_alloc=0.5)
+    assert faster['n_solves'] + faster['n_skipped'] == 200
+
+
+def test_coupling_keeps_the_sigma_competition_config_checks():
+    with pytest.raises(ValueError, match='cannot be combined'):
+        SigmaAllocationCoupling(core=build_core(),
+                                config={'promoter_library': 'library.json', 'allocation_backend': 'network'})
@@ -0,0 +1,20 @@
+"""CopasiML -> SBML conversion checked against COPASI's own integrator."""
+
+import os
+
+import pytest
+
+pytest.importorskip('roadrunner')
+pytest.importorskip('basico')
+
+from stress_responses_simulation.sbml_backend import validate_against_copasi  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COPASI_DIR = os.path.join(ROOT, 'stress_reponses_simulation_copasi')
+
+
+@pytest.mark.parametrize('name', ['srna_model.cps', 'OxyR_stress_model.cps'])
+def test_shipped_model_validates(name):
+    report = validate_against_copasi(os.path.join(COPASI_DIR, name), duration=50.0, step_number=100)
+    assert report
+    assert max(report.values()) <= 1.0, report
@@ -0,0 +1,115 @@
+"""SigmaCompetition processes: promoter libraries and input-driven skipping of unchanged solves."""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+pytest.importorskip('process_bigraph')
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                'process-bigraph', 'Paper'))
+from sigma_competition_process import (  # noqa: E402
+    PromoterLibrary,
+    SigmaCompetition,
+    build_core,
+    build_driven_composite,
+    step_alloc_once,
+)
+
+
+@pytest.fixture(scope='module')
+def core():
+    return build_core()
+
+
+def test_promoter_library_occupancy_and_round_trip(tmp_path):
+    lib = PromoterLibrary([10.0, np.inf, 40.0], [np.nan, 5.0, 20.0], a=[1.0, 2.0, 0.5], copies=[1, 2, 3])
+    o70, oS = lib.occupancy(20.0, 10.0)
+    # p0 is σ70-only, p1 σS-only, p2 is contested
+    np.testing.assert_allclose(o70, [2.0 / 3.0, 0.0, 0.5 / 2.0])
+    np.testing.assert_allclose(oS, [0.0, 2.0 / 3.0, 0.5 / 2.0])
+    B70, BS = lib.bound(20.0, 10.0)
+    assert B70 == pytest.approx(2.0 / 3.0 + 3 * 0.25)
+    assert BS == pytest.approx(2 * 2.0 / 3.0 + 3 * 0.25)
+    J70, JS = lib.rates(20.0, 10.0)
+    np.testing.assert_allclose(J70, lib.a * lib.copies * o70)
+
+    lib.save(str(tmp_path / 'lib.npz'))
+    again = PromoterLibrary.load(str(tmp_path / 'lib.npz'))
+    (tmp_path / 'lib.csv').write_text('name,K_sigma70,K_sigmaS,a,copies\n'
+                                      'p0,10,,1,1\np1,,5,2,2\np2,40,20,0.5,3\n')
+    from_csv = PromoterLibrary.load(str(tmp_path / 'lib.csv'))
+    for other in (again, from_csv):
+        np.testing.assert_allclose(other.occupancy(20.0, 10.0), (o70, oS))
+        np.testing.assert_allclose(other.rates(20.0, 10.0), (J70, JS))
+    assert from_csv.names == ['p0', 'p1', 'p2']
+
+
+def test_library_allocation_conserves_rnap_and_sigmas(core):
+    lib = PromoterLibrary.synthetic(n=500, seed=1)
+    proc = SigmaCompetition(core=core)
+    proc.set_library(lib)
+    cfg = proc.config
+    out = proc.update({}, 1.0)
+    E_free, H70, HS = out['E_free'], out['E_sigma70'], out['E_sigmaS']
+    B70, BS = out['E_sigma70_bound'], out['E_sigmaS_bound']
+    assert B70 > 0 and BS > 0
+    assert (B70, BS) == pytest.approx(lib.bound(H70, HS))
+    # E_sigma70 / E_sigmaS keep their meaning: holoenzyme off the promoters
+    assert E_free + H70 + HS + B70 + BS == pytest.approx(cfg['RNAP_total'], rel=1e-8)
+    free70 = H70 * cfg['Kd_sigma70'] / E_free
+    freeS = HS * cfg['Kd_sigmaS'] / E_free
+    assert free70 + H70 + B70 == pytest.approx(cfg['sigma70_total'], rel=1e-8)
+    assert freeS + HS + BS == pytest.approx(cfg['sigmaS_total'], rel=1e-8)
+    assert out['J_sigma70'] + out['J_sigmaS'] == pytest.approx(proc.promoter_rates.sum())
+
+    resid = SigmaCompetition._library_equations(
+        np.log([E_free, H70, HS]), lib, cfg['RNAP_total'], cfg['sigma70_total'], cfg['sigmaS_total'],
+        cfg['Kd_sigma70'], cfg['Kd_sigmaS'])
+    assert np.abs(resid).max() < 1e-9
+
+
+def test_library_without_recognized_promoters_matches_the_plain_allocation(core):
+    plain = SigmaCompetition(core=core).update({}, 1.0)
+    assert plain['E_sigma70_bound'] == plain['E_sigmaS_bound'] == 0.0
+    proc = SigmaCompetition(core=core)
+    proc.set_library(PromoterLibrary([np.inf] * 3, [np.inf] * 3))
+    out = proc.update({}, 1.0)
+    for k in ('E_free', 'E_sigma70', 'E_sigmaS'):
+        assert out[k] == pytest.approx(plain[k], rel=1e-8)
+    assert out['E_sigma70_bound'] == out['E_sigmaS_bound'] == 0.0
+
+
+def test_driven_composite_solves_only_at_the_pulse_edges(core):
+    # composite_utils.run_single: sigmaS_total doubles for 20 < t < 40
+    defaults = SigmaCompetition(core=core).config
+    base = float(defaults['sigmaS_total'])
+    dt = 0.5
+    times = np.arange(0.0, 60.0 + dt, dt)
+    comp = build_driven_composite(core, defaults, interval=dt)
+    seen = {}
+    for t in times:
+        comp.state['sigmaS_total'] = 2.0 * base if 20.0 < t < 40.0 else base
+        comp.run(dt)
+        seen[float(t)] = comp.state['E_sigmaS']
+    alloc = comp.state['alloc']['instance']
+    assert alloc.n_solves == 3
+    assert alloc.n_skipped == len(times) - 3
+
+    # the stores hold the same allocation a fresh solve gives
+    pulsed = step_alloc_once(core, dict(defaults, sigmaS_total=2.0 * base))
+    assert seen[30.0] == pytest.approx(pulsed['E_sigmaS'], rel=1e-9)
+    assert seen[60.0] == pytest.approx(step_alloc_once(core, defaults)['E_sigmaS'], rel=1e-9)
+
+
+def test_input_rtol_decides_what_counts_as_a_change(core):
+    defaults = SigmaCompetition(core=core).config
+    base = float(defaults['sigmaS_total'])
+    comp = build_driven_composite(core, dict(defaults, input_rtol=1e-3), interval=1.0)
+    for total in (base, base * (1 + 1e-4), base * (1 + 1e-2)):
+        comp.state['sigmaS_total'] = total
+        comp.run(1.0)
+    alloc = comp.state['alloc']['instance']
+    assert (alloc.n_solves, alloc.n_skipped) == (2, 1)
@@ -0,0 +1,32 @@
+"""Batched Gillespie engine: event limit, seeding and agreement with COPASI."""
+
+import numpy as np
+import pytest
+
+from stress_responses_simulation.ssa import compare_with_copasi, run_ensemble, simulate_batch, srna_model
+
+
+def test_max_events_is_per_realization():
+    model = srna_model()
+    # far more than 5000 events in the batch, but not in any one realization
+    simulate_batch(model, 200, duration=20.0, step_number=20, seed=3, max_events=5000)
+    with pytest.raises(RuntimeError, match='max_events'):
+        simulate_batch(model, 200, duration=20.0, step_number=20, seed=3, max_events=5)
+
+
+def test_batch_seeds_are_spawned_and_recorded():
+    model = srna_model()
+    a = run_ensemble(model, 20, 10.0, 10, seed=0, batch_size=10, keep_trajectories=True, cache=False)
+    b = run_ensemble(model, 20, 10.0, 10, seed=1, batch_size=10, keep_trajectories=True, cache=False)
+    again = run_ensemble(model, 20, 10.0, 10, seed=0, batch_size=10, keep_trajectories=True, cache=False)
+    assert a.seeds.shape == (20,) and len(set(a.seeds)) == 2
+    assert not set(a.seeds) & set(b.seeds)
+    np.testing.assert_array_equal(a.trajectories, again.trajectories)
+
+
+def test_moments_match_copasi():
+    pytest.importorskip('basico')
+    report = compare_with_copasi(srna_model(), n_runs=100, duration=20.0, step_number=20, n_workers=1)
+    for sid, r in report.items():
+        assert r['max_z_mean'] < 5.0, (sid, r)
+        assert r['rel_std_diff'] < 0.25, (sid, r)
@@ -0,0 +1,62 @@
+"""Import-time and CLI start-up budget."""
+
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY = ('tellurium', 'roadrunner', 'basico', 'COPASI', 'matplotlib', 'process_bigraph', 'pandas', 'sympy')
+MODULES = (
+    'adaptive', 'batch', 'cli', 'colony', 'copasi_models', 'ensemble', 'hybrid', 'integrator_profile',
+    'model_registry', 'parameter_map', 'plotting', 'qssa', 'quantiles', 'result_cache',
+    'sbml_backend', 'ssa', 'steady_state', 'tolerance_report', 'trajectory_store', 'work_queue',
+    'stress_responses.model', 'stress_responses.practice', 'stress_responses.practice3',
+    'stress_responses.practice4',
+)
+# seconds for `srs --help`, best of three; override for slow machines
+BUDGET = float(os.environ.get('SRS_STARTUP_BUDGET', '1.0'))
+
+
+def _python(code: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True,
+                          env={**os.environ, 'PYTHONPATH': ROOT})
+
+
+def test_imports_defer_heavy_dependencies():
+    code = (
+        "import importlib, sys\n"
+        f"for m in {MODULES!r}:\n"
+        "    importlib.import_module('stress_responses_simulation.' + m)\n"
+        f"print(','.join(sorted(h for h in {HEAVY!r} if h in sys.modules)))\n"
+    )
+    proc = _python(code)
+    assert proc.returncode == 0, proc.stderr
+    assert proc.stdout.strip() == ''
+
+
+def test_composite_utils_defers_process_bigraph():
+    paper = os.path.join(ROOT, 'process-bigraph', 'Paper')
+    code = (
+        "import sys\n"
+        f"sys.path.insert(0, {paper!r})\n"
+        "import composite_utils\n"
+        f"print(','.join(sorted(h for h in {HEAVY!r} if h in sys.modules)))\n"
+    )
+    proc = _python(code)
+    assert proc.returncode == 0, proc.stderr
+    assert proc.stdout.strip() == ''
+
+
+@pytest.mark.parametrize('engine', ['', 'ssa', 'map', 'scan', 'composite'])
+def test_cli_help_within_budget(engine):
+    argv = ['--help'] if not engine else [engine, '--help']
+    best = float('inf')
+    for _ in range(3):
+        t0 = time.perf_counter()
+        proc = _python(f"import sys; from stress_responses_simulation.cli import main; main({argv!r})")
+        best = min(best, time.perf_counter() - t0)
+        assert proc.returncode == 0, proc.stderr
+    assert best < BUDGET, f"start-up took {best:.2f}s (budget {BUDGET}s)"
@@ -0,0 +1,60 @@
+"""Response metrics and early-terminating runs on a first-order relaxation."""
+
+import numpy as np
+import pytest
+
+from stress_responses_simulation.steady_state import response_metrics
+
+# X relaxes from 0 to k / d = 100 with tau = 1 / d = 10
+BIRTH_DEATH = """
+model relax
+  species X = 0;
+  k = 10; d = 0.1;
+  J_X: -> X; k;
+  D_X: X -> ; d * X;
+end
+"""
+
+
+def test_response_metrics_of_exponential_rise():
+    tau = 10.0
+    t = np.linspace(0.0, 200.0, 20001)
+    m = response_metrics(t, 5.0 * (1.0 - np.exp(-t / tau)), steady=5.0)
+    assert m['initial'] == 0.0 and m['steady'] == 5.0
+    assert m['rise_time'] == pytest.approx(tau * np.log(9.0), rel=1e-4)
+    assert m['settling_time'] == pytest.approx(tau * np.log(50.0), abs=0.02)
+    assert m['overshoot'] == pytest.approx(0.0, abs=1e-6)
+
+
+def test_response_metrics_of_falling_responses():
+    t = np.linspace(0.0, 100.0, 10001)
+    monotone = response_metrics(t, 10.0 * np.exp(-t / 10.0) + 2.0, steady=2.0)
+    assert monotone['peak'] == pytest.approx(2.0, abs=1e-3)
+    assert monotone['overshoot'] == pytest.approx(0.0, abs=1e-4)
+    assert monotone['rise_time'] == pytest.approx(10.0 * np.log(9.0), rel=1e-3)
+
+    # undershoot below the new level: peak is the minimum, overshoot is positive
+    x = 2.0 + 8.0 * np.exp(-t / 5.0) * np.cos(t)
+    m = response_metrics(t, x, steady=2.0)
+    assert m['peak'] == pytest.approx(x.min())
+    assert m['peak'] < 2.0
+    assert m['overshoot'] == pytest.approx((2.0 - x.min()) / 8.0)
+
+
+def test_simulate_to_steady_state_stops_early():
+    te = pytest.importorskip('tellurium')
+    from stress_responses_simulation.steady_state import simulate_to_steady_state, steady_state_scan
+
+    rr = te.loada(BIRTH_DEATH)
+    run = simulate_to_steady_state(rr, ('X',), t_max=10000.0, rtol=1e-5, window=50.0)
+    assert run.reached
+    # |dx/dt| / x < 1e-5 once 100 - x < 0.01, i.e. t ~ tau ln(1e4) ~ 92, plus the window
+    assert 100.0 < run.t_stop < 200.0
+    m = run.metrics['X']
+    assert m['steady'] == pytest.approx(100.0, rel=1e-3)
+    assert m['rise_time'] == pytest.approx(10.0 * np.log(9.0), rel=1e-2)
+
+    scan = steady_state_scan(rr, 'k', [5.0, 20.0], ('X',), t_max=10000.0)
+    assert scan['reached'].all()
+    np.testing.assert_allclose(scan['X.steady'], [50.0, 200.0], rtol=1e-3)
+    assert rr['k'] == 10.0
@@ -0,0 +1,75 @@
+"""Tolerance report metrics, Pareto front and assess() on a callable workload."""
+
+import json
+
+import numpy as np
+import pytest
+
+from stress_responses_simulation.tolerance_report import (
+    ToleranceReport, Workload, assess, pareto_front, trajectory_errors,
+)
+
+
+def test_trajectory_errors():
+    gold = np.array([[1.0, 10.0], [2.0, 20.0]])
+    x = gold * np.array([[1.0, 1.1], [1.0, 1.01]])
+    e = trajectory_errors(x, gold, atol=0.0)
+    assert e['max_rel'] == pytest.approx(0.1)
+    assert e['final_rel'] == pytest.approx(0.01)
+    assert e['rel_l2'] == pytest.approx(np.hypot(1.0, 0.2) / np.linalg.norm(gold))
+    assert trajectory_errors(x[:1], gold)['max_rel'] == np.inf
+    assert trajectory_errors(np.full_like(gold, np.nan), gold)['final_rel'] == np.inf
+
+
+def test_pareto_front():
+    walls = [1.0, 2.0, 3.0, 2.5, 1.0]
+    errors = [1e-2, 1e-4, 1e-6, 1e-3, np.inf]
+    np.testing.assert_array_equal(pareto_front(walls, errors), [True, True, True, False, False])
+
+
+def test_assess_euler_ladder(tmp_path):
+    # forward Euler on x' = -x over [0, 1]: error shrinks with dt, cost grows
+    t = np.linspace(0.0, 1.0, 11)
+
+    def run(dt):
+        if dt is None:
+            raise RuntimeError("no step size")
+        n = int(round(1.0 / dt))
+        x = (1.0 - dt) ** np.arange(n + 1)
+        return x[::n // 10]
+
+    w = Workload('decay', run, [('dt=0.01', 0.01), ('dt=0.001', 0.001), ('broken', None)],
+                 gold=1e-6)
+    assert np.allclose(run(1e-6), np.exp(-t), rtol=1e-5)
+    report = assess([w], required=1e-2, repeats=1)
+    rows = {r['label']: r for r in report.workloads['decay']['rows']}
+    assert rows['dt=0.001']['max_rel'] < rows['dt=0.01']['max_rel'] < 1e-2
+    assert rows['broken']['wall'] == np.inf and 'message' in rows['broken']
+    assert report.cheapest('decay')['label'] in ('dt=0.01', 'dt=0.001')
+    assert report.cheapest('decay', required=1e-6) is None
+    assert '>' in report.table()
+
+    report.save(str(tmp_path / 'r.json'))
+    saved = json.loads((tmp_path / 'r.json').read_text())
+    assert saved['workloads']['decay']['rows'][2]['wall'] is None
+    report.save(str(tmp_path / 'r.csv'))
+    assert len((tmp_path / 'r.csv').read_text().splitlines()) == 4
+    with pytest.raises(ValueError):
+        ToleranceReport(metric='bogus')
+
+
+def test_basico_workload_from_the_cli():
+    pytest.importorskip('basico')
+    import argparse
+    import os
+
+    from stress_responses_simulation.cli import _tolerance_workload
+
+    path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        'stress_reponses_simulation_copasi', 'srna_model.cps')
+    args = argparse.Namespace(duration=20.0, points=41, outputs=None, explicit='auto')
+    w = _tolerance_workload(path, args)
+    w.settings = [s for s in w.settings if s[1][0] in (1e-3, 1e-7)]
+    rows = assess([w], repeats=1).workloads[w.name]['rows']
+    assert [r['label'] for r in rows] == ['lsoda r_tol=0.001', 'lsoda r_tol=1e-07']
+    assert rows[1]['max_rel'] < rows[0]['max_rel'] < 1e-1
@@ -0,0 +1,46 @@
+"""Chunk ordering and incremental indexing of TrajectoryStore."""
+
+import numpy as np
+
+from stress_responses_simulation.trajectory_store import TrajectoryStore
+
+
+def _chunk(value, n=2):
+    return np.full((n, 3, 1), float(value))
+
+
+def test_run_indices_stable_as_chunks_arrive(tmp_path):
+    store = TrajectoryStore.create(str(tmp_path / 's'), [0, 1, 2], ['X'])
+    store.append(_chunk(1), seeds=[50, 51])
+    store.append(_chunk(2))  # unseeded (-1) must not jump ahead
+    store.append(_chunk(3), seeds=[0, 1])
+    expected = [1, 1, 2, 2, 3, 3]
+    np.testing.assert_array_equal(store.observable('X')[:, 0], expected)
+
+    other = TrajectoryStore(store.path)  # a second reader sees the same layout
+    np.testing.assert_array_equal(other.observable('X')[:, 0], expected)
+    other.append(_chunk(4))
+    store.refresh()
+    np.testing.assert_array_equal(store.observable('X')[:, 0], expected + [4, 4])
+
+
+def test_named_chunk_replaced_in_place(tmp_path):
+    store = TrajectoryStore.create(str(tmp_path / 's'), [0, 1, 2], ['X'])
+    store.append(_chunk(1), name='a')
+    store.append(_chunk(2), name='b')
+    store.append(_chunk(9, n=3), name='a')
+    np.testing.assert_array_equal(store.observable('X')[:, 0], [9, 9, 9, 2, 2])
+    np.testing.assert_array_equal(TrajectoryStore(store.path).observable('X')[:, 0], [9, 9, 9, 2, 2])
+
+
+def test_append_does_not_reread_metadata(tmp_path, monkeypatch):
+    store = TrajectoryStore.create(str(tmp_path / 's'), [0, 1, 2], ['X'])
+    for i in range(5):
+        store.append(_chunk(i))
+    loads = []
+    real_load = np.load
+    monkeypatch.setattr(np, 'load', lambda *a, **k: loads.append(a[0]) or real_load(*a, **k))
+    store.append(_chunk(5))
+    store.refresh()
+    assert not [p for p in loads if str(p).endswith('.meta.npz')]
+    assert store.n_runs == 12
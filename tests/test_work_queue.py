@@ -0,0 +1,80 @@
+"""Shared-directory work queue with several local worker processes."""
+
+import json
+import os
+import time
+
+import numpy as np
+
+from stress_responses_simulation import work_queue as wq
+
+SPEC = {
+    'name': 'queue-test',
+    'model': 'srna',
+    'engine': 'ssa',
+    'parameters': {'R_bind': [0.005, 0.01, 0.02]},
+    'seeds': {'start': 0, 'count': 4},
+    'runs': 5,
+    'time': {'duration': 20, 'step_number': 20},
+}
+
+
+def test_workers_drain_queue_without_duplicates(tmp_path):
+    queue = str(tmp_path / 'q')
+    assert wq.init_queue(SPEC, queue)['pending'] == 12
+    counts = wq.run_local_workers(queue, 3, wait_for_claimed=False)
+    assert counts == {'pending': 0, 'claimed': 0, 'done': 12, 'failed': 0}
+
+    store = wq.open_store(queue)
+    assert store.shape == (60, 21, 4)
+    pairs = {(p, s) for p, s in zip(store.param('R_bind'), store.seeds)}
+    assert len(pairs) == 12
+    # re-initialising restores nothing: every task is done
+    assert wq.init_queue(SPEC, queue)['pending'] == 0
+
+
+def test_dead_worker_claim_is_reclaimed(tmp_path):
+    queue = str(tmp_path / 'q')
+    wq.init_queue(SPEC, queue)
+    dead = wq.claim(queue, 'deadhost-1-000000')
+    old = time.time() - 3600
+    os.utime(dead, (old, old))
+    live = wq.claim(queue, 'livehost-2-000000')
+
+    assert wq.reclaim(queue, stale=60) == [os.path.basename(dead).split('@')[0]]
+    assert os.path.exists(live)
+    assert wq.status(queue)['pending'] == 11
+
+    os.remove(live)  # the live worker is "killed" too; drain the rest normally
+    wq.work(queue, wait_for_claimed=False)
+    assert wq.status(queue)['done'] == 11
+
+
+def test_failing_task_retried_then_parked(tmp_path):
+    queue = str(tmp_path / 'q')
+    spec = dict(SPEC, parameters={'R_missing': [1.0]}, seeds=[0])
+    wq.init_queue(spec, queue)
+    out = wq.work(queue, max_attempts=2, wait_for_claimed=False)
+    assert out == {'done': 0, 'failed': 2}
+    (name,) = os.listdir(os.path.join(queue, 'failed'))
+    with open(os.path.join(queue, 'failed', name)) as fh:
+        task = json.load(fh)
+    assert task['attempts'] == 2 and 'R_missing' in task['error']
+    assert np.isclose(task['params']['R_missing'], 1.0)
+
+
+def test_failure_after_losing_the_claim_does_not_requeue(tmp_path, monkeypatch):
+    queue = str(tmp_path / 'q')
+    wq.init_queue(dict(SPEC, parameters={'R_bind': [0.01]}, seeds=[0]), queue)
+
+    def stalled(spec, task):
+        # presumed dead meanwhile: reclaimed and picked up by another worker
+        (name,) = os.listdir(os.path.join(queue, 'claimed'))
+        os.rename(os.path.join(queue, 'claimed', name),
+                  os.path.join(queue, 'claimed', task['id'] + '@otherhost-9-000000.json'))
+        raise RuntimeError('stalled worker gave up')
+
+    monkeypatch.setattr(wq, 'run_task', stalled)
+    out = wq.work(queue, max_tasks=1, wait_for_claimed=False)
+    assert out == {'done': 0, 'failed': 0}
+    assert wq.status(queue) == {'pending': 0, 'claimed': 1, 'done': 0, 'failed': 0}